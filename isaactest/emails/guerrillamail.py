@@ -1,8 +1,9 @@
 import time
 import re
 from selenium.common.exceptions import NoSuchElementException, ElementNotVisibleException, TimeoutException
-from ..utils.i_selenium import image_div, wait_for_xpath_element
+from ..utils.i_selenium import assert_tab, image_div, wait_for_xpath_element
 from ..utils.log import log, INFO, ERROR
+from ..utils.tracing import traced
 
 __all__ = ['set_guerrilla_mail_address', 'GuerrillaInbox', 'GuerrillaEmail']
 
@@ -13,6 +14,7 @@ class GuerrillaMailError(Exception):
     pass
 
 
+@traced
 def set_guerrilla_mail_address(driver, guerrilla_email=None):
     """Change or get the GuerrillaMail email address.
 
@@ -69,15 +71,18 @@ class GuerrillaInbox():
     """
     GUERRILLAMAIL = "www.guerrillamail.com"
 
-    def __init__(self, driver):
+    def __init__(self, driver, own_driver=False):
         """Create the inbox object.
 
            This should be run whilst on the GuerrillaMail website, and it is strongly
            reccommended that the tab be left open.
             - 'driver' should be a Selenium WebDriver.
+            - 'own_driver' is an optional flag to mark the WebDriver as being for
+              the inbox alone, so that 'close()' quits it.
         """
         log(INFO, "Creating GuerrillaInbox object.")
         self._driver = driver
+        self._own_driver = own_driver
         try:
             self.emails = [GuerrillaEmail(driver, e) for e in driver.find_elements_by_xpath("//tr[contains(@class, 'mail_row')]")]
             self.unread = [GuerrillaEmail(driver, e) for e in driver.find_elements_by_xpath("//tr[contains(@class, 'email_unread')]")]
@@ -85,6 +90,32 @@ class GuerrillaInbox():
             log(ERROR, "GM - No email elements on the page; failed to find inbox!")
             raise GuerrillaMailError
 
+    def activate(self):
+        """Switch the browser to the GuerrillaMail tab, ready for using the inbox."""
+        assert_tab(self._driver, self.GUERRILLAMAIL)
+
+    def reset(self):
+        """Reload GuerrillaMail, to clean up after an email could not be used."""
+        self._driver.get(self.GUERRILLAMAIL)
+        time.sleep(2)
+
+    @traced
+    def close(self):
+        """Quit the WebDriver of the inbox, if it has one of its own."""
+        if self._own_driver:
+            self._driver.quit()
+            log(INFO, "Closed the Selenium Driver of the inbox.")
+
+    @traced
+    def set_address(self, guerrilla_email):
+        """Change the GuerrillaMail email address, and return it.
+
+           This must be run whilst on the GuerrillaMail tab.
+            - 'guerrilla_email' should be a string of the email address desired.
+        """
+        return set_guerrilla_mail_address(self._driver, guerrilla_email)
+
+    @traced
     def refresh(self):
         """Refresh the inbox object, remove any old emails add new ones.
 
@@ -102,6 +133,7 @@ class GuerrillaInbox():
             log(ERROR, "GM - No email elements on page; failed to find inbox!")
             raise GuerrillaMailError
 
+    @traced
     def delete_emails(self):
         """Clear a GuerillaMail inbox.
 
@@ -117,6 +149,7 @@ class GuerrillaInbox():
         time.sleep(2)
         self.refresh()
 
+    @traced
     def get_by_time(self, timestamp):
         """Get any emails with a timestamp matching that specified.
 
@@ -125,6 +158,7 @@ class GuerrillaInbox():
         matches = [e for e in self.emails if e.time == timestamp]
         return matches
 
+    @traced
     def get_by_subject(self, subject, unread=False):
         """Get any emails containing 'subject' in the subject line.
 
@@ -140,6 +174,7 @@ class GuerrillaInbox():
             matches = [e for e in self.emails if subject in e.subject]
         return matches
 
+    @traced
     def wait_for_email(self, wait_dur, refresh_time=15, cycles=5, expected=1):
         """Wait for emails to be received, then refresh inbox object.
 
@@ -227,6 +262,7 @@ class GuerrillaEmail():
             tickbox.click()
         time.sleep(1)
 
+    @traced
     def view(self, images=True):
         """Open an email.
 
@@ -253,6 +289,7 @@ class GuerrillaEmail():
             log(ERROR, "GM - Can't view email; can't find elements required!")
             raise GuerrillaMailError
 
+    @traced
     def image(self, fname=None):
         """Save a png image of the email.
 
@@ -276,6 +313,7 @@ class GuerrillaEmail():
         """Return the body WebDriver element of the email, useful for checking content."""
         return self._driver.find_element_by_xpath("//div[@class='email_body']")
 
+    @traced
     def save_html_body(self, fname=None):
         """Save the HTML of the email body.
 
@@ -297,6 +335,7 @@ class GuerrillaEmail():
             raise GuerrillaMailError
         self.close()
 
+    @traced
     def close(self):
         """Close the email and returns to the inbox.
 
@@ -0,0 +1,336 @@
+import os
+import re
+import copy
+import time
+import email
+import smtpd
+import asyncore
+import datetime
+import tempfile
+import threading
+from email.header import decode_header
+from email.utils import parseaddr
+from selenium.common.exceptions import NoSuchElementException
+from ..utils.i_selenium import image_div
+from ..utils.log import log, INFO, ERROR
+from ..utils.tracing import traced
+
+__all__ = ['SMTPInbox', 'SMTPEmail']
+
+_SAFENAMECHARS = '[^-a-zA-Z0-9_ ]+'
+_TAGS = re.compile("<[^>]*>")
+_WHITESPACE = re.compile("\s+")
+
+# The running SMTP servers, keyed by (host, port), so inboxes can share them:
+_SINKS = dict()
+_SINKS_LOCK = threading.Lock()
+
+
+class SMTPInboxError(Exception):
+    pass
+
+
+class _SMTPSink(smtpd.SMTPServer):
+    """An SMTP server which keeps every message it receives, rather than relaying it.
+
+       Messages are stored as SMTPEmail objects in '.messages', oldest first; the
+       '.condition' variable is notified each time one arrives.
+    """
+
+    def __init__(self, host, port):
+        self._map = dict()
+        asyncore.dispatcher.__init__(self, map=self._map)  # Use a private map, not the asyncore global one.
+        self.create_socket(smtpd.socket.AF_INET, smtpd.socket.SOCK_STREAM)
+        self.set_reuse_addr()
+        self.bind((host, port))
+        self.listen(5)
+        self.messages = []
+        self.condition = threading.Condition()
+        self._thread = threading.Thread(target=asyncore.loop, kwargs=dict(timeout=0.1, map=self._map),
+                                        name="SMTPInbox-%s" % port)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def handle_accept(self):
+        pair = self.accept()
+        if pair is not None:
+            conn, addr = pair
+            channel = smtpd.SMTPChannel(self, conn, addr)
+            # SMTPChannel registers itself in the global map; move it to ours:
+            asyncore.socket_map.pop(channel._fileno, None)
+            channel._map = self._map
+            channel.add_channel()
+
+    def process_message(self, peer, mailfrom, rcpttos, data):
+        message = SMTPEmail(email.message_from_string(data), [r.lower() for r in rcpttos])
+        with self.condition:
+            self.messages.append(message)
+            self.condition.notify_all()
+        return None  # Accept the message.
+
+
+def _decode(header):
+    """Decode a possibly RFC 2047 encoded header into a plain string."""
+    parts = []
+    for text, charset in decode_header(header or ""):
+        parts.append(text.decode(charset or "ascii", "replace") if charset else text)
+    return " ".join(parts).encode("ascii", "replace").strip()
+
+
+class SMTPInbox():
+    """A drop-in replacement for GuerrillaInbox backed by a local SMTP server.
+
+       Point the outbound SMTP relay of the Isaac server being tested at this
+       machine's 'port' and all email is delivered here instead of to real inboxes.
+       The interface matches GuerrillaInbox, but emails are parsed MIME messages
+       rather than rows of a web page, so no browser tab is needed, and waiting for
+       an email returns the moment it arrives. Inboxes on the same port share one
+       SMTP server, but each has its own copies of the emails, so that viewing an
+       email uses the WebDriver of the inbox and marks it read in that inbox only.
+       '.emails' is a list of all emails to the current address as SMTPEmail
+       objects, newest first, and '.unread' is a list of all unread emails; neither
+       is updated until 'refresh()' is called.
+    """
+
+    def __init__(self, driver, address, host="0.0.0.0", port=2525, own_driver=False):
+        """Create the inbox object, starting an SMTP server if none is running.
+
+            - 'driver' should be a Selenium WebDriver, used to view emails.
+            - 'address' is the string email address to show emails for.
+            - 'host' is the interface for the SMTP server to listen on.
+            - 'port' is the integer port for the SMTP server to listen on.
+            - 'own_driver' is an optional flag to mark the WebDriver as being for
+              the inbox alone, so that 'close()' quits it.
+        """
+        log(INFO, "Creating SMTPInbox object.")
+        self._driver = driver
+        self._own_driver = own_driver
+        with _SINKS_LOCK:
+            if (host, port) not in _SINKS:
+                _SINKS[(host, port)] = _SMTPSink(host, port)
+                log(INFO, "Started SMTP server on %s:%s." % (host, port))
+        self._sink = _SINKS[(host, port)]
+        # This inbox's copies of the emails received by the server, by the email copied:
+        self._copies = dict()
+        self.address = address
+        self.refresh()
+
+    def activate(self):
+        """Ready the browser for using the inbox; there is no tab, so do nothing."""
+        pass
+
+    def reset(self):
+        """Return the browser to where it was if an email was left open."""
+        for e in self.emails:
+            e.close()
+
+    @traced
+    def close(self):
+        """Quit the WebDriver of the inbox, if it has one of its own."""
+        if self._own_driver:
+            self._driver.quit()
+            log(INFO, "Closed the Selenium Driver of the inbox.")
+
+    @traced
+    def set_address(self, address):
+        """Change the email address to show emails for, and return it."""
+        self.address = address
+        log(INFO, "Set SMTPInbox email address to %s" % address)
+        self.refresh()
+        return address
+
+    def _received(self):
+        """Return all emails to the current address, newest first. Must hold the condition!"""
+        return [self._copy(e) for e in reversed(self._sink.messages) if self.address.lower() in e.recipients]
+
+    def _copy(self, received):
+        """Return this inbox's copy of the email 'received' by the server, viewed using its WebDriver."""
+        if received not in self._copies:
+            self._copies[received] = copy.copy(received)
+            self._copies[received]._driver = self._driver
+        return self._copies[received]
+
+    @traced
+    def refresh(self):
+        """Refresh the inbox object, updating the read/unread status and adding new emails."""
+        with self._sink.condition:
+            self.emails = self._received()
+        self.unread = [e for e in self.emails if not e.read]
+
+    @traced
+    def delete_emails(self):
+        """Clear the inbox; removing all emails to the current address."""
+        log(INFO, "Deleting %d emails." % len(self.emails))
+        with self._sink.condition:
+            for e in [m for m in self._sink.messages if self.address.lower() in m.recipients]:
+                self._sink.messages.remove(e)
+                self._copies.pop(e, None)
+        self.refresh()
+
+    @traced
+    def get_by_time(self, timestamp):
+        """Get any emails with a timestamp matching that specified.
+
+            - 'timestamp' should be a string of the format 'HH:MM:SS'.
+        """
+        return [e for e in self.emails if e.time == timestamp]
+
+    @traced
+    def get_by_subject(self, subject, unread=False):
+        """Get any emails containing 'subject' in the subject line.
+
+            - 'subject' should be a string to be matched.
+            - 'unread' is an optional flag to only return unread emails with a
+              matching subject line.
+        """
+        if unread:
+            return [e for e in self.unread if subject in e.subject]
+        else:
+            return [e for e in self.emails if subject in e.subject]
+
+    @traced
+    def wait_for_email(self, wait_dur, refresh_time=15, cycles=5, expected=1):
+        """Wait for emails to be received, then refresh inbox object.
+
+           Takes the same arguments as 'GuerrillaInbox.wait_for_email', which
+           set the longest time to wait; but returns as soon as there are 'expected'
+           many unread emails.
+            - 'wait_dur', 'refresh_time' and 'cycles' give the maximum wait as
+              'wait_dur + refresh_time * (1 + 2 + ... + cycles)' seconds.
+            - 'expected' is how many unread emails are expected.
+        """
+        log(INFO, "Waiting for email.")
+        start = time.time()
+        deadline = start + wait_dur + refresh_time * cycles * (cycles + 1) / 2.0
+        with self._sink.condition:
+            while len([e for e in self._received() if not e.read]) < expected:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._sink.condition.wait(remaining)
+        self.refresh()
+        waited = time.time() - start
+        if len(self.unread) >= expected:
+            log(INFO, "Waited for %.1f seconds, have expected number of unread emails: use these!" % waited)
+        else:
+            log(ERROR, "Waited for %.1f seconds. Not enough email. Stopped waiting!" % waited)
+
+
+class SMTPEmail():
+    """A class to wrap an email received by an SMTPInbox.
+
+       These should not be generated by hand, but managed by an SMTPInbox object.
+       It has the same attributes and methods as GuerrillaEmail; viewing an email
+       loads its HTML body into the current browser tab, and closing it goes back.
+       Each inbox shows its own copy of an email, with the WebDriver to view it in.
+    """
+
+    def __init__(self, message, recipients):
+        """Create a new SMTPEmail object; not reccommended to run this by hand."""
+        self.message = message
+        self.recipients = recipients
+        self.read = False
+        self._viewing = None
+        self._driver = None
+        self.sender = parseaddr(message.get("From", ""))[1]
+        self.subject = _decode(message.get("Subject"))
+        self.time = datetime.datetime.now().strftime("%H:%M:%S")
+        self.html = None
+        self.text = None
+        for part in message.walk():
+            if part.get_content_maintype() == "multipart":
+                continue
+            payload = part.get_payload(decode=True) or ""
+            payload = payload.decode(part.get_content_charset() or "utf-8", "replace")
+            if (part.get_content_type() == "text/html") and (self.html is None):
+                self.html = payload
+            elif (part.get_content_type() == "text/plain") and (self.text is None):
+                self.text = payload
+        if self.html is None:
+            self.html = "<pre>%s</pre>" % (self.text or "")
+        plain = self.text if self.text is not None else _TAGS.sub(" ", self.html)
+        self.excerpt = _WHITESPACE.sub(" ", plain).strip()[:100].encode("ascii", "replace")
+
+    def __str__(self):
+        """A useful string representation of the email."""
+        return "<Email from '%s' at '%s'>" % (self.sender, self.time)
+
+    def __repr__(self):
+        """Set Python's representation to be the string form for easier viewing."""
+        return str(self)
+
+    def _default_fname(self):
+        fname = (self.subject + "_" + self.time).lstrip().replace(" ", "_").replace(":", "")
+        return re.sub(_SAFENAMECHARS, '', fname)
+
+    @traced
+    def view(self, images=True):
+        """Open the email in the current tab of the browser.
+
+           Useful for then running 'get_email_body_element' for checking the content
+           of an email. Take care to run 'close()' afterwards to return the browser
+           to the page it was on!
+            - 'images' is ignored; images are always shown.
+        """
+        if self._driver is None:
+            log(ERROR, "SMTP - Can't view email; it has not been fetched by an inbox!")
+            raise SMTPInboxError
+        if self._viewing is not None:
+            return
+        log(INFO, "Viewing %s" % self)
+        fd, path = tempfile.mkstemp(suffix=".html")
+        with os.fdopen(fd, "w") as f:
+            f.write(("<div class='email_body'>%s</div>" % self.html).encode("utf-8"))
+        self._viewing = path
+        self.read = True
+        self._driver.get("file://" + path)
+
+    @traced
+    def image(self, fname=None):
+        """Save a png image of the email.
+
+           If the optional 'fname' string is specified, save to this filename,
+           where '.png' is automatically appended.
+        """
+        log(INFO, "Imaging %s." % self)
+        if fname is None:
+            fname = self._default_fname()
+        self.view()
+        try:
+            image_div(self._driver, fname, self.get_email_body_element())
+        except NoSuchElementException:
+            log(ERROR, "SMTP - Can't image email; can't find required elements!")
+            raise SMTPInboxError
+        self.close()
+
+    def get_email_body_element(self):
+        """Return the body WebDriver element of the email, useful for checking content."""
+        return self._driver.find_element_by_xpath("//div[@class='email_body']")
+
+    @traced
+    def save_html_body(self, fname=None):
+        """Save the HTML of the email body.
+
+           If the optional 'fname' string is specified, save to this filename,
+           where '.html' is automatically appended.
+        """
+        log(INFO, "Saving HTML of %s." % self)
+        if fname is None:
+            fname = self._default_fname()
+        fname = re.sub(_SAFENAMECHARS, '', fname) + ".html"
+        with open(fname, "w") as f:
+            f.write(self.html.encode("utf-8"))
+        self.read = True
+
+    @traced
+    def close(self):
+        """Close the email, returning the browser to the page it was on before.
+
+           Run this after 'view()' to avoid errors.
+        """
+        if self._viewing is None:
+            return
+        log(INFO, "Closing %s." % self)
+        self._driver.back()
+        os.remove(self._viewing)
+        self._viewing = None
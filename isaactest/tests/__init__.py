@@ -1,9 +1,45 @@
+import os
+import time
+import pickle
+import threading
 from functools import wraps
 from ..utils.isaac import is_live_site
-from ..utils.log import log, TEST, INFO, ERROR
+from ..utils.log import log, set_current_test, last_error, TEST, INFO, ERROR, SLOW
+from ..utils.history import HISTORY
+from ..utils.locks import ResourceLocks
+from ..utils.tracing import TRACER
+from ..utils.page_timing import over_budget
+from ..utils.rate_limit import RATE_LIMITS
 from collections import OrderedDict
 
-__all__ = ['TestWithDependency']
+__all__ = ['TestWithDependency', 'Deferred', 'LOGGED_OUT']
+
+# The 'role' of a test which starts by logging out:
+LOGGED_OUT = "LOGGED_OUT"
+
+
+class Deferred(object):
+    """Returned by a test which must wait for a server side timer before finishing.
+
+       Rather than sleeping, a test which needs to wait a long time (for a lockout
+       to expire, say) can return a Deferred object. The test is then left unfinished
+       and other tests are run in the meantime; once the delay has passed, the
+       continuation is called with the same arguments as the test and its return
+       value is used as the result of the test. A continuation may itself return
+       another Deferred object. Tests which depend on the deferred test are not run
+       until it has finished.
+        - 'delay' is the minimum time in seconds to wait before continuing.
+        - 'continuation' is the function to call to finish the test, which takes
+          the same arguments as a test function.
+        - 'holds' is an optional list of test names which must not start whilst
+          the test is waiting, for instance because they would disturb the timer.
+    """
+
+    def __init__(self, delay, continuation, holds=[]):
+        self.due = time.time() + delay
+        self.continuation = continuation
+        self.holds = holds
+
 
 
 class TestWithDependency(object):
@@ -14,10 +50,15 @@ class TestWithDependency(object):
        keeps track of the results of tests using the class variable 'Results'. To
        access the results of tests, 'TestWithDependency.Results' provides the internal
        OrderedDict used to track results; 'True' is a pass, 'False' is a fail,
-       'None' denotes that the test was not run.
+       'None' denotes that the test was not run and 'SLOW' is a pass during which
+       a page took longer than its budget to become ready (only when recording
+       page timings), which counts as a pass for the tests depending on it. Each
+       result, with its timing, is also recorded to the
+       'isaactest.utils.history.HISTORY' store if open.
 
-        - Tests must return a boolean 'True' for pass, 'False' for failure. Any other
-          return value will be considered a failure!
+        - Tests must return a boolean 'True' for pass, 'False' for failure, or a
+          'Deferred' object to finish later. Any other return value will be
+          considered a failure!
         - Throws 'KeyError' if dependency in 'deps' has not been run/defined!
         - 'Name' should be an uppercase string of max length 25 characters to describe
           the test and is the name to be used in 'deps' if any other test depends
@@ -29,43 +70,95 @@ class TestWithDependency(object):
           should be run after a test is run using 'run_test_with_deps(...)' and before
           overall testing finishes. Specifying a complex web of teardowns may cause
           infinite recursion and overflow or other errors. Use very sparingly!
+        - 'rerun_together' is an optional list of test names which change the same
+          server state as this test (for instance creating and deleting a user),
+          so that when resuming from a checkpoint they are re-run as a group; see
+          'resume_from_checkpoint(...)'.
+        - 'role' is the optional name of the user in 'TestUsers' the test logs in
+          as (for instance "Student" or "Admin"), or 'LOGGED_OUT' if it starts by
+          logging out. Only used to plan the order of tests; see 'navigation_order()'.
+        - 'start_url' is the optional path on the Isaac website the test starts
+          from, for instance "/questions/_regression_test_". Only used to plan the
+          order of tests, as for 'role'.
+        - 'setup' is an optional flag for a test which only prepares the browser
+          for the tests depending on it (logging in, accepting cookies) and changes
+          no shared server state, so that it may be repeated on every shard which
+          needs it; see 'shard_plan(...)'.
+        - 'locks' is an optional list of resources, such as "user:Student" or
+          "inbox", the test changes and so must have to itself whilst it runs (or
+          is deferred). 'shared_locks' is a list of resources the test only uses,
+          such as a user it logs in as, which it may share with other tests doing
+          the same. Tests which conflict are run one after another, and all others
+          may run concurrently.
+        - 'budgets' is an optional dict of {page: seconds} the test expects pages
+          to become ready within, overriding those of 'PAGE_BUDGETS' in
+          'isaactest.utils.page_timing'; for instance {"/admin/stats": 4}. A page
+          is named by its path without IDs, or by the name given to 'time_action'.
+        - 'rate_limits' is an optional list of the names of the rate limits in
+          'isaactest.utils.rate_limit.RATE_LIMITS' the test uses, for instance
+          ["answers"] for a test submitting answers. Whilst one has no token left,
+          other tests are run first rather than waiting for it to refill.
     """
     Results = OrderedDict()
     _Tests = OrderedDict()
     _Dependencies = dict()
     _Teardowns = dict()
     _teardowns_to_run = set()
+    _Deferred = dict()
+    _Timing = dict()
+    _RerunTogether = dict()
+    _Navigation = dict()
+    _Setup = dict()
+    _Resources = dict()
+    _Budgets = dict()
+    _RateLimits = dict()
+    _Locks = ResourceLocks()
+    _Checkpoint = None
+    _Lock = threading.RLock()
 
-    def __init__(self, Name, deps=[], teardowns=[]):
+    def __init__(self, Name, deps=[], teardowns=[], rerun_together=[], role=None, start_url=None,
+                 setup=False, locks=[], shared_locks=[], budgets={}, rate_limits=[]):
         self.Name = Name
         self.deps = deps
         self.teardowns = teardowns
         self.Results[Name] = None
         self._Dependencies[Name] = self.deps
         self._Teardowns[Name] = self.teardowns
+        self._RerunTogether[Name] = rerun_together
+        self._Navigation[Name] = (role, start_url)
+        self._Setup[Name] = setup
+        self._Resources[Name] = (locks, shared_locks)
+        self._Budgets[Name] = budgets
+        self._RateLimits[Name] = rate_limits
 
     def __call__(self, test_func):
         def _decorator(*args, **kwargs):
-            if type(self.Results[self.Name]) == bool:  # Don't re-run previosuly run tests
+            if self.Results[self.Name] is not None:  # Don't re-run previosuly run tests
                 log(TEST, "Test '%s'." % self.Name)
                 log(INFO, "Test has already run.")
+                self._Locks.release(self.Name)
                 return
             if self.dependencies_met(self.Name):
                 log(TEST, "Test '%s'." % self.Name)
                 self.Results[self.Name] = False  # If it dies; ensure this test marked as a fail!
-                result = test_func(*args, **kwargs)
+                with self._Lock:
+                    self._Timing[self.Name] = dict(started=time.time(), active=0.0, attempts=0)
+                result = self._step(self.Name, test_func, *args, **kwargs)
+                if isinstance(result, Deferred):
+                    log(INFO, "Test will resume in %s seconds." % int(result.due - time.time()))
+                    with self._Lock:
+                        self._Deferred[self.Name] = result
+                    return result
                 if type(result) != bool:
                     log(INFO, "Test returned unexpected value. Assuming failure!")
                     result = False
-                del self.Results[self.Name]  # This moves the entry to the end,
-                self.Results[self.Name] = result  # So it is clearer which were not run.
+                self._finish(self.Name, result)
                 return result
             else:
                 not_met = ", ".join([d for d in self.deps if not self.Results[d]])
                 log(TEST, "Test '%s' not run, dependencies '%s' not met!" % (self.Name, not_met))
                 log(ERROR, "Test could not run!")
-                del self.Results[self.Name]  # This moves the entry to the end,
-                self.Results[self.Name] = None  # So it is clearer which were not run.
+                self._finish(self.Name, None, "Dependencies '%s' not met!" % not_met)
                 return None
         test = wraps(test_func)(_decorator)
         self._Tests[self.Name] = test
@@ -75,6 +168,212 @@ class TestWithDependency(object):
     def dependencies_met(cls, name):
         return all([cls.Results[d] for d in cls._Dependencies[name]])
 
+    @classmethod
+    def _resume(cls, name, kwargs):
+        """Run the continuation of the deferred test 'name', recording its result."""
+        with cls._Lock:
+            deferred = cls._Deferred.pop(name)
+        log(TEST, "Test '%s' resumed." % name)
+        result = cls._step(name, deferred.continuation, **kwargs)
+        if isinstance(result, Deferred):
+            log(INFO, "Test will resume in %s seconds." % int(result.due - time.time()))
+            with cls._Lock:
+                cls._Deferred[name] = result
+            return result
+        if type(result) != bool:
+            log(INFO, "Test returned unexpected value. Assuming failure!")
+            result = False
+        cls._finish(name, result)
+        return result
+
+    @classmethod
+    def _step(cls, name, func, *args, **kwargs):
+        """Run 'func', the test 'name' or a continuation of it, timing it.
+
+           If it raises an exception, the test is recorded as a failure before the
+           exception is raised again.
+        """
+        with cls._Lock:
+            step = cls._Timing[name]["attempts"] + 1 if name in cls._Timing else None
+        set_current_test(name, step)
+        start = time.time()
+        failure = None
+        try:
+            with TRACER.span(name, "test", dict(step=step)):
+                return func(*args, **kwargs)
+        except Exception, e:
+            failure = "%s: '%s'" % (type(e).__name__, e)
+            raise
+        finally:
+            set_current_test(None)
+            with cls._Lock:
+                if name in cls._Timing:
+                    cls._Timing[name]["active"] += time.time() - start
+                    cls._Timing[name]["attempts"] += 1
+            if failure is not None:
+                cls._finish(name, False, failure)
+
+    @classmethod
+    def _finish(cls, name, result, message=None):
+        """Record the final 'result' of test 'name' in 'Results' and in 'HISTORY'.
+
+           A passing test which visited a page slower than its budget is 'SLOW'.
+            - 'message' is an optional string explaining the result; by default
+              the last error logged by a failed test.
+        """
+        now = time.time()
+        breaches = over_budget(name, cls._Budgets.get(name))
+        if (result is True) and breaches:
+            for page, ready, budget in breaches:
+                log(INFO, "Page '%s' took %.1f seconds to be ready, over its budget of %.1f seconds!" % (page, ready, budget))
+            result = SLOW
+            message = "Slower than budgeted on %s." % ", ".join(sorted(set([p for p, r, b in breaches])))
+        with cls._Lock:
+            del cls.Results[name]  # This moves the entry to the end,
+            cls.Results[name] = result  # So it is clearer which were not run.
+            timing = cls._Timing.pop(name, dict(started=now, active=0.0, attempts=0))
+        cls._Locks.release(name)
+        if (message is None) and (result is False):
+            message = last_error(name)
+        HISTORY.record(name, result, timing["started"], now, timing["active"], timing["attempts"], message)
+        cls._save_checkpoint()
+
+    @classmethod
+    def checkpoint_to(cls, path, Users):
+        """Save 'Results' and 'Users' to the file 'path' each time a test finishes.
+
+           Tests change the details of users as they run (passwords, email addresses),
+           so these are saved alongside the results to allow a run to be resumed.
+            - 'path' is the filename of the checkpoint.
+            - 'Users' should be the TestUsers object passed to the tests.
+        """
+        cls._Checkpoint = (path, Users)
+        cls._save_checkpoint()
+
+    @classmethod
+    def _save_checkpoint(cls):
+        """Write the checkpoint file, if checkpointing, replacing it atomically."""
+        if cls._Checkpoint is None:
+            return
+        path, Users = cls._Checkpoint
+        with cls._Lock:
+            with open(path + ".tmp", "wb") as f:
+                pickle.dump(dict(Results=dict(cls.Results), Users=Users), f)
+            os.rename(path + ".tmp", path)
+
+    @classmethod
+    def _ancestors(cls, name):
+        """Return the set of tests which test 'name' depends upon, directly or indirectly."""
+        found = set()
+        frontier = [name]
+        while frontier:
+            for d in cls._Dependencies.get(frontier.pop(), []):
+                if d not in found:
+                    found.add(d)
+                    frontier.append(d)
+        return found
+
+    @classmethod
+    def _rerun_groups(cls):
+        """Return a list of sets of tests which must be re-run together."""
+        groups = []
+        for name in cls._Tests:
+            group = set([name]) | set([t for t in cls._RerunTogether[name] if t in cls._Tests])
+            for g in [g for g in groups if g & group]:
+                groups.remove(g)
+                group |= g
+            groups.append(group)
+        return [g for g in groups if len(g) > 1]
+
+    @classmethod
+    def resume_from_checkpoint(cls, path):
+        """Load a checkpoint, so that only tests which did not pass are run again.
+
+           Passed tests are marked as such in 'Results', so they are skipped and
+           count as met dependencies. A group of tests declared with 'rerun_together'
+           is re-run in full if a test which must be re-run is in, or depends on, the
+           group whilst another of the group which it does not depend on has passed;
+           that test may have undone the state it relies on (for instance by deleting
+           a user it needs). Returns the TestUsers object saved with the checkpoint.
+            - 'path' is the filename of the checkpoint.
+        """
+        with open(path, "rb") as f:
+            checkpoint = pickle.load(f)
+        passed = set([t for t, r in checkpoint["Results"].items() if r in (True, SLOW) and t in cls._Tests])
+        rerun = set(cls._Tests) - passed
+        groups = cls._rerun_groups()
+        changed = True
+        while changed:
+            changed = False
+            for group in groups:
+                if group <= rerun:
+                    continue
+                undone = False
+                for t in rerun:
+                    uses = cls._ancestors(t) | set([t])
+                    if (uses & group) and (group - uses - rerun):
+                        undone = True
+                if undone:
+                    log(INFO, "Re-running %s together." % ", ".join(sorted(group)))
+                    rerun |= group
+                    changed = True
+        for t in cls._Tests:
+            cls.Results[t] = checkpoint["Results"][t] if t not in rerun else None
+        log(INFO, "Resuming from checkpoint '%s'; %s of %s tests already passed." % (path, len(cls._Tests) - len(rerun), len(cls._Tests)))
+        return checkpoint["Users"]
+
+    @classmethod
+    def _finish_deferred(cls, name, kwargs):
+        """Wait for and run the continuations of test 'name' until it has finished."""
+        while name in cls._Deferred:
+            wait = cls._Deferred[name].due - time.time()
+            if wait > 0:
+                log(INFO, "Waiting %s seconds to resume test '%s'." % (int(wait + 0.5), name))
+                time.sleep(wait)
+            cls._resume(name, kwargs)
+
+    @classmethod
+    def _is_held(cls, name):
+        """Return whether a deferred test has asked for test 'name' not to start yet."""
+        return any([name in d.holds for d in cls._Deferred.values()])
+
+    @classmethod
+    def _rate_limited(cls, name):
+        """Return whether test 'name' uses a rate limit which has no token available now."""
+        return any([RATE_LIMITS[r].wait_time() > 0 for r in cls._RateLimits[name]])
+
+    @classmethod
+    def _lock(cls, name, waiting=None):
+        """Try to take the resources test 'name' declared, returning whether it may start.
+
+           The resources are released once the test finishes.
+            - 'waiting' is an optional set of the resources wanted by tests earlier
+              in the order which could not take them, and is added to if this test
+              can't. These are kept for the earlier tests, so that tests sharing a
+              resource can't keep a test wanting it exclusively from ever starting.
+        """
+        exclusive, shared = cls._Resources[name]
+        wanted = set(exclusive) | set(shared)
+        if (waiting is not None) and (wanted & waiting):
+            return False
+        if cls._Locks.try_acquire(name, exclusive, shared):
+            return True
+        if waiting is not None:
+            waiting |= wanted
+        return False
+
+    @classmethod
+    def _log_blocked(cls, name):
+        """Log which of the resources test 'name' declared are held, and by which tests."""
+        exclusive, shared = cls._Resources[name]
+        held = []
+        for r in exclusive + [r for r in shared if r not in exclusive]:
+            holders = [h for h in cls._Locks.holders(r) if h != name]
+            if holders:
+                held.append("'%s' (held by %s)" % (r, ", ".join(holders)))
+        if held:
+            log(INFO, "Test '%s' is waiting for resources: %s." % (name, "; ".join(held)))
+
     @classmethod
     def run_test_with_deps(cls, name, driver, inbox, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, run_teardowns=True):
         """Run a single test from the test suite, first running all dependencies.
@@ -107,12 +406,14 @@ class TestWithDependency(object):
         # dependencies. DOES NOT CHECK FOR SUCCESS of dependencies, that is left to
         # the main decorator above. Add any teardowns to overall list.
         for t in cls._Dependencies[name]:
-            if type(cls.Results[t]) != bool:
+            if cls.Results[t] is None:
                 cls._teardowns_to_run.update(cls._Teardowns[t])
                 cls.run_test_with_deps(t, run_teardowns=False, **kwargs)
-        # Run the actual test that needed to run, noting any teardowns:
+        # Run the actual test that needed to run, noting any teardowns. Nothing
+        # else is running, so just wait for it if it is deferred:
         cls._teardowns_to_run.update(cls._Teardowns[name])
         cls._Tests[name](**kwargs)
+        cls._finish_deferred(name, kwargs)
         # If supposed to run teardowns, do that:
         if run_teardowns:
             for t in cls._teardowns_to_run:
@@ -120,11 +421,16 @@ class TestWithDependency(object):
             cls._teardowns_to_run = set()
 
     @classmethod
-    def run_all_tests(cls, driver, inbox, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR):
+    def run_all_tests(cls, driver, inbox, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, order=None):
         """Run all tests from the test suite.
 
-           This will run all defined tests, in the order set by their imports. This
-           ordering is important if all are to run successfully.
+           This will run all defined tests, in the order set by their imports unless
+           an 'order' is given. This ordering is important if all are to run
+           successfully. Whilst a test is deferred, the tests after it which do not
+           depend on it, are not held by it and do not need the resources it has
+           locked are run; the deferred test is resumed as soon as it is due.
+           Likewise, whilst a rate limit a test uses has no token available, the
+           tests after it which don't use it are run first.
             - 'cls' is automatically passed in because this function is decorated
               as a classmethod. IGNORE THIS ARGUMENT.
             - 'driver' should be a Selenium WebDriver.
@@ -133,6 +439,9 @@ class TestWithDependency(object):
             - 'ISAAC_WEB' is the string URL of the Isaac website to be tested.
             - 'GUERRILLAMAIL' is the string URL of GuerrillaMail.
             - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
+            - 'order' is an optional list of all test names to run them in, such
+              as that returned by 'navigation_order()'. Dependencies are still
+              run before the tests which depend on them.
         """
         assert not is_live_site(ISAAC_WEB), "Cannot perform testing on live Isaac website!"
         # This is the superset of all arguments required by tests. Their "**kwargs"
@@ -141,22 +450,566 @@ class TestWithDependency(object):
         kwargs = {"driver": driver, "inbox": inbox, "Users": Users, "ISAAC_WEB": ISAAC_WEB,
                   "GUERRILLAMAIL": GUERRILLAMAIL, "WAIT_DUR": WAIT_DUR}
 
-        for test in cls._Tests:
-            cls._Tests[test](**kwargs)
+        queue = [t for t in (order or cls._Tests)]
+        while queue or cls._Deferred:
+            for name in [n for n in cls._Deferred if cls._Deferred[n].due <= time.time()]:
+                cls._resume(name, kwargs)
+            runnable = [t for t in queue if not cls._is_held(t) and
+                        not any([(d in queue) or (d in cls._Deferred) for d in cls._Dependencies[t]])]
+            runnable.sort(key=cls._rate_limited)  # Stable, so otherwise still in order
+            # Only a deferred test can be holding resources another test wants:
+            test = next((t for t in runnable if cls._lock(t)), None)
+            if test is not None:
+                queue.remove(test)
+                cls._Tests[test](**kwargs)
+            elif cls._Deferred:
+                if runnable:
+                    cls._log_blocked(runnable[0])
+                cls._finish_deferred(min(cls._Deferred, key=lambda n: cls._Deferred[n].due), kwargs)
+            else:
+                # Only possible if dependencies are missing or cyclic; let the tests report it:
+                cls._Tests[queue.pop(0)](**kwargs)
+
+    @classmethod
+    def _descendants(cls, name):
+        """Return the set of tests which depend, directly or indirectly, on test 'name'."""
+        found = set()
+        frontier = [name]
+        while frontier:
+            current = frontier.pop()
+            for t in cls._Tests:
+                if (current in cls._Dependencies[t]) and (t not in found):
+                    found.add(t)
+                    frontier.append(t)
+        return found
+
+    @classmethod
+    def _ordering_constraints(cls):
+        """Return a dict mapping each test to the set of tests that must finish before it.
+
+           This is '_Dependencies' plus the ordering implied by '_Teardowns': a
+           teardown must not start until every test depending upon the test which
+           declared it has finished, so it cannot pull state out from under them.
+        """
+        after = dict((t, set(cls._Dependencies[t])) for t in cls._Tests)
+        for name in cls._Tests:
+            for teardown in cls._Teardowns[name]:
+                if teardown not in after:
+                    continue
+                blocked = cls._descendants(teardown) | set([teardown])
+                for t in cls._descendants(name) - blocked:
+                    after[teardown].add(t)
+        return after
 
     @classmethod
-    def dependency_graph(cls):
+    def topological_order(cls, after=None):
+        """Return a list of all test names, sorted so every test follows its dependencies.
+
+           Ties are broken by import order, so this matches the order used by
+           'run_all_tests(...)' wherever the dependencies allow. Raises a
+           'ValueError' if the dependencies contain a cycle.
+            - 'after' is an optional dict as returned by '_ordering_constraints()'.
+              If not specified, only '_Dependencies' is used.
+        """
+        if after is None:
+            after = dict((t, set(cls._Dependencies[t])) for t in cls._Tests)
+        order = []
+        remaining = [t for t in cls._Tests]
+        while remaining:
+            ready = [t for t in remaining if all([(d in order) or (d not in after) for d in after[t]])]
+            if not ready:
+                raise ValueError("Cyclic test dependencies between: %s" % ", ".join(remaining))
+            order.append(ready[0])
+            remaining.remove(ready[0])
+        return order
+
+    @classmethod
+    def _navigate(cls, state, name):
+        """Return the navigations needed to start test 'name' from browser 'state', and the new state.
+
+           The 'state' is a (role, path) pair of the user logged in and the page open,
+           either of which may be 'None' if unknown. Changing user takes a logout and
+           a visit to the login page, and changing page one more navigation. A test
+           is assumed to leave the browser in the state it declared it starts from.
+        """
+        role, path = state
+        test_role, test_path = cls._Navigation[name]
+        navigations = 0
+        if (test_role is not None) and (test_role != role):
+            if role != LOGGED_OUT:
+                navigations += 1  # Logout
+            if test_role != LOGGED_OUT:
+                navigations += 1  # Login page; logging in may then redirect anywhere
+                path = None
+            role = test_role
+        if (test_path is not None) and (test_path != path):
+            navigations += 1
+            path = test_path
+        return navigations, (role, path)
+
+    @classmethod
+    def navigation_cost(cls, order):
+        """Return the number of logouts, logins and navigations needed between the tests of 'order'.
+
+           Only counts what is implied by the 'role' and 'start_url' the tests were
+           declared with; the browser starts logged out on the home page.
+            - 'order' is a list of test names.
+        """
+        state = (LOGGED_OUT, "/")
+        total = 0
+        for name in order:
+            navigations, state = cls._navigate(state, name)
+            total += navigations
+        return total
+
+    @classmethod
+    def navigation_order(cls, after=None):
+        """Return a list of all test names ordered to need as few navigations as possible.
+
+           Greedily picks, of the tests whose dependencies (and any teardown
+           ordering) are already in the order, the one needing fewest navigations
+           from where the last test left the browser; ties are broken by import
+           order. Tests of the same page and user are so kept together; tests
+           skip logging out or in when the browser is already in the state they
+           need (see 'logout_of_isaac' and 'login_as'), but still load their start
+           page afresh, so the count of navigations logged is only an estimate.
+           Raises a 'ValueError' if the dependencies contain a cycle.
+            - 'after' is an optional dict as returned by '_ordering_constraints()'.
+              If not specified, it is calculated.
+        """
+        if after is None:
+            after = cls._ordering_constraints()
+        order = []
+        remaining = [t for t in cls._Tests]
+        state = (LOGGED_OUT, "/")
+        while remaining:
+            ready = [t for t in remaining if all([(d in order) or (d not in after) for d in after[t]])]
+            if not ready:
+                raise ValueError("Cyclic test dependencies between: %s" % ", ".join(remaining))
+            best = min(ready, key=lambda t: cls._navigate(state, t)[0])  # First of equal cost
+            state = cls._navigate(state, best)[1]
+            order.append(best)
+            remaining.remove(best)
+        planned, imported = cls.navigation_cost(order), cls.navigation_cost(cls.topological_order())
+        log(INFO, "Planned test order needs an estimated %s navigations between tests, against %s in import order."
+            % (planned, imported))
+        return order
+
+    @classmethod
+    def _remaining_paths(cls, durations, after):
+        """Return a dict of the longest time in seconds from each test starting until all tests that must follow it finish.
+
+           Tests without a duration in 'durations' are assumed to take the median
+           of those with one, or one second if there are none.
+        """
+        known = sorted([durations[t] for t in cls._Tests if t in durations])
+        default = known[len(known) // 2] if known else 1.0
+        followers = dict((t, [f for f in cls._Tests if t in after[f]]) for t in cls._Tests)
+        remaining = dict()
+        for t in reversed(cls.topological_order(after)):
+            longest = max([remaining[f] for f in followers[t]] or [0.0])
+            remaining[t] = durations.get(t, default) + longest
+        return remaining
+
+    @classmethod
+    def critical_path(cls, durations, after=None):
+        """Return the list of tests on the longest path through the dependencies, weighted by 'durations'.
+
+            - 'durations' is a dict of {TestName: seconds}, such as that returned by
+              'HISTORY.median_durations()'.
+            - 'after' is an optional dict as returned by '_ordering_constraints()'.
+        """
+        if after is None:
+            after = cls._ordering_constraints()
+        remaining = cls._remaining_paths(durations, after)
+        path = []
+        candidates = [t for t in cls._Tests if not [d for d in after[t] if d in cls._Tests]]
+        while candidates:
+            longest = max(candidates, key=lambda t: remaining[t])
+            path.append(longest)
+            candidates = [f for f in cls._Tests if longest in after[f]]
+        return path
+
+    @classmethod
+    def critical_path_order(cls, durations, after=None):
+        """Return a list of all test names, dispatching the tests on the longest chains first.
+
+           Of the tests whose dependencies (and any teardown ordering) are already
+           in the order, the one with the longest remaining path (its own duration
+           plus the longest chain of tests which must follow it) is taken next; ties
+           are broken by import order. Long chains like SIGNUP to VERIFY_LINK, or a
+           deferred test like LOGIN_TIMEOUT, so start as early as possible and other
+           tests are run around them.
+            - 'durations' is a dict of {TestName: seconds}, such as that returned by
+              'HISTORY.median_durations()'.
+            - 'after' is an optional dict as returned by '_ordering_constraints()'.
+        """
+        if after is None:
+            after = cls._ordering_constraints()
+        remaining = cls._remaining_paths(durations, after)
+        order = []
+        left = [t for t in cls._Tests]
+        while left:
+            ready = [t for t in left if all([(d in order) or (d not in after) for d in after[t]])]
+            if not ready:
+                raise ValueError("Cyclic test dependencies between: %s" % ", ".join(left))
+            longest = max(ready, key=lambda t: remaining[t])  # First of equal length
+            order.append(longest)
+            left.remove(longest)
+        path = cls.critical_path(durations, after)
+        log(INFO, "Critical path of %s seconds: %s." % (int(remaining[path[0]] + 0.5), " -> ".join(path)))
+        return order
+
+    @classmethod
+    def _shard_units(cls):
+        """Return a list of sets of tests which must run on the same shard.
+
+           A test is kept with the tests it depends upon, unless they are 'setup'
+           tests which may be repeated, and with its teardowns and 'rerun_together'
+           tests. Tests which use a resource one of them locks are also kept
+           together, so that one shard cannot change (or lock out) an account
+           another shard is using; logging in as the same user on several shards
+           at once is fine. So a 'setup' test using a resource another test locks
+           may not be repeated either; this is why the tests which lock out or
+           change a user use the 'Spare' user, rather than the Student user LOGIN
+           logs in as.
+        """
+        locked = set()
+        for resource, (writers, readers) in cls._resource_users().items():
+            if writers:
+                locked.add(resource)
+        repeatable = dict((t, cls._Setup[t] and not (set(cls._Resources[t][0] + cls._Resources[t][1]) & locked))
+                          for t in cls._Tests)
+        unit = dict((t, set([t])) for t in cls._Tests)
+
+        def _join(a, b):
+            if unit[a] is not unit[b]:
+                merged = unit[a] | unit[b]
+                for t in merged:
+                    unit[t] = merged
+        for t in cls._Tests:
+            # Every shard needing a test which can't be repeated must be its shard:
+            for a in cls._ancestors(t):
+                if (a in cls._Tests) and not repeatable[a]:
+                    _join(t, a)
+            for other in cls._Teardowns[t] + cls._RerunTogether[t]:
+                if other in cls._Tests:
+                    _join(t, other)
+        for resource, (writers, readers) in cls._resource_users().items():
+            users = [t for t in writers + readers if not repeatable[t]]
+            if writers and users:
+                for t in users:
+                    _join(t, users[0])
+        units = []
+        for t in cls._Tests:
+            if not [u for u in units if u is unit[t]]:
+                units.append(unit[t])
+        return units
+
+    @classmethod
+    def _resource_users(cls):
+        """Return a dict of {resource: (tests locking it, tests sharing it)} of the declared resources."""
+        users = dict()
+        for t in cls._Tests:
+            exclusive, shared = cls._Resources[t]
+            for r in exclusive:
+                users.setdefault(r, ([], []))[0].append(t)
+            for r in shared:
+                if r not in exclusive:
+                    users.setdefault(r, ([], []))[1].append(t)
+        return users
+
+    @classmethod
+    def _with_ancestors(cls, tests):
+        """Return the set of 'tests' and all tests they depend upon."""
+        found = set(tests)
+        for t in tests:
+            found |= set([a for a in cls._ancestors(t) if a in cls._Tests])
+        return found
+
+    @classmethod
+    def shard_plan(cls, count, durations):
+        """Split the tests into 'count' shards of about equal duration, to run on separate machines.
+
+           Returns a list of 'count' sets of the tests each shard is responsible
+           for. The groups of tests from '_shard_units()' are assigned, longest
+           first, to the shard which would then finish soonest. Each shard must
+           also run the tests its own depend upon, so these are counted too; only
+           'setup' tests are repeated on more than one shard. The plan depends only
+           on the tests and 'durations'; since the shared history changes as shards
+           run, save it once with 'save_shard_plan(...)' for every shard to load.
+            - 'count' is the integer number of shards.
+            - 'durations' is a dict of {TestName: seconds}, such as that returned by
+              'HISTORY.median_durations()'.
+        """
+        cost = cls._shard_cost(durations)
+        position = dict((t, i) for i, t in enumerate(cls._Tests))
+        units = sorted(cls._shard_units(), key=lambda u: (-cost(u), min([position[t] for t in u])))
+        owned = [set() for _ in range(count)]
+        runs = [set() for _ in range(count)]
+        for u in units:
+            needed = cls._with_ancestors(u)
+            best = min(range(count), key=lambda i: (cost(runs[i] | needed), i))
+            owned[best] |= u
+            runs[best] |= needed
+        for i in range(count):
+            log(INFO, "Shard %s of %s: %s tests, about %s seconds." % (i + 1, count, len(runs[i]), int(cost(runs[i]) + 0.5)))
+        return owned
+
+    @classmethod
+    def _shard_cost(cls, durations):
+        """Return a function giving the total seconds of a set of tests, by 'durations' or else their median."""
+        known = sorted([durations[t] for t in cls._Tests if t in durations])
+        default = known[len(known) // 2] if known else 1.0
+        return lambda tests: sum([durations.get(t, default) for t in tests])
+
+    @classmethod
+    def shard_durations(cls, plan, durations):
+        """Return a list of the seconds each shard of 'plan' is expected to take, and the seconds of all tests.
+
+            - 'plan' is a list of sets as returned by 'shard_plan(...)'.
+            - 'durations' is a dict of {TestName: seconds}, as for 'shard_plan(...)'.
+        """
+        cost = cls._shard_cost(durations)
+        return [cost(cls._with_ancestors(owned)) for owned in plan], cost(cls._Tests)
+
+    @classmethod
+    def save_shard_plan(cls, path, plan):
+        """Save the 'plan' returned by 'shard_plan(...)' to 'path', for each shard to load."""
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(dict(tests=list(cls._Tests), plan=plan), f)
+        os.rename(path + ".tmp", path)
+        log(INFO, "Saved the plan of %s shards as '%s'." % (len(plan), path))
+
+    @classmethod
+    def load_shard_plan(cls, path, count):
+        """Return the plan of 'count' shards saved by 'save_shard_plan(...)' to 'path'.
+
+           Raises a 'ValueError' if the plan is not of 'count' shards, or is not of
+           the tests being run, since then shards would miss or repeat tests.
+        """
+        with open(path, "rb") as f:
+            saved = pickle.load(f)
+        if len(saved["plan"]) != count:
+            raise ValueError("Shard plan '%s' is of %s shards, not %s!" % (path, len(saved["plan"]), count))
+        if set(saved["tests"]) != set(cls._Tests):
+            raise ValueError("Shard plan '%s' is of different tests; plan the shards again!" % path)
+        return saved["plan"]
+
+    @classmethod
+    def shard_order(cls, owned, order=None):
+        """Return the list of tests a shard responsible for 'owned' must run, including their dependencies.
+
+            - 'owned' is one of the sets returned by 'shard_plan(...)'.
+            - 'order' is an optional list of all test names to keep the order of.
+        """
+        needed = cls._with_ancestors(owned)
+        return [t for t in (order or cls._Tests) if t in needed]
+
+    @classmethod
+    def save_shard(cls, path, owned, errors, aborted=False):
+        """Save the results of the tests a shard is responsible for to 'path', for 'merge_shards(...)'.
+
+            - 'owned' is the set of tests the shard is responsible for.
+            - 'errors' is the number of errors the shard logged.
+            - 'aborted' notes whether the shard ended with a fatal error.
+        """
+        with cls._Lock:
+            results = dict((t, r) for t, r in cls.Results.items() if t in owned)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(dict(Results=results, errors=errors, aborted=aborted), f)
+        os.rename(path + ".tmp", path)
+
+    @classmethod
+    def merge_shards(cls, paths):
+        """Combine the results saved by each shard into 'Results', in import order.
+
+           Returns a pair of the total errors logged by the shards, and whether any
+           shard was aborted or did not save its results; the tests of a missing
+           shard are left as not run.
+            - 'paths' is the list of filenames passed to 'save_shard(...)'.
+        """
+        errors = 0
+        aborted = False
+        merged = dict()
+        for path in paths:
+            try:
+                with open(path, "rb") as f:
+                    shard = pickle.load(f)
+            except IOError:
+                log(ERROR, "No results from shard '%s'!" % path)
+                aborted = True
+                continue
+            merged.update(shard["Results"])
+            errors += shard["errors"]
+            aborted = aborted or shard["aborted"]
+        for t in cls._Tests:
+            cls.Results[t] = merged.get(t)
+        return errors, aborted
+
+    @classmethod
+    def run_all_tests_parallel(cls, workers, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, PATH_TO_DRIVER, smtp_port=None,
+                               separate_inbox=False, headless=False, order=None):
+        """Run all tests from the test suite concurrently on a pool of WebDrivers.
+
+           Each of the 'workers' threads opens its own WebDriver and GuerrillaInbox
+           using 'start_selenium(...)' and repeatedly takes the first test in
+           dependency order (or in 'order', if given) whose dependencies (and any
+           teardown ordering) have finished and whose declared resources are free.
+           A test with dependencies always runs on the worker which ran the last
+           dependency it lists, since it may rely on the browser state that test
+           left behind; tests without dependencies go to any idle worker.
+           'dependencies_met' is still checked by each test as usual. A deferred
+           test is resumed on the worker which started it, and that worker runs
+           other tests whilst waiting. Tests using a rate limit with no token
+           available are only started if no other test is ready.
+            - 'cls' is automatically passed in because this function is decorated
+              as a classmethod. IGNORE THIS ARGUMENT.
+            - 'workers' is the integer number of WebDrivers to run tests on.
+            - 'Users' should be the TestUsers object.
+            - 'ISAAC_WEB' is the string URL of the Isaac website to be tested.
+            - 'GUERRILLAMAIL' is the string URL of GuerrillaMail.
+            - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
+            - 'PATH_TO_DRIVER' is the path of the WebDriver executable to use, as
+              for 'start_selenium(...)'.
+            - 'smtp_port' is the optional port for an SMTPInbox, as for
+              'start_selenium(...)'; all workers then share one SMTP server.
+            - 'separate_inbox' is an optional flag to give each inbox a WebDriver
+              of its own, as for 'start_selenium(...)'.
+            - 'headless' is an optional flag to run the browsers headless, as for
+              'start_selenium(...)'.
+            - 'order' is an optional list of all test names giving the priority
+              to start them in, such as that returned by 'critical_path_order(...)'.
+        """
+        assert not is_live_site(ISAAC_WEB), "Cannot perform testing on live Isaac website!"
+        from ..utils.initialisation import start_selenium
+        after = cls._ordering_constraints()
+        pending = list(order) if order else cls.topological_order(after)
+        finished = set()
+        ran_on = dict()
+        # The first test each worker could have run but for the resources it needs:
+        blocked = dict()
+        condition = threading.Condition()
+
+        def _next_test(worker_id):
+            # Must be called holding 'condition'. Returns None if nothing is ready,
+            # otherwise the test has taken its resources.
+            waiting = set()
+            blocked.pop(worker_id, None)
+            for t in sorted(pending, key=cls._rate_limited):  # Those able to start now first
+                if not all([(d in finished) or (d not in after) for d in after[t]]):
+                    continue
+                if cls._is_held(t):
+                    continue
+                deps = [d for d in cls._Dependencies[t] if d in ran_on]
+                if deps and (ran_on[deps[-1]] != worker_id):
+                    continue
+                if not cls._lock(t, waiting):
+                    blocked.setdefault(worker_id, t)
+                    continue
+                return t
+            return None
+
+        def _next_job(worker_id):
+            # Must be called holding 'condition'. Returns a (test, resume) pair, or None.
+            for name, deferred in cls._Deferred.items():
+                if (ran_on.get(name) == worker_id) and (deferred.due <= time.time()):
+                    return name, True
+            test = _next_test(worker_id)
+            if test is not None:
+                return test, False
+            return None
+
+        def _has_work(worker_id):
+            # Must be called holding 'condition'.
+            return bool(pending) or any([ran_on.get(name) == worker_id for name in cls._Deferred])
+
+        def _worker(worker_id):
+            try:
+                driver, inbox = start_selenium(Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, PATH_TO_DRIVER,
+                                               smtp_port=smtp_port, separate_inbox=separate_inbox, headless=headless)
+            except Exception, e:
+                log(ERROR, "Worker %s failed to start a WebDriver! %s: '%s'!" % (worker_id, type(e).__name__, e))
+                return
+            kwargs = {"driver": driver, "inbox": inbox, "Users": Users, "ISAAC_WEB": ISAAC_WEB,
+                      "GUERRILLAMAIL": GUERRILLAMAIL, "WAIT_DUR": WAIT_DUR}
+            try:
+                while True:
+                    with condition:
+                        job = _next_job(worker_id)
+                        if (job is None) and (worker_id in blocked):
+                            cls._log_blocked(blocked[worker_id])
+                        while (job is None) and _has_work(worker_id):
+                            condition.wait(1)
+                            job = _next_job(worker_id)
+                        if job is None:
+                            return
+                        test, resume = job
+                        if not resume:
+                            pending.remove(test)
+                            ran_on[test] = worker_id
+                    try:
+                        if resume:
+                            cls._resume(test, kwargs)
+                        else:
+                            cls._Tests[test](**kwargs)
+                    except Exception, e:
+                        with cls._Lock:
+                            cls._Deferred.pop(test, None)
+                        log(ERROR, "Test '%s' raised %s: '%s'!" % (test, type(e).__name__, e))
+                    finally:
+                        with condition:
+                            if test not in cls._Deferred:
+                                finished.add(test)
+                            condition.notify_all()
+            finally:
+                driver.quit()
+                if inbox is not None:
+                    inbox.close()
+                log(INFO, "Worker %s closed its Selenium Driver." % worker_id)
+
+        threads = [threading.Thread(target=_worker, args=(i,), name="Worker-%s" % i) for i in range(1, workers + 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if pending:
+            log(ERROR, "No worker left to run: %s!" % ", ".join(pending))
+
+    @classmethod
+    def dependency_graph(cls, durations=None):
         """Return the dependency graph of the tests in string form.
 
            Produce a string form of the dependency graph suitable for using with
            Graphviz or similar (try: http://www.webgraphviz.com/). May help to
            visualise how the tests interdepend.
+            - 'durations' is an optional dict of {TestName: seconds}, such as that
+              returned by 'HISTORY.median_durations()'. If given, each test is
+              labelled with its duration and the critical path is drawn in red.
+
+           Each resource which tests conflict over is drawn as a box, with a bold
+           edge from each test locking it and a dashed edge from each test sharing it.
         """
+        critical = cls.critical_path(durations) if durations is not None else []
         graph_str = "digraph selenium_tester {\n"
         for n in cls._Dependencies:
-            graph_str += "%s;\n" % n
+            attributes = []
+            if durations is not None:
+                attributes.append('label="%s\\n%s"' % (n, "%.1fs" % durations[n] if n in durations else "?"))
+            if n in critical:
+                attributes.append("color=red")
+            graph_str += "%s%s;\n" % (n, " [%s]" % ", ".join(attributes) if attributes else "")
             for d in cls._Dependencies[n]:
-                graph_str += "%s -> %s;\n" % (n, d)
+                on_path = (n in critical) and (d in critical) and (critical.index(d) == critical.index(n) - 1)
+                graph_str += "%s -> %s%s;\n" % (n, d, " [color=red]" if on_path else "")
+        for resource, (writers, readers) in sorted(cls._resource_users().items()):
+            if not writers or len(writers + readers) < 2:
+                continue
+            graph_str += '"%s" [shape=box, color=blue];\n' % resource
+            for t in writers:
+                graph_str += '%s -> "%s" [style=bold, color=blue];\n' % (t, resource)
+            for t in readers:
+                graph_str += '%s -> "%s" [style=dashed, color=blue];\n' % (t, resource)
         graph_str += "}"
         return graph_str
 
@@ -205,15 +1058,7 @@ from .numeric_q_units_select import numeric_q_units_select
 from .numeric_q_all_correct import numeric_q_all_correct
 from .numeric_q_answer_reloaded import numeric_q_answer_reloaded
 from .numeric_q_answer_change import numeric_q_answer_change
-from .numeric_q_incorrect_unit import numeric_q_incorrect_unit
-from .numeric_q_incorrect_value import numeric_q_incorrect_value
-from .numeric_q_all_incorrect import numeric_q_all_incorrect
-from .numeric_q_incorrect_sf import numeric_q_incorrect_sf
-from .numeric_q_incorrect_sf_u import numeric_q_incorrect_sf_u
-from .numeric_q_known_wrong_ans import numeric_q_known_wrong_ans
-from .numeric_q_known_wrong_sf import numeric_q_known_wrong_sf
-from .numeric_q_known_wrong_sf_tagged import numeric_q_known_wrong_sf_tagged
-from .numeric_q_units_none import numeric_q_units_none
+from .numeric_q_cases import *
 from .numeric_q_help_popup import numeric_q_help_popup
 from .answer_saved_login import answer_saved_login
 from .symbolic_q_text_entry_correct import symbolic_q_text_entry_correct
@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -11,7 +10,7 @@ __all__ = ["accept_cookies"]
 #####
 # Test : Global Navigation Menu
 #####
-@TestWithDependency("ACCEPT_COOKIES", ["LOGIN"])
+@TestWithDependency("ACCEPT_COOKIES", ["LOGIN"], setup=True)
 def accept_cookies(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether the banner disappears after accepting cookies.
 
@@ -21,10 +20,10 @@ def accept_cookies(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         wait_for_xpath_element(driver, "//div[@data-alert and contains(@class, 'cookies-message')]")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Clicking 'Accept' on the cookies message.")
         cookie_message = driver.find_element_by_xpath("//a[contains(@class, 'cookies-accepted')]")
         cookie_message.click()
@@ -44,7 +43,7 @@ def accept_cookies(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     try:
         log(INFO, "Reloading the page to see if cookie message stays gone.")
         driver.refresh()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         wait_for_invisible_xpath(driver, "//div[@data-alert and contains(@class, 'cookies-message')]")
         log(INFO, "Cookies message does not reappear.")
         log(PASS, "The cookie message behaves as expected.")
@@ -1,9 +1,8 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
-from ..utils.isaac import open_accordion_section, close_accordion_section, wait_accordion_open, wait_accordion_closed
-from ..tests import TestWithDependency
+from ..utils.isaac import open_accordion_section, close_accordion_section, wait_accordion_open, wait_accordion_closed, logout_of_isaac
+from ..tests import TestWithDependency, LOGGED_OUT
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 __all__ = ["accordion_behavior"]
@@ -12,7 +11,7 @@ __all__ = ["accordion_behavior"]
 #####
 # Test : Accordion Sections Open and Close
 #####
-@TestWithDependency("ACCORDION_BEHAVIOUR")
+@TestWithDependency("ACCORDION_BEHAVIOUR", role=LOGGED_OUT, start_url="/questions/_regression_test_", setup=True)
 def accordion_behavior(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if accordions open and close as expected.
 
@@ -21,18 +20,16 @@ def accordion_behavior(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     driver.get(ISAAC_WEB + "/questions/_regression_test_")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/questions/_regression_test_"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     log(INFO, "Check accordions open first section automatically.")
     try:
         wait_for_xpath_element(driver, "//p[text()='This is a quick question.']")
         log(INFO, "First accordion section open by default on question pages.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except TimeoutException:
         image_div(driver, "ERROR_accordion_default")
         log(ERROR, "First accordion section not open by default; see 'ERROR_accordion_default.png'.")
@@ -40,7 +37,7 @@ def accordion_behavior(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     log(INFO, "Try closing an accordion section.")
     try:
         close_accordion_section(driver, 1)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         wait_for_invisible_xpath(driver, "//p[text()='This is a quick question.']")
         log(INFO, "Accordions close as expected.")
     except NoSuchElementException:
@@ -53,11 +50,11 @@ def accordion_behavior(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     log(INFO, "Try reopening accordion section.")
     try:
         open_accordion_section(driver, 1)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         wait_for_xpath_element(driver, "//p[text()='This is a quick question.']")
         log(INFO, "Accordions open as expected.")
         close_accordion_section(driver, 1)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Closed accordion section; all should now be closed.")
     except NoSuchElementException:
         log(ERROR, "Can't find accordion title bar to click again; can't continue!")
@@ -81,7 +78,7 @@ def accordion_behavior(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
             accordion_title.click()
             wait_accordion_closed(driver, n)
             log(INFO, "Accordion section %s correctly hidden." % n)
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
     except TimeoutException:
         log(ERROR, "Couldn't open all accordion sections!")
         return False
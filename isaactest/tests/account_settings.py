@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import submit_login_form, assert_logged_in
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.isaac import submit_login_form, assert_logged_in, logout_of_isaac
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotVisibleException, ElementNotInteractableException
@@ -13,7 +12,7 @@ __all__ = ["account_settings"]
 #####
 # Test : Update Account Settings
 #####
-@TestWithDependency("ACCOUNT_SETTINGS", ["SIGNUP"])
+@TestWithDependency("ACCOUNT_SETTINGS", ["SIGNUP"], role="Guerrilla", locks=["user:Guerrilla"])
 def account_settings(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if users account settings can be accessed and changed.
 
@@ -23,26 +22,24 @@ def account_settings(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     driver.get(ISAAC_WEB + "/login")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/login"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     submit_login_form(driver, user=Users.Guerrilla, wait_dur=WAIT_DUR)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     try:
         assert_logged_in(driver, user=Users.Guerrilla)
         global_nav = driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
         global_nav.click()
         log(INFO, "Opened global nav (menu bar).")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         my_account_link = driver.find_element_by_xpath("(//a[@ui-sref='accountSettings'])[2]")
         my_account_link.click()
         log(INFO, "Clicked 'My Account' button.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except (NoSuchElementException, ElementNotVisibleException):
         image_div(driver, "ERROR_account_global_nav")
         log(ERROR, "Couldn't access 'My Account' link from global nav; see ERROR_account_global_nav.png'")
@@ -66,7 +63,7 @@ def account_settings(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         gender_other_box = driver.find_element_by_xpath("//div[@id='account-gender']//input[@value='OTHER']")
         gender_other_box.click()
         log(INFO, "Changed account Gender.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         dob_selects = driver.find_elements_by_xpath("//ul[contains(@class,'dob-wrap')]//select")
         assert len(dob_selects) == 3, "Can't find date of birth selection, can't continue!"
         dob_day = Select(dob_selects[0])
@@ -93,7 +90,7 @@ def account_settings(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         school_option = driver.find_elements_by_xpath("//div[@school-dropdown]//li/span[contains(text(), '%s')]/.." % school_name)[0]
         school_option.click()
         log(INFO, "Changed account School.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Can't find school dropdown, can't continue!")
         return False
@@ -112,7 +109,7 @@ def account_settings(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         save_button = driver.find_element_by_xpath("//a[text()='Save']")
         save_button.click()
         log(INFO, "Saving account changes.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         new_url = driver.current_url
         assert new_url != old_url, "Expected to be redirected to homepage on save!"
         log(INFO, "Account changes saved successfully and redirected to '%s'." % new_url)
@@ -127,7 +124,7 @@ def account_settings(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     try:
         driver.get(ISAAC_WEB + "/account")
         log(INFO, "Returning to My Account page.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
 
         log(INFO, "Checking account settings changes were persisted.")
         gender_other_box = driver.find_element_by_xpath("//div[@id='account-gender']//input[@value='OTHER']")
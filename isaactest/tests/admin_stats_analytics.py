@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -11,7 +10,7 @@ __all__ = ["admin_stats_analytics"]
 #####
 # Test : Admin Stats Analytics Page
 #####
-@TestWithDependency("ADMIN_STATS_ANALYTICS", ["ADMIN_STATS_SUMMARY"])
+@TestWithDependency("ADMIN_STATS_ANALYTICS", ["ADMIN_STATS_SUMMARY"], start_url="/admin/stats")
 def admin_stats_analytics(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if admin stats analyitcs page works.
 
@@ -20,7 +19,7 @@ def admin_stats_analytics(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB + "/admin/stats")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         analytics_button = driver.find_element_by_xpath("//a[@ui-sref='adminStats.isaacAnalytics']")
         analytics_button.click()
@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -11,7 +10,7 @@ __all__ = ["admin_stats_schools"]
 #####
 # Test : Admin Stats Analytics Page - School Stats
 #####
-@TestWithDependency("ADMIN_STATS_SCHOOLS", ["ADMIN_STATS_ANALYTICS"])
+@TestWithDependency("ADMIN_STATS_SCHOOLS", ["ADMIN_STATS_ANALYTICS"], start_url="/admin/stats")
 def admin_stats_schools(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if admin stats schools info page works.
 
@@ -20,7 +19,7 @@ def admin_stats_schools(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB + "/admin/stats")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         gameboards_button = driver.find_element_by_xpath("//a[@ui-sref='adminStats.schoolUserSummaryList']")
         gameboards_button.click()
@@ -54,14 +53,14 @@ def admin_stats_schools(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         school_detail_link = str(driver.find_element_by_xpath("//tr/td[text()='University of Cambridge']/..//a").get_attribute("href"))
         driver.get(school_detail_link)
         log(INFO, "Got: '%s'" % (school_detail_link))
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         rows = driver.find_elements_by_xpath("//div/h2[contains(text(), 'University of Cambridge')]/..//..//table//tr")
         assert len(rows) == connected_count + 1, "Expected to find %s users, found %s!" % (connected_count, len(rows) - 1)
         log(INFO, "School detail page displays expected number of users.")
 
         driver.get(ISAAC_WEB + "/logout")
         log(INFO, "Logging out any logged in user.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(INFO, "Can't find school detail link; can't continue!")
         return False
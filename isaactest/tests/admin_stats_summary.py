@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import submit_login_form
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.isaac import submit_login_form, logout_of_isaac
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -12,7 +11,7 @@ __all__ = ["admin_stats_summary"]
 #####
 # Test : Admin Stats "At a Glance" Page
 #####
-@TestWithDependency("ADMIN_STATS_SUMMARY")
+@TestWithDependency("ADMIN_STATS_SUMMARY", role="Admin", start_url="/admin/stats")
 def admin_stats_summary(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if admin stats summary page works.
 
@@ -22,16 +21,14 @@ def admin_stats_summary(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     driver.get(ISAAC_WEB + "/admin/stats")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/admin/stats"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         assert submit_login_form(driver, user=Users.Admin, wait_dur=WAIT_DUR)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         wait_for_xpath_element(driver, "//h2[text()='Statistics Menu']")
         log(INFO, "Admin stats page loaded.")
     except AssertionError:
@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import submit_login_form
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.isaac import login_as
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_invisible_xpath
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -13,7 +12,7 @@ __all__ = ["admin_user_search"]
 #####
 # Test : User Search as Admin
 #####
-@TestWithDependency("ADMIN_USER_SEARCH")
+@TestWithDependency("ADMIN_USER_SEARCH", role="Admin", start_url="/admin/usermanager", setup=True, shared_locks=["user:Student"])
 def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if admin users can search for users.
 
@@ -23,17 +22,12 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     log(INFO, "Test user search page as admin.")
-    driver.get(ISAAC_WEB + "/admin/usermanager")
-    log(INFO, "Got: %s" % (ISAAC_WEB + "/admin/usermanager"))
-    time.sleep(WAIT_DUR)
     try:
-        assert submit_login_form(driver, user=Users.Admin, wait_dur=WAIT_DUR)
-        time.sleep(WAIT_DUR)
+        assert login_as(driver, ISAAC_WEB, Users.Admin, url=ISAAC_WEB + "/admin/usermanager", wait_dur=WAIT_DUR)
+        log(INFO, "Got: %s" % (ISAAC_WEB + "/admin/usermanager"))
+        wait_for_stable(driver, WAIT_DUR)
     except AssertionError:
         log(ERROR, "Can't access User Manager; can't continue testing!")
         return False
@@ -43,7 +37,7 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Test search by family name.")
         name_field = driver.find_element_by_id("user-search-familyName")
         name_field.send_keys(Users.Student.lastname)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         search_button = driver.find_elements_by_xpath("//button[@type='submit']")[0]
         search_button.click()
         wait_for_invisible_xpath(driver, "//h3[contains(text(), 'Manage Users ()')]")
@@ -52,7 +46,7 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Search by family name works as expected.")
         driver.refresh()
         log(INFO, "Refresh the page to clear all results.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except TimeoutException:
         log(ERROR, "Search button did not work; can't continue testing!")
         return False
@@ -69,10 +63,10 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     # Search by email address:
     try:
         log(INFO, "Test search by email address.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         email_field = driver.find_element_by_id("user-search-email")
         email_field.send_keys(Users.Teacher.email)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         search_button = driver.find_elements_by_xpath("//button[@type='submit']")[0]
         search_button.click()
         wait_for_invisible_xpath(driver, "//h3[contains(text(), 'Manage Users ()')]")
@@ -81,7 +75,7 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Search by email works as expected.")
         driver.refresh()
         log(INFO, "Refresh the page to clear all results.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except TimeoutException:
         log(ERROR, "Search button did not work; can't continue testing!")
         return False
@@ -98,11 +92,11 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     # Search by manually entered schools:
     try:
         log(INFO, "Test search by manually entered school name.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         school_other_input = driver.find_element_by_id("user-school-other")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         school_other_input.send_keys("A Manually Entered School")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         search_button = driver.find_elements_by_xpath("//button[@type='submit']")[0]
         search_button.click()
         wait_for_invisible_xpath(driver, "//h3[contains(text(), 'Manage Users ()')]")
@@ -111,7 +105,7 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Search by manual school works as expected.")
         driver.refresh()
         log(INFO, "Refresh the page to clear all results.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except TimeoutException:
         log(ERROR, "Search button did not work; can't continue testing!")
         return False
@@ -128,10 +122,10 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     # Search by school URN:
     try:
         log(INFO, "Test search by school URN.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         urn_field = driver.find_element_by_id("user-school-urn")
         urn_field.send_keys("133801")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         search_button = driver.find_elements_by_xpath("//button[@type='submit']")[0]
         search_button.click()
         wait_for_invisible_xpath(driver, "//h3[contains(text(), 'Manage Users ()')]")
@@ -140,7 +134,7 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Search by school URN works as expected.")
         driver.refresh()
         log(INFO, "Refresh the page to clear all results.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except TimeoutException:
         log(ERROR, "Search button did not work; can't continue testing!")
         return False
@@ -157,7 +151,7 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     # Global wildcard search:
     try:
         log(INFO, "Test wildcard searches.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         text = str(driver.find_element_by_id("user-search-familyName").text)
         text += str(driver.find_element_by_id("user-search-email").text)
         text += str(driver.find_element_by_id("user-school-urn").text)
@@ -165,13 +159,13 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         search_button = driver.find_elements_by_xpath("//button[@type='submit']")[0]
         search_button.click()
         wait_for_invisible_xpath(driver, "//div[@class='toast-message']/h4", 0.5)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         results = driver.find_elements_by_xpath("//table//tr")
         assert len(results) > 5, "Expected at least 5 users, got '%s'!" % len(results)
         log(INFO, "Wildcard search works as expected.")
         driver.refresh()
         log(INFO, "Refresh the page to clear all results.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except TimeoutException:
         image_div(driver, "ERROR_admin_user_search")
         log(ERROR, "Error message unexpectedly shown; see 'ERROR_admin_user_search.png'!")
@@ -189,21 +183,21 @@ def admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     # Search by user type:
     try:
         log(INFO, "Test search by user role.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         role_dropdown = Select(driver.find_element_by_id("user-search-role"))
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         role_dropdown.select_by_value("STUDENT")
         search_button = driver.find_elements_by_xpath("//button[@type='submit']")[0]
         search_button.click()
         wait_for_invisible_xpath(driver, "//div[@class='toast-message']/h4", 0.5)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         results = driver.find_elements_by_xpath("//table//tr/td[5]")
         for r in results:
             assert str(r.text) == "STUDENT", "Unexpected role '%s' in results for type 'STUDENT'; can't continue!" % r.text
         log(INFO, "Search by role works as expected.")
         driver.refresh()
         log(INFO, "Refresh the page to clear all results.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except TimeoutException:
         image_div(driver, "ERROR_admin_user_search")
         log(ERROR, "Error message unexpectedly shown; see 'ERROR_admin_user_search.png'!")
@@ -1,10 +1,9 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import submit_login_form, assert_logged_in
+from ..utils.isaac import submit_login_form, assert_logged_in, logout_of_isaac
 from ..utils.isaac import answer_numeric_q, open_accordion_section
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
-from ..tests import TestWithDependency
+from ..tests import TestWithDependency, LOGGED_OUT
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 __all__ = ["answer_saved_login"]
@@ -13,7 +12,8 @@ __all__ = ["answer_saved_login"]
 #####
 # Test : Anonymous Answers Preserved On Login
 #####
-@TestWithDependency("ANSWER_SAVED_LOGIN", ["SIGNUP", "NUMERIC_Q_ALL_CORRECT"])
+@TestWithDependency("ANSWER_SAVED_LOGIN", ["SIGNUP", "NUMERIC_Q_ALL_CORRECT"], role=LOGGED_OUT, start_url="/questions/_regression_test_", shared_locks=["user:Guerrilla"],
+                    rate_limits=["answers"])
 def answer_saved_login(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test that questions answered whilst logged out are retained once logged in.
 
@@ -23,16 +23,14 @@ def answer_saved_login(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     driver.get(ISAAC_WEB + "/questions/_regression_test_")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/questions/_regression_test_"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         open_accordion_section(driver, 3)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         num_question = wait_for_xpath_element(driver, "//div[@ng-switch-when='isaacNumericQuestion']")
         log(INFO, "Accordion opened, numeric question displayed.")
     except NoSuchElementException:
@@ -42,7 +40,7 @@ def answer_saved_login(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         image_div(driver, "ERROR_answer_saved_login")
         log(ERROR, "Accordion section did not open to display the numeric question; see 'ERROR_answer_saved_login.png'!")
         return False
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         num_question = driver.find_element_by_xpath("//div[@ng-switch-when='isaacNumericQuestion']")
     except NoSuchElementException:
@@ -53,7 +51,7 @@ def answer_saved_login(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     if not answer_numeric_q(num_question, "2.01", "\units{ m\,s^{-1} }", wait_dur=WAIT_DUR):
         log(ERROR, "Couldn't answer Numeric Question; can't continue!")
         return False
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     try:
         wait_for_xpath_element(driver, "//div[@ng-switch-when='isaacNumericQuestion']//h1[text()='Correct!']")
@@ -63,24 +61,24 @@ def answer_saved_login(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(ERROR, "The 'Correct' message was not shown; see 'ERROR_answer_saved_login.png'!")
         return False
 
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     driver.get(ISAAC_WEB + "/login")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/login"))
     try:
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         submit_login_form(driver, user=Users.Guerrilla, wait_dur=WAIT_DUR)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         assert_logged_in(driver, user=Users.Guerrilla, wait_dur=WAIT_DUR)
     except AssertionError:
         log(ERROR, "Can't login; can't continue testing!")
         return False
     driver.get(ISAAC_WEB + "/questions/_regression_test_")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/questions/_regression_test_"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     try:
         open_accordion_section(driver, 3)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         num_question = wait_for_xpath_element(driver, "//div[@ng-switch-when='isaacNumericQuestion']")
         log(INFO, "Accordion opened, numeric question displayed.")
     except NoSuchElementException:
@@ -102,6 +100,6 @@ def answer_saved_login(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
 
     driver.get(ISAAC_WEB + "/logout")
     log(INFO, "Logging out logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     log(PASS, "Anonymous question answers are preserved upon logging in.")
     return True
@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import get_hexagon_properties
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException
 
@@ -11,7 +10,7 @@ __all__ = ["back_to_board"]
 #####
 # Test : Back to Board Button
 #####
-@TestWithDependency("BACK_TO_BOARD")
+@TestWithDependency("BACK_TO_BOARD", start_url="/", setup=True)
 def back_to_board(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether the back to board button works.
 
@@ -22,11 +21,11 @@ def back_to_board(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB)
     log(INFO, "Got: %s" % ISAAC_WEB)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         questions_tab = driver.find_element_by_xpath("//a[@ui-sref='gameBoards({filter: true})']")
         questions_tab.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Can't find 'Questions' tab link; can't continue!")
         return False
@@ -40,11 +39,11 @@ def back_to_board(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
             if hexagon["type"] == "Question":
                 hexagons[i].click()
                 log(INFO, "Hexagon is a question; clicked on it.")
-                time.sleep(WAIT_DUR)
+                wait_for_stable(driver, WAIT_DUR)
                 back_to_board_button = driver.find_element_by_xpath("//a[@ng-click='backToBoard()']")
                 back_to_board_button.click()
                 log(INFO, "Clicked back to board button.")
-                time.sleep(WAIT_DUR)
+                wait_for_stable(driver, WAIT_DUR)
                 new_url = str(driver.current_url).replace("?filter=true", "").replace("?filter", "")
                 assert new_url == url, "Expected to end on '%s', actually ended on '%s'!" % (url, new_url)
         log(PASS, "Back to board button worked as expected.")
@@ -1,8 +1,9 @@
-import time
 import random
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, wait_for_invisible_xpath, wait_for_xpath_element
-from ..utils.isaac import submit_login_form
+from ..utils.i_selenium import assert_tab, wait_for_invisible_xpath, wait_for_xpath_element, wait_for_stable
+from ..utils.i_selenium import wait_for_alert
+from ..utils.isaac import login_as
+from ..utils.page_timing import time_action
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, NoAlertPresentException
 from selenium.webdriver.support.ui import Select
@@ -18,28 +19,26 @@ def check_all_results(driver, assertion, failure_message_formatter, allow_empty=
         assert assertion(question_result), failure_message_formatter(question_result.text)
 
 
-@TestWithDependency('BOARD_BUILDER')
+@TestWithDependency('BOARD_BUILDER', role="Admin", start_url="/game_builder", budgets={"/game_builder search": 1.5})
 def board_builder(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     try:
         random_id = ''.join(random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890') for _ in range(8))
 
         log(INFO, "Log in as an admin user and go to page")
         assert_tab(driver, ISAAC_WEB)
-        driver.get(ISAAC_WEB + '/logout')
-        driver.get(ISAAC_WEB + '/game_builder')
-        assert submit_login_form(driver, user=Users.Admin, wait_dur=WAIT_DUR), "Can't access User Admin; can't continue testing!"
+        assert login_as(driver, ISAAC_WEB, Users.Admin, url=ISAAC_WEB + '/game_builder', wait_dur=WAIT_DUR), "Can't access User Admin; can't continue testing!"
 
         log(INFO, "Test subject field filtering")
         subject_field = Select(driver.find_element_by_xpath('//select[@ng-model="questionSearchSubject"]'))
 
         subject_field.select_by_visible_text('Mathematics')
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         check_all_results(driver,
                           lambda question_result: 'maths' in question_result.text.lower(),
                           lambda question_result_text: '"maths" was not found in "{}"'.format(question_result_text.lower()))
 
         subject_field.select_by_visible_text('Physics')
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         check_all_results(driver,
                           lambda question_result: 'physics' in question_result.text.lower(),
                           lambda question_result_text: '"physics" was not found in "{}"'.format(question_result_text.lower()))
@@ -47,15 +46,16 @@ def board_builder(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Test level field filtering")
         level_field = Select(driver.find_element_by_xpath('//select[@ng-model="questionSearchLevel"]'))
         level_field.select_by_visible_text('2')
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         check_all_results(driver,
                           lambda question_result: 'level 2' in question_result.text.lower(),
                           lambda question_result_text: '"level 2" was not found in "{}"'.format(question_result_text.lower()))
 
         log(INFO, "Test query field filtering")
         query_field = driver.find_element_by_xpath('//input[@ng-model="questionSearchText"]')
-        query_field.send_keys('toboggan')
-        time.sleep(WAIT_DUR)
+        with time_action(driver, "/game_builder search"):
+            query_field.send_keys('toboggan')
+        wait_for_stable(driver, WAIT_DUR)
         check_all_results(driver,
                           lambda question_result: 'toboggan' in question_result.text.lower(),
                           lambda question_result_text: '"toboggan" was not found in "{}"'.format(question_result_text.lower()))
@@ -63,14 +63,14 @@ def board_builder(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Check book links work")
         mastering_physics_link = driver.find_element_by_xpath('//a[text() = "Pre-University Physics"]')
         mastering_physics_link.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         check_all_results(driver,
                           lambda question_result: all(keyword in question_result.text.lower() for keyword in ['physics', 'physics_skills_14']),
                           lambda question_result_text: '"physics" or "physics_skills_14" was not found in "{}"'.format(question_result_text.lower()))
 
         mastering_chemistry_link = driver.find_element_by_xpath('//a[text() = "Physical Chemistry"]')
         mastering_chemistry_link.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         check_all_results(driver,
                           lambda question_result: all(keyword in question_result.text.lower() for keyword in ['chemistry', 'chemistry_16']),
                           lambda question_result_text: '"chemistry" or "chemistry_16" was not found in "{}"'.format(question_result_text.lower()))
@@ -123,14 +123,14 @@ def board_builder(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Make a wild card selection")
         wildcard_field = Select(driver.find_element_by_xpath('//select[@ng-model="userSelectedBoardWildCardId"]'))
         wildcard_field.select_by_visible_text('About Us')
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         about_us_hex = driver.find_elements_by_xpath('//div[@class="ru-hex-home-title" and text() = "About Us"]')
         assert len(about_us_hex), 'Not able to see chosen wildcard'
 
         log(INFO, "Save the board")
         save_button = driver.find_element_by_xpath('//button[@type="submit" and text() = "Save this board"]')
         save_button.click()
-        time.sleep(WAIT_DUR)
+        wait_for_alert(driver, WAIT_DUR)
         try:
             alert = driver.switch_to.alert
             assert 'save' in alert.text, 'Alert text did not contain "save"'
@@ -140,12 +140,12 @@ def board_builder(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
             return False
 
         log(INFO, "Use a URL to populate board builder fields")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         driver.get(ISAAC_WEB + '/game_builder?query="physics_skills_14"&subject=physics&level=any&sort=title')
         subject_field = Select(driver.find_element_by_xpath('//select[@ng-model="questionSearchSubject"]'))
         level_field = Select(driver.find_element_by_xpath('//select[@ng-model="questionSearchLevel"]'))
         query_field = driver.find_element_by_xpath('//input[@ng-model="questionSearchText"]')
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         question_result_titles = [' - '.join(question_result.text.split(' - ')[:-2]) for question_result in driver.find_elements_by_xpath("//ul[@class='no-bullet results-list ng-scope']//li")]
         assert subject_field.first_selected_option.text == 'Physics', 'Subject field value "{}" does not match expected "{}"'.format(subject_field.first_selected_option.text, 'Physics')
         assert level_field.first_selected_option.text == 'Any', 'Level field value "{}" does not match expected "{}"'.format(level_field.first_selected_option.text, 'Any')
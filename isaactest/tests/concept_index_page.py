@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, wait_for_xpath_element
+from ..utils.i_selenium import assert_tab, wait_for_xpath_element, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
@@ -10,7 +9,7 @@ __all__ = ["concept_index_page"]
 #####
 # Test : Concept Index Page
 #####
-@TestWithDependency("CONCEPT_INDEX_PAGE")
+@TestWithDependency("CONCEPT_INDEX_PAGE", start_url="/", setup=True)
 def concept_index_page(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether the concept index page works as expected.
 
@@ -21,12 +20,12 @@ def concept_index_page(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB)
     log(INFO, "Returning to homepage.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         log(INFO, "Attempting to click 'Concepts' tab button.")
         concept_button = driver.find_element_by_xpath("//div[@class='ru-desktop-nav']//a[@ui-sref='conceptIndex']")
         concept_button.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Can't find concepts button; can't continue!")
         return False
@@ -42,7 +41,7 @@ def concept_index_page(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Checking that concept filtering works as expected.")
         concept_filter_box = driver.find_element_by_xpath("//input[@ng-model='searchText']")
         concept_filter_box.send_keys("newton")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
 
         filtered_links = driver.find_elements_by_xpath("//a[contains(@ng-repeat, 'filteredConcepts')]")
         num_filtered_newton = len(filtered_links)
@@ -51,7 +50,7 @@ def concept_index_page(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Filtered by 'newton', found %d results." % num_filtered_newton)
         concept_filter_box.clear()
         log(INFO, "Clearing text filter.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except TimeoutException:
         log(ERROR, "Concept index didn't load, can't continue!")
         return False
@@ -75,7 +74,7 @@ def concept_index_page(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         assert include_physics.is_selected(), "Expected 'Include Physics' to be ticked by default!"
         log(INFO, "Physics and Maths concepts shown initially, now try filter by Physics only.")
         include_maths.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
 
         phys_titles = driver.find_elements_by_xpath("//h4/span[@ng-show='physics']")
         is_physics_concept = [element.is_displayed() for element in phys_titles]
@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, wait_for_xpath_element
+from ..utils.i_selenium import assert_tab, wait_for_xpath_element, wait_for_stable
 from ..utils.isaac import open_accordion_section, wait_accordion_open
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
@@ -11,7 +10,7 @@ __all__ = ["concept_pages"]
 #####
 # Test : Concept Pages
 #####
-@TestWithDependency("CONCEPT_PAGES", ["CONCEPT_INDEX_PAGE", "ACCORDION_BEHAVIOUR"])
+@TestWithDependency("CONCEPT_PAGES", ["CONCEPT_INDEX_PAGE", "ACCORDION_BEHAVIOUR"], start_url="/")
 def concept_pages(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether the concept pages work as expected.
 
@@ -22,12 +21,12 @@ def concept_pages(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB)
     log(INFO, "Returning to homepage.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         log(INFO, "Click the 'Concepts' tab button.")
         concept_button = driver.find_element_by_xpath("//div[@class='ru-desktop-nav']//a[@ui-sref='conceptIndex']")
         concept_button.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Can't find concepts button; can't continue!")
         return False
@@ -37,12 +36,12 @@ def concept_pages(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Filtering concepts to find the 'Fields' concept page.")
         concept_filter_box = driver.find_element_by_xpath("//input[@ng-model='searchText']")
         concept_filter_box.send_keys("Fields")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
 
         field_button = driver.find_element_by_xpath("//a[contains(@ng-repeat, 'filteredConcepts')]//h4[text()[contains(.,'Fields')]]")
         field_button.click()
         log(INFO, "Clicking on 'Fields' concept page.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except TimeoutException:
         log(ERROR, "Concept Index didn't load; can't continue!")
         return False
@@ -1,7 +1,7 @@
 import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import submit_login_form
-from ..utils.i_selenium import assert_tab
+from ..utils.isaac import submit_login_form, logout_of_isaac
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -12,7 +12,7 @@ __all__ = ["delete_user"]
 #####
 # Test : Delete A User
 #####
-@TestWithDependency("DELETE_USER", ["LOGIN", "SIGNUP", "ADMIN_USER_SEARCH"])
+@TestWithDependency("DELETE_USER", ["LOGIN", "SIGNUP", "ADMIN_USER_SEARCH"], role="Admin", locks=["user:Guerrilla"])
 def delete_user(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if admin users can delete users.
 
@@ -22,31 +22,29 @@ def delete_user(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     log(INFO, "Attempt to delete temporary user.")
     driver.get(ISAAC_WEB + "/login")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/login"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         submit_login_form(driver, user=Users.Admin, wait_dur=WAIT_DUR)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Navigating to User Manager using the Menu.")
         global_nav = driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
         global_nav.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         user_manager_link = driver.find_element_by_xpath("//a[@ui-sref='adminUserManager']")
         user_manager_link.click()
     except NoSuchElementException:
         log(ERROR, "Can't access User Manager from Global Nav; can't continue testing!")
         return False
     try:
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Entering user information (%s) to search and delete account." % Users.Guerrilla.email)
         email_field = driver.find_element_by_id("user-search-email")
         email_field.send_keys(Users.Guerrilla.email)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         search_button = driver.find_element_by_xpath("//button[@type='submit']")
         search_button.click()
         wait_for_invisible_xpath(driver, "//h3[contains(text(), 'Manage Users ()')]")
@@ -72,11 +70,11 @@ def delete_user(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         popup_text = popup.text
         log(INFO, "Popup said: '%s'." % popup_text)
         assert 'successfully deleted' in popup_text
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "User deleted.")
         driver.get(ISAAC_WEB + "/logout")
         log(INFO, "Logging out the admin user.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(PASS, "User '%s' deleted successfuly." % Users.Guerrilla.email)
         return True
     except NoSuchElementException:
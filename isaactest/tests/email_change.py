@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import submit_login_form
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.isaac import submit_login_form, logout_of_isaac
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable, wait_for_alert
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException, ElementNotVisibleException
 
@@ -11,7 +10,7 @@ __all__ = ["email_change"]
 #####
 # Test : Change Email Address
 #####
-@TestWithDependency("EMAIL_CHANGE", ["LOGIN", "GLOBAL_NAV", "SIGNUP", "RECIEVE_VERIFY_EMAILS"])
+@TestWithDependency("EMAIL_CHANGE", ["LOGIN", "GLOBAL_NAV", "SIGNUP", "RECIEVE_VERIFY_EMAILS"], role="Guerrilla", locks=["user:Guerrilla"])
 def email_change(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if users can change their email address.
 
@@ -21,26 +20,24 @@ def email_change(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     log(INFO, "Attempting to change email address for '%s'." % Users.Guerrilla.email)
     driver.get(ISAAC_WEB + "/login")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/login"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     submit_login_form(driver, user=Users.Guerrilla, wait_dur=WAIT_DUR)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     try:
         global_nav = driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
         global_nav.click()
         log(INFO, "Opened global nav (menu bar).")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         my_account_link = driver.find_element_by_xpath("(//a[@ui-sref='accountSettings'])[2]")
         my_account_link.click()
         log(INFO, "Clicked 'My Account' button.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except (NoSuchElementException, ElementNotVisibleException):
         image_div(driver, "ERROR_account_global_nav")
         log(ERROR, "Couldn't access 'My Account' link from global nav; see ERROR_account_global_nav.png'")
@@ -52,19 +49,19 @@ def email_change(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         image_div(driver, "change_email_old_email", email_address_box.find_element_by_xpath(".."))
         email_address_box.clear()
         email_address_box.send_keys(Users.Guerrilla.new_email)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         image_div(driver, "change_email_new_email", email_address_box.find_element_by_xpath(".."))
         save_button = driver.find_element_by_xpath("//a[text()='Save']")
         save_button.click()
-        time.sleep(WAIT_DUR)
+        wait_for_alert(driver, WAIT_DUR)
         alert = driver.switch_to.alert
         alert_text = alert.text
         alert.accept()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Have to accept an alert.")
         assert "You have edited your email address." in alert_text, "Alert contained unexpected message '%s'!" % alert_text
         log(INFO, "Alert said: '%s'." % alert_text)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         end_url = driver.current_url
         assert end_url != start_url, "Expected to leave account page, but still on '%s'!" % end_url
         end_loc = end_url.split("#")[0]
@@ -1,7 +1,5 @@
-import time
-from ..emails.guerrillamail import set_guerrilla_mail_address
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import image_div, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException
 
@@ -11,17 +9,17 @@ __all__ = ["email_change_emails"]
 #####
 # Test : Check Change Email Emails Recieved
 #####
-@TestWithDependency("EMAIL_CHANGE_EMAILS", ["EMAIL_CHANGE"])
+@TestWithDependency("EMAIL_CHANGE_EMAILS", ["EMAIL_CHANGE"], locks=["inbox"])
 def email_change_emails(driver, inbox, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, **kwargs):
     """Test if the email change confirmation emails are recieved.
 
         - 'driver' should be a Selenium WebDriver.
-        - 'inbox' should be a GuerrillaInbox object.
+        - 'inbox' should be a GuerrillaInbox or SMTPInbox object.
         - 'Users' must be a TestUsers object.
         - 'GUERRILLAMAIL' is the string URL of GuerrillaMail.
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
-    assert_tab(driver, GUERRILLAMAIL)
+    inbox.activate()
     log(INFO, "Checking if emails were sent after changing account email.")
     inbox.wait_for_email(WAIT_DUR)
 
@@ -42,8 +40,8 @@ def email_change_emails(driver, inbox, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR
     except NoSuchElementException:
         log(ERROR, "Link to new address not in old warning email, see image!")
         return False
-    time.sleep(WAIT_DUR)
-    set_guerrilla_mail_address(driver, Users.Guerrilla.new_email)
+    wait_for_stable(driver, WAIT_DUR)
+    inbox.set_address(Users.Guerrilla.new_email)
     inbox.wait_for_email(WAIT_DUR)
 
     try:
@@ -52,13 +50,13 @@ def email_change_emails(driver, inbox, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR
         new_verify_email.image("change_email_new_email.png")
         new_verify_email.save_html_body("change_email_new_email")
         new_verify_email.view()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         email_body = new_verify_email.get_email_body_element()
         verification_link = email_body.find_element_by_xpath(".//a[text()='Verify your email address']")
         Users.Guerrilla.verify_link = str(verification_link.get_attribute("href")).replace("https://localhost:8080/isaac-api", ISAAC_WEB)
         log(INFO, "Copied verification link.")
         new_verify_email.close()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(PASS, "Emails recieved for old and new accounts after changing email address.")
         return True
     except IndexError:
@@ -66,8 +64,8 @@ def email_change_emails(driver, inbox, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR
         log(ERROR, "Verification email for new email not recieved; see 'ERROR_verify_new_not_recieved.png'!")
         return False
     except NoSuchElementException:
-        driver.get(GUERRILLAMAIL)
+        inbox.reset()
         log(INFO, "Couldn't access expected parts of email. Refresh page to cleanup.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(ERROR, "Couldn't access new email verification link in email!")
         return False
@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.isaac import open_accordion_section, wait_accordion_open
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
@@ -11,7 +10,7 @@ __all__ = ["figure_behaviour"]
 #####
 # Test : Figure Numbering and Referencing on Question Pages
 #####
-@TestWithDependency("FIGURE_BEHAVIOUR", ["ACCORDION_BEHAVIOUR", "TAB_BEHAVIOUR", "QUICK_QUESTIONS"])
+@TestWithDependency("FIGURE_BEHAVIOUR", ["ACCORDION_BEHAVIOUR", "TAB_BEHAVIOUR", "QUICK_QUESTIONS"], start_url="/questions/_regression_test_")
 def figure_behaviour(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether the figure numbering and referencing work as expected.
 
@@ -22,7 +21,7 @@ def figure_behaviour(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB + "/questions/_regression_test_")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/questions/_regression_test_"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     try:
         # Figures are in final accordion section:
@@ -30,7 +29,7 @@ def figure_behaviour(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Figure numbering examples in accordion {0:d}.".format(figure_accordion_section))
         figure_accordion = open_accordion_section(driver, figure_accordion_section)
         wait_accordion_open(driver, figure_accordion_section)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
 
         log(INFO, "Checking \\ref{...} gets correctly transformed.")
         intro_text_p = figure_accordion.find_elements_by_xpath(".//p")[0]
@@ -52,16 +51,16 @@ def figure_behaviour(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         assert fig_title_5 == "Figure 5", "Expected figure in first tab to be figure 5, found '%s'!" % fig_title_5
         log(INFO, "Changing to tab 2.")
         tab_buttons[1].click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         fig_title_6 = str(tab_buttons[1].find_element_by_xpath("../..//div[contains(@class, 'active')]//figcaption/div/strong").text)
         assert fig_title_6 == "Figure 6", "Expected figure in second tab to be figure 6, found '%s'!" % fig_title_6
         log(INFO, "Changing to tab 3.")
         tab_buttons[2].click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         show_button = tab_buttons[2].find_element_by_xpath("../../div/div//div[@ng-click='isVisible=!isVisible']")
         show_button.click()
         log(INFO, "Checking figure inside a quick question.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         fig_title_7 = str(show_button.find_element_by_xpath("..//figcaption/div/strong").text)
         assert fig_title_7 == "Figure 7", "Expected figure in final tab quick question to be figure 7, found '%s'!" % fig_title_7
 
@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import clear_question_filter, set_filter_state, get_hexagon_properties
-from ..utils.i_selenium import assert_tab
+from ..utils.isaac import clear_question_filter, set_filter_state, get_all_hexagon_properties
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -12,7 +11,7 @@ __all__ = ["filter_behaviour"]
 ######
 # Test : Check Filter Behaviour
 ######
-@TestWithDependency("FILTER_BEHAVIOUR")
+@TestWithDependency("FILTER_BEHAVIOUR", start_url="/gameboards")
 def filter_behaviour(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test the behavior of the gameboard filter for subjects and levels.
 
@@ -21,14 +20,14 @@ def filter_behaviour(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     driver.get(ISAAC_WEB + "/gameboards")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/gameboards"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         filter_dropdown = driver.find_element_by_id("desktop-reveal")
         filter_dropdown.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         wait_for_xpath_element(driver, "//div[@class='ru-desktop-panel-content']")
     except NoSuchElementException:
         log(ERROR, "Can't access filter dropdown button!")
@@ -44,10 +43,10 @@ def filter_behaviour(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         return False
 
     try:
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         hexagons = driver.find_elements_by_xpath("//a[@class='ru-hex-home-content']")
         assert len(hexagons) == 11, "Expected 11 hexagons, got %s; can't continue!" % len(hexagons)
-        hexagons = map(get_hexagon_properties, hexagons)
+        hexagons = get_all_hexagon_properties(driver, hexagons)
         for h in hexagons:
             if h["type"] == "Question":
                 assert h["topic"] == "Dynamics", "Unexpected question with topic '%s' in Dynamics questions!" % h["topic"]
@@ -59,7 +58,7 @@ def filter_behaviour(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         clear_question_filter(driver, WAIT_DUR)
         set_filter_state(driver, tag_state, levels, WAIT_DUR)
         hexagons = driver.find_elements_by_xpath("//a[@class='ru-hex-home-content']")
-        hexagons = map(get_hexagon_properties, hexagons)
+        hexagons = get_all_hexagon_properties(driver, hexagons)
         for h in hexagons:
             if h["type"] == "Question":
                 assert h["field"] in tag_state, "Unexpected question with field '%s' in %s questions!" % (h["field"], tag_state)
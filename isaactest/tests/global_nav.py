@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
 from ..utils.isaac import kill_irritating_popup
 from ..tests import TestWithDependency
@@ -12,7 +11,7 @@ __all__ = ["global_nav"]
 #####
 # Test : Global Navigation Menu
 #####
-@TestWithDependency("GLOBAL_NAV", ["LOGIN"])
+@TestWithDependency("GLOBAL_NAV", ["LOGIN"], setup=True)
 def global_nav(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether the global navigation menu works.
 
@@ -27,7 +26,7 @@ def global_nav(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         global_nav = driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
         global_nav.click()
         log(INFO, "Clicked menu button.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         wait_for_xpath_element(driver, "//nav[@class='dl-nav']")
         log(INFO, "Global navigation successfully opened.")
     except NoSuchElementException:
@@ -36,11 +35,11 @@ def global_nav(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     except TimeoutException:
         log(ERROR, "Global navigation didn't open!")
         return False
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         global_nav = driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
         global_nav.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         wait_for_invisible_xpath(driver, "//nav[@class='dl-nav']")
         log(INFO, "Global navigation successfuly closed.")
         log(PASS, "Global navigation functions as expected.")
@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
 from ..utils.isaac import MobileIsaac, snooze_email_verification
 from ..tests import TestWithDependency
@@ -25,18 +24,18 @@ def global_nav_mobile(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
 
     with MobileIsaac(driver) as mobile_driver:
 
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         # The Email Verification warning obstructs the menu. If it's there, snooze it!
         if not snooze_email_verification(mobile_driver):
             log(ERROR, "Can't continue with this test since the banner obstructs the menu!")
             return False
 
         try:
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             global_nav = mobile_driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
             global_nav.click()
             log(INFO, "Clicked menu button.")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             wait_for_xpath_element(mobile_driver, "//nav[@class='dl-nav']")
             log(INFO, "Global navigation successfully opened.")
         except NoSuchElementException:
@@ -45,22 +44,22 @@ def global_nav_mobile(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         except TimeoutException:
             log(ERROR, "Global navigation didn't open!")
             return False
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         try:
             global_nav = mobile_driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
             global_nav.click()
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             wait_for_invisible_xpath(mobile_driver, "//nav[@class='dl-nav']")
             log(INFO, "Global navigation successfully closed.")
         except TimeoutException:
             log(ERROR, "Global navigation didn't close!")
             return False
         try:
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             global_nav = mobile_driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
             global_nav.click()
             log(INFO, "Clicked menu button.")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             wait_for_xpath_element(mobile_driver, "//nav[@class='dl-nav']")
             log(INFO, "Global navigation successfully opened.")
         except NoSuchElementException:
@@ -72,11 +71,11 @@ def global_nav_mobile(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         try:
             my_isaac = mobile_driver.find_element_by_xpath("//h6[contains(text(), 'My Isaac')]")
             my_isaac.click()
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             wait_for_xpath_element(mobile_driver, "//ul[@class='dl-level2 dl-clone']")
             mobile_driver.find_element_by_xpath("(//a[contains(text(), 'My Account')])[2]")
             log(INFO, "Can access My Account button in the menu!")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
         except NoSuchElementException:
             image_div(mobile_driver, "ERROR_global_nav_mobile")
             log(ERROR, "Cannot access sub-menus! See 'ERROR_global_nav_mobile.png'!")
@@ -1,9 +1,8 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import submit_login_form, assert_logged_in
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.isaac import login_as, logout_of_isaac
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
-from ..tests import TestWithDependency
+from ..tests import TestWithDependency, LOGGED_OUT
 from selenium.common.exceptions import TimeoutException
 
 __all__ = ["groups_page_access"]
@@ -12,7 +11,7 @@ __all__ = ["groups_page_access"]
 #####
 # Test : Access Groups Page As Users
 #####
-@TestWithDependency("GROUPS_PAGE_ACCESS", ["LOGIN", "LOGOUT"])
+@TestWithDependency("GROUPS_PAGE_ACCESS", ["LOGIN", "LOGOUT"], role=LOGGED_OUT, shared_locks=["user:Student"])
 def groups_page_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test access to groups page is suitably restricted.
 
@@ -22,23 +21,19 @@ def groups_page_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
 
     groups_page_access_fail = False
 
     try:
         log(INFO, "Test if logged out user can access '/groups'.")
         driver.get(ISAAC_WEB + "/groups")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         url_redirected = ("/login?target=%2Fgroups" in driver.current_url) or ("/login?target=~2Fgroups" in driver.current_url)
         assert url_redirected, "Expected '/login?target=%2Fgroups' (or '~2Fgroups') in URL, found '%s'!" % driver.current_url
         log(INFO, "Logged out users can't access groups page.")
-        time.sleep(WAIT_DUR)
-        driver.get(ISAAC_WEB + "/logout")
-        log(INFO, "Logging out to start from same initial page each time.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
+        logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     except AssertionError, e:
         groups_page_access_fail = True
         image_div(driver, "ERROR_unexpected_groups_access")
@@ -49,11 +44,8 @@ def groups_page_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     for i_type, user in student_login:
         log(INFO, "Test if '%s' users can access groups page." % i_type)
         try:
-            driver.get(ISAAC_WEB + "/groups")
-            time.sleep(WAIT_DUR)
-            submit_login_form(driver, user=user, wait_dur=WAIT_DUR)
-            time.sleep(WAIT_DUR)
-            assert_logged_in(driver, user, wait_dur=WAIT_DUR)
+            assert login_as(driver, ISAAC_WEB, user, url=ISAAC_WEB + "/groups", wait_dur=WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             wait_for_xpath_element(driver, "//h1[text()='Unauthorised']")
             log(INFO, "User of type '%s' can't access groups page." % i_type)
         except TimeoutException:
@@ -63,34 +55,34 @@ def groups_page_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         except AssertionError:
             log(ERROR, "Couldn't log user in to test '/groups' access!")
             return False
-        driver.get(ISAAC_WEB + "/logout")
-        log(INFO, "Logged out '%s' user." % i_type)
-        time.sleep(3)
+        driver.delete_all_cookies()
+        driver.get(ISAAC_WEB)
+        log(INFO, "Cleared the session of the '%s' user." % i_type)
+        wait_for_stable(driver, WAIT_DUR)
 
     access_cases = [("Teacher", Users.Teacher), ("Content Editor", Users.Editor), ("Event Manager", Users.Event), ("Admin", Users.Admin)]
     for i_type, user in access_cases:
-        driver.get(ISAAC_WEB + "/login")
-        log(INFO, "Got '%s'. As '%s', try to use global nav." % (ISAAC_WEB + "/login", i_type))
-        time.sleep(WAIT_DUR)
+        log(INFO, "As '%s', try to use global nav." % i_type)
         try:
-            submit_login_form(driver, user=user, wait_dur=WAIT_DUR)
-            time.sleep(WAIT_DUR)
+            login_as(driver, ISAAC_WEB, user, wait_dur=WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             global_nav = driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
             global_nav.click()
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             site_admin_link = driver.find_element_by_xpath("//a[@ui-sref='groups']")
             site_admin_link.click()
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             wait_for_xpath_element(driver, "//h1[text()='Manage Groups']")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             log(INFO, "'%s' users can access '/groups'." % i_type)
         except TimeoutException:
             groups_page_access_fail = True
             image_div(driver, "ERROR_no_admin_access")
             log(ERROR, "'%s' user can't access '/groups'; see 'ERROR_no_groups_access.png'!" % i_type)
-        driver.get(ISAAC_WEB + "/logout")
-        log(INFO, "Logged out '%s' user." % i_type)
-        time.sleep(3)
+        driver.delete_all_cookies()
+        driver.get(ISAAC_WEB)
+        log(INFO, "Cleared the session of the '%s' user." % i_type)
+        wait_for_stable(driver, WAIT_DUR)
 
     if not groups_page_access_fail:
         log(PASS, "Access to groups page restricted appropriately.")
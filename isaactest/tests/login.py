@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import submit_login_form, assert_logged_in
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException
 
@@ -11,7 +10,7 @@ __all__ = ["login"]
 #####
 # Test : Logging In
 #####
-@TestWithDependency("LOGIN")
+@TestWithDependency("LOGIN", role="Student", setup=True, shared_locks=["user:Student"])
 def login(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether users can sign in to Isaac.
 
@@ -24,12 +23,12 @@ def login(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     try:
         login_tab = driver.find_element_by_xpath("//a[@id='login-tab']")
         login_tab.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         submit_login_form(driver, user=Users.Student, disable_popup=False, wait_dur=WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Couldn't click login tab; can't login!")
         return False
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         assert_logged_in(driver, Users.Student, wait_dur=WAIT_DUR)
         log(INFO, "Login successful.")
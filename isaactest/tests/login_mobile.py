@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import MobileIsaac, submit_login_form, assert_logged_in, snooze_email_verification
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException
 
@@ -11,7 +10,7 @@ __all__ = ["login_mobile"]
 #####
 # Test : Logging In (Mobile Devices)
 #####
-@TestWithDependency("LOGIN_MOBILE", ["LOGOUT", "ACCEPT_COOKIES"])
+@TestWithDependency("LOGIN_MOBILE", ["LOGOUT", "ACCEPT_COOKIES"], shared_locks=["user:Student"])
 def login_mobile(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether users can sign in to Isaac on mobile devices.
 
@@ -23,11 +22,11 @@ def login_mobile(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB + "/logout")
     log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     with MobileIsaac(driver) as mobile_driver:
 
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         # The Email Verification warning obstructs the menu. If it's there, snooze it!
         if not snooze_email_verification(mobile_driver):
             log(ERROR, "Can't continue with this test since the banner obstructs the menu!")
@@ -36,9 +35,9 @@ def login_mobile(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         try:
             login_tab = mobile_driver.find_element_by_xpath("//div[@id='mobile-login']")
             login_tab.click()
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             submit_login_form(mobile_driver, user=Users.Student, wait_dur=WAIT_DUR, mobile=True)
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             assert_logged_in(mobile_driver, user=Users.Student, wait_dur=WAIT_DUR)
             log(INFO, "Login succeeded on mobile site.")
         except NoSuchElementException:
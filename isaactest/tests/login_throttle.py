@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import submit_login_form
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException
 
@@ -11,7 +10,7 @@ __all__ = ["login_throttle"]
 #####
 # Test : 11 Login Attempts
 #####
-@TestWithDependency("LOGIN_THROTTLE", ["LOGIN"])
+@TestWithDependency("LOGIN_THROTTLE", ["LOGIN"], locks=["user:Spare"])
 def login_throttle(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether users are locked out after 10 failed login attempts.
 
@@ -29,8 +28,8 @@ def login_throttle(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(ERROR, "Couldn't find login button; can't continue!")
         return False
     for i in range(11):
-        submit_login_form(driver, username=Users.Student.email, password="wrongpassword", wait_dur=WAIT_DUR)
-        time.sleep(WAIT_DUR)
+        submit_login_form(driver, username=Users.Spare.email, password="wrongpassword", wait_dur=WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     try:
         driver.find_element_by_xpath("//strong[contains(text(), 'too many attempts to login')]")
         log(PASS, "11 login attempts. Warning message and locked out for 10 mins.")
@@ -1,8 +1,7 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import submit_login_form, assert_logged_in
-from ..utils.i_selenium import assert_tab, image_div
-from ..tests import TestWithDependency
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
+from ..tests import TestWithDependency, Deferred
 
 __all__ = ["login_timeout"]
 
@@ -10,27 +9,37 @@ __all__ = ["login_timeout"]
 #####
 # Test : 10 Minute Lockout
 #####
-@TestWithDependency("LOGIN_TIMEOUT", ["LOGIN_THROTTLE"])
+@TestWithDependency("LOGIN_TIMEOUT", ["LOGIN_THROTTLE"], role="Spare", locks=["user:Spare"])
 def login_timeout(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether the login throttle lockout expires after 10 minutes.
 
+       Rather than waiting, the test is deferred until the lockout has expired;
+       it keeps its lock on the Spare user meanwhile, so only tests which
+       don't log in as the Spare user are run in the meantime.
         - 'driver' should be a Selenium WebDriver.
         - 'Users' must be a TestUsers object.
         - 'ISAAC_WEB' is the string URL of the Isaac website to be tested.
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
-    assert_tab(driver, ISAAC_WEB)
     log(INFO, "Waiting for 10 minute timout to expire.")
-    for i in range(10):
-        log(INFO, "Still waiting. %s mins remaining." % (10 - i))
-        time.sleep(60)
-    time.sleep(10)
+    return Deferred(10 * 60 + 10, _login_after_lockout)
+
+
+def _login_after_lockout(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
+    """Once the lockout has expired, check the Spare user can log in again."""
+    assert_tab(driver, ISAAC_WEB)
     log(INFO, "Finished waiting.")
+    driver.get(ISAAC_WEB + "/logout")
+    log(INFO, "Logging out any logged in user.")
+    wait_for_stable(driver, WAIT_DUR)
+    driver.get(ISAAC_WEB + "/login")
+    log(INFO, "Got: %s" % (ISAAC_WEB + "/login"))
+    wait_for_stable(driver, WAIT_DUR)
 
-    submit_login_form(driver, user=Users.Student)
-    time.sleep(WAIT_DUR)
+    submit_login_form(driver, user=Users.Spare)
+    wait_for_stable(driver, WAIT_DUR)
     try:
-        assert_logged_in(driver, Users.Student, wait_dur=WAIT_DUR)
+        assert_logged_in(driver, Users.Spare, wait_dur=WAIT_DUR)
         log(INFO, "Login successful.")
         log(PASS, "Login after 10 minute lockout.")
         return True
@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import submit_login_form, assert_logged_in
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException
 
@@ -11,7 +10,7 @@ __all__ = ["login_uppercase"]
 #####
 # Test : Login Email Case Sensitivity
 #####
-@TestWithDependency("LOGIN_UPPERCASE", ["LOGIN"])
+@TestWithDependency("LOGIN_UPPERCASE", ["LOGIN"], role="Student", shared_locks=["user:Student"])
 def login_uppercase(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if users can login with a case insensitive email address.
 
@@ -23,12 +22,12 @@ def login_uppercase(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB + "/logout")
     log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         login_tab = driver.find_element_by_xpath("//a[@id='login-tab']")
         login_tab.click()
         submit_login_form(driver, Users.Student.email.upper(), Users.Student.password, wait_dur=WAIT_DUR)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Can't access login tab; can't continue!")
         return False
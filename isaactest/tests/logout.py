@@ -1,8 +1,7 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import assert_logged_out
-from ..utils.i_selenium import assert_tab, image_div
-from ..tests import TestWithDependency
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
+from ..tests import TestWithDependency, LOGGED_OUT
 from selenium.common.exceptions import NoSuchElementException
 
 __all__ = ["logout"]
@@ -11,7 +10,7 @@ __all__ = ["logout"]
 #####
 # Test : Logout Button
 #####
-@TestWithDependency("LOGOUT", ["LOGIN", "GLOBAL_NAV"])
+@TestWithDependency("LOGOUT", ["LOGIN", "GLOBAL_NAV"], role=LOGGED_OUT, setup=True)
 def logout(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether users can sign out of Isaac.
 
@@ -24,7 +23,7 @@ def logout(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Opening menu to click logout button.")
         global_nav = driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
         global_nav.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Clicking logout button.")
         logout_button = driver.find_element_by_xpath("//a[@ui-sref='logout']")
         logout_button.click()
@@ -33,7 +32,7 @@ def logout(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(ERROR, "Can't find logout button; can't logout, see 'ERROR_logout_failure.png'!")
         return False
 
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         assert_logged_out(driver, wait_dur=WAIT_DUR)
         log(INFO, "Logged out.")
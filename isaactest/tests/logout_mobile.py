@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import MobileIsaac, assert_logged_out, snooze_email_verification
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException
 
@@ -23,7 +22,7 @@ def logout_mobile(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
 
     with MobileIsaac(driver) as mobile_driver:
 
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         # The Email Verification warning obstructs the menu. If it's there, snooze it!
         if not snooze_email_verification(mobile_driver):
             log(ERROR, "Can't continue with this test since the banner obstructs the menu!")
@@ -32,7 +31,7 @@ def logout_mobile(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         try:
             account_settings_button = mobile_driver.find_element_by_xpath("(//a[@ui-sref='accountSettings'])[1]")
             account_settings_button.click()
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             logout_button = mobile_driver.find_elements_by_xpath("//a[contains(text(), 'Log out')]")[0]
             logout_button.click()
         except NoSuchElementException:
@@ -47,7 +46,7 @@ def logout_mobile(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         try:
             assert_logged_out(mobile_driver, wait_dur=WAIT_DUR)
             log(INFO, 'Logged out successfully.')
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
         except AssertionError:
             image_div(mobile_driver, 'ERROR_mobile_logout_failure')
             log(ERROR, "Couldn't logout; see 'ERROR_mobile_logout_failure.png'!")
@@ -1,9 +1,8 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
-from ..utils.isaac import open_accordion_section, close_accordion_section
-from ..tests import TestWithDependency
+from ..utils.isaac import open_accordion_section, close_accordion_section, logout_of_isaac
+from ..tests import TestWithDependency, LOGGED_OUT
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 __all__ = ["manually_entered_links"]
@@ -12,7 +11,7 @@ __all__ = ["manually_entered_links"]
 #####
 # Test : Check Manually Entered Links Work
 #####
-@TestWithDependency("MANUALLY_ENTERED_LINKS", ["ACCORDION_BEHAVIOUR", "TAB_BEHAVIOUR"])
+@TestWithDependency("MANUALLY_ENTERED_LINKS", ["ACCORDION_BEHAVIOUR", "TAB_BEHAVIOUR"], role=LOGGED_OUT, start_url="/questions/_regression_test_")
 def manually_entered_links(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if manually entered links in hints and pages work. Also check "Back to Question" button.
 
@@ -21,25 +20,23 @@ def manually_entered_links(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
 
     driver.get(ISAAC_WEB + "/questions/_regression_test_")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/questions/_regression_test_"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     url_before = str(driver.current_url)
     log(INFO, "Open third accordion section, then open hint.")
     try:
         close_accordion_section(driver, 1)
         open_accordion_section(driver, 3)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         num_q = wait_for_xpath_element(driver, "//div[@ng-switch-when='isaacNumericQuestion']")
         log(INFO, "Got question, opening hint.")
         hint_buttons = num_q.find_elements_by_xpath(".//a[contains(text(), 'Hint ')]/..")
         hint_buttons[0].click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Can't find accordion title bar to click; can't continue!")
         return False
@@ -51,13 +48,13 @@ def manually_entered_links(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         assert len(concepts) == 3, "Expected to find 3 concept links, found %s!" % len(concepts)
         concepts[1].click()
         log(INFO, "Click concept a page link.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         wait_for_xpath_element(driver, "//h3[@class='subheader']/strong[contains(text(), 'Concept')]")
         log(INFO, "Taken to a concept page as expected.")
         back_to_q = driver.find_element_by_xpath("(//a[@ng-if='backButtonVisible']//em[text()='Back to your question'])[1]")
         back_to_q.click()
         log(INFO, "Click 'Back to question' button.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         assert url_before in str(driver.current_url), "Expected to be taken back to '%s', got '%s' instead!" % (url_before, driver.current_url)
         log(INFO, "Taken back to starting page as expected.")
     except TimeoutException:
@@ -1,9 +1,8 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import submit_login_form
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.isaac import login_as, logout_of_isaac
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
-from ..tests import TestWithDependency
+from ..tests import TestWithDependency, LOGGED_OUT
 from selenium.common.exceptions import TimeoutException
 
 __all__ = ["my_assignments_page_access"]
@@ -12,7 +11,7 @@ __all__ = ["my_assignments_page_access"]
 #####
 # Test : Access my_assignments Page As Users
 #####
-@TestWithDependency("MY_ASSIGNMENTS_PAGE_ACCESS", ["LOGIN", "LOGOUT"])
+@TestWithDependency("MY_ASSIGNMENTS_PAGE_ACCESS", ["LOGIN", "LOGOUT"], role=LOGGED_OUT, shared_locks=["user:Student"])
 def my_assignments_page_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test access to my assignments page is suitably restricted.
 
@@ -22,23 +21,19 @@ def my_assignments_page_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
 
     assignments_page_access_fail = False
 
     try:
         log(INFO, "Test if logged out user can access '/assignments'.")
         driver.get(ISAAC_WEB + "/assignments")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         url_redirected = ("/login?target=%2Fassignments" in driver.current_url) or ("/login?target=~2Fassignments" in driver.current_url)
         assert url_redirected, "Expected '/login?target=%2Fassignemnts' (or '~2Fassignments') in URL, found '%s'!" % driver.current_url
         log(INFO, "Logged out users can't access my assignments page.")
-        time.sleep(WAIT_DUR)
-        driver.get(ISAAC_WEB + "/logout")
-        log(INFO, "Logging out to start from same initial page each time.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
+        logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     except AssertionError, e:
         assignments_page_access_fail = True
         image_div(driver, "ERROR_unexpected_my_assignment_access")
@@ -47,28 +42,27 @@ def my_assignments_page_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
 
     access_cases = [("Student", Users.Student), ("Teacher", Users.Teacher), ("Content Editor", Users.Editor), ("Event Manager", Users.Event), ("Admin", Users.Admin)]
     for i_type, user in access_cases:
-        driver.get(ISAAC_WEB + "/login")
-        log(INFO, "Got '%s'. As '%s', try to use global nav." % (ISAAC_WEB + "/login", i_type))
-        time.sleep(WAIT_DUR)
+        log(INFO, "As '%s', try to use global nav." % i_type)
         try:
-            submit_login_form(driver, user=user, wait_dur=WAIT_DUR)
-            time.sleep(WAIT_DUR)
+            login_as(driver, ISAAC_WEB, user, wait_dur=WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             global_nav = driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
             global_nav.click()
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             site_assignments_link = driver.find_element_by_xpath("//a[@href='/assignments']")
             site_assignments_link.click()
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             wait_for_xpath_element(driver, "//h1[text()='My Assignments']")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             log(INFO, "'%s' users can access '/assignments'." % i_type)
         except TimeoutException:
             assignments_page_access_fail = True
             image_div(driver, "ERROR_no_my_assignments_access")
             log(ERROR, "'%s' user can't access '/assignments'; see 'ERROR_no_my_assignments_access.png'!" % i_type)
-        driver.get(ISAAC_WEB + "/logout")
-        log(INFO, "Logged out '%s' user." % i_type)
-        time.sleep(3)
+        driver.delete_all_cookies()
+        driver.get(ISAAC_WEB)
+        log(INFO, "Cleared the session of the '%s' user." % i_type)
+        wait_for_stable(driver, WAIT_DUR)
 
     if not assignments_page_access_fail:
         log(PASS, "Access to my assignments page restricted appropriately.")
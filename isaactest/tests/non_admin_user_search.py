@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import submit_login_form
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.isaac import submit_login_form, logout_of_isaac
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -13,7 +12,7 @@ __all__ = ["non_admin_user_search"]
 #####
 # Test : Attempt to Use User Search as Non-Admin
 #####
-@TestWithDependency("NON_ADMIN_USER_SEARCH", ["ADMIN_USER_SEARCH"])
+@TestWithDependency("NON_ADMIN_USER_SEARCH", ["ADMIN_USER_SEARCH"], shared_locks=["user:Student"])
 def non_admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if non-admin users can search for users in a restricted way.
 
@@ -23,22 +22,20 @@ def non_admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     log(INFO, "Test user search page as non-admin.")
 
     not_allowed = [Users.Student, Users.Teacher, Users.Editor]
     access_cases = [("Student", Users.Student), ("Teacher", Users.Teacher), ("Content Editor", Users.Editor), ("Event Manager", Users.Event)]
     for i_type, role in access_cases:
         try:
-            driver.get(ISAAC_WEB + "/logout")
-            log(INFO, "Logging out logged in user.")
-            time.sleep(WAIT_DUR)
+            logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
             driver.get(ISAAC_WEB + "/admin/usermanager")
             log(INFO, "Got: %s" % (ISAAC_WEB + "/admin/usermanager"))
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             assert submit_login_form(driver, user=role, wait_dur=WAIT_DUR), "Can't login to access User Manager!"
             log(INFO, "Logged in '%s' successfully." % i_type)
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             if role in not_allowed:
                 wait_for_xpath_element(driver, "//h1[text()='Unauthorised']")
                 log(INFO, "User '%s' not allowed access as expected." % i_type)
@@ -57,7 +54,7 @@ def non_admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
             log(INFO, "Test search by family name.")
             name_field = driver.find_element_by_id("user-search-familyName")
             name_field.send_keys(Users.Student.lastname)
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             search_button = driver.find_elements_by_xpath("//button[@type='submit']")[0]
             search_button.click()
             wait_for_invisible_xpath(driver, "//h3[contains(text(), 'Manage Users ()')]")
@@ -66,7 +63,7 @@ def non_admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
             log(INFO, "Search by family name works as expected.")
             driver.refresh()
             log(INFO, "Refresh the page to clear all results.")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
         except TimeoutException:
             log(ERROR, "Search button did not work; can't continue testing!")
             return False
@@ -83,7 +80,7 @@ def non_admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         # Global wildcard search:
         try:
             log(INFO, "Test wildcard searches.")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             search_button = driver.find_elements_by_xpath("//button[@type='submit']")[0]
             search_button.click()
             popup = wait_for_xpath_element(driver, "//div[@class='toast-message']", 2)
@@ -97,7 +94,7 @@ def non_admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
             log(INFO, "Wildcard search fails as expected.")
             driver.refresh()
             log(INFO, "Refresh the page to clear all results.")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
         except TimeoutException:
             image_div(driver, "ERROR_non_admin_user_search")
             log(ERROR, "Error message not shown; see 'ERROR_non_admin_user_search.png'!")
@@ -115,9 +112,9 @@ def non_admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         # Search by user type:
         try:
             log(INFO, "Test search by user role.")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             role_dropdown = Select(driver.find_element_by_id("user-search-role"))
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             role_dropdown.select_by_value("STUDENT")
             log(INFO, "Selected role 'STUDENT'.")
             search_button = driver.find_elements_by_xpath("//button[@type='submit']")[0]
@@ -133,7 +130,7 @@ def non_admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
             log(INFO, "Wildcard search fails as expected.")
             driver.refresh()
             log(INFO, "Refresh the page to clear all results.")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
         except TimeoutException:
             image_div(driver, "ERROR_non_admin_user_search")
             log(ERROR, "Error message not shown; see 'ERROR_non_admin_user_search.png'!")
@@ -150,6 +147,6 @@ def non_admin_user_search(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
 
     driver.get(ISAAC_WEB + "/logout")
     log(INFO, "Logging out logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     log(PASS, "Search page functionality for non-admin users as expected.")
     return True
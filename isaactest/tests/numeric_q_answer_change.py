@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab,  image_div
+from ..utils.i_selenium import assert_tab,  image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
 from ..utils.isaac import open_accordion_section
 from ..tests import TestWithDependency
@@ -12,7 +11,7 @@ __all__ = ["numeric_q_answer_change"]
 #####
 # Test : Numeric Questions Answer Change
 #####
-@TestWithDependency("NUMERIC_Q_ANSWER_CHANGE", ["NUMERIC_Q_UNITS_SELECT", "NUMERIC_Q_ALL_CORRECT"])
+@TestWithDependency("NUMERIC_Q_ANSWER_CHANGE", ["NUMERIC_Q_UNITS_SELECT", "NUMERIC_Q_ALL_CORRECT"], start_url="/questions/_regression_test_")
 def numeric_q_answer_change(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if numeric question answers behave correctly on attempting to enter
        a new answer.
@@ -22,7 +21,7 @@ def numeric_q_answer_change(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB + "/questions/_regression_test_")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         open_accordion_section(driver, 3)
         num_question = driver.find_element_by_xpath("//div[@ng-switch-when='isaacNumericQuestion']")
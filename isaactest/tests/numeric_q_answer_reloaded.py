@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import open_accordion_section
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -12,7 +11,7 @@ __all__ = ["numeric_q_answer_reloaded"]
 #####
 # Test : Numeric Questions Select 'None' as Units Option
 #####
-@TestWithDependency("NUMERIC_Q_ANSWER_RELOADED", ["NUMERIC_Q_ALL_CORRECT"])
+@TestWithDependency("NUMERIC_Q_ANSWER_RELOADED", ["NUMERIC_Q_ALL_CORRECT"], start_url="/questions/_regression_test_")
 def numeric_q_answer_reloaded(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test reloading of correct answers on page refresh.
 
@@ -21,10 +20,10 @@ def numeric_q_answer_reloaded(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB + "/questions/_regression_test_")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     log(INFO, "Refreshing the page.")
     driver.refresh()
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         open_accordion_section(driver, 3)
         num_question = driver.find_element_by_xpath("//div[@ng-switch-when='isaacNumericQuestion']")
@@ -32,7 +31,7 @@ def numeric_q_answer_reloaded(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(ERROR, "Can't find the numeric question; can't continue!")
         return False
 
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     try:
         log(INFO, "Checking previously entered answer is present after reload.")
@@ -57,7 +56,7 @@ def numeric_q_answer_reloaded(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "The content editor entered message was correctly reloaded.")
         wait_for_xpath_element(driver, "//div[@ng-switch-when='isaacNumericQuestion']//strong[text()='Well done!']")
         log(INFO, "The 'Well Done' message was correctly reloaded.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(PASS, "Numeric Question answers reloaded correctly.")
         return True
     except TimeoutException:
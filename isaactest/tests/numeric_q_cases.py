@@ -0,0 +1,141 @@
+from ..utils.log import log, INFO, ERROR, PASS
+from ..utils.isaac import answer_numeric_q, open_accordion_section
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
+from ..utils.i_selenium import wait_for_xpath_element
+from ..tests import TestWithDependency
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+_NUM_Q = "//div[@ng-switch-when='isaacNumericQuestion']"
+_UNITS = "\units{ m\,s^{-1} }"
+_RED = ['#be4c4c', 'rgba(190, 76, 76, 1)', 'rgb(190, 76, 76)']
+_BOXES = {1: "value box", 2: "units box"}
+_INCORRECT = ("h2[text()='Incorrect']", "An 'Incorrect' message was displayed as expected.")
+_SIG_FIGS = ("h2[text()='Significant Figures']", "A 'Sig Figs' banner was displayed instead of 'Incorrect'.")
+_EDITOR_MESSAGE = "The content editor entered message was correctly shown."
+
+#####
+# Test : Numeric Questions Incorrect Answers
+#####
+# Each case is one answer to the numeric question of the regression test page
+# and the feedback expected, and is registered as a test of its own named 'name':
+#  - 'attempt' is logged to describe the answer being entered.
+#  - 'value', 'unit' and 'wrong_unit' are the arguments to 'answer_numeric_q'.
+#  - 'banner' is the (XPATH, log message) of the feedback heading expected.
+#  - 'explanation' is the (XPATH, log message) of the explanation expected.
+#  - 'red' are which answer boxes (1 value, 2 units) should be highlighted red.
+#  - 'behaviour' describes the case, and 'feedback' the answer being marked.
+#  - 'hint' is an optional message to log if the feedback is not all shown.
+NUMERIC_CASES = [
+    dict(name="NUMERIC_Q_INCORRECT_UNIT", attempt="Attempt to enter correct value, but incorrect units.",
+         value="2.01", unit=_UNITS, wrong_unit=True, banner=_INCORRECT,
+         explanation=("p[text()='Check your units.']", "The 'Check your units.' message was correctly shown."),
+         red=[2], behaviour="incorrect unit, correct value", feedback="an incorrect unit"),
+    dict(name="NUMERIC_Q_INCORRECT_VALUE", attempt="Attempt to enter unknown incorrect value, to correct sig figs and correct units.",
+         value="4.33", unit=_UNITS, wrong_unit=False, banner=_INCORRECT,
+         explanation=("p[text()='Check your working.']", "The 'Check your working.' message was correctly shown."),
+         red=[1], behaviour="correct unit, incorrect value", feedback="an incorrect value"),
+    dict(name="NUMERIC_Q_ALL_INCORRECT", attempt="Attempt to enter unknown incorrect value, to correct sig figs and incorrect units.",
+         value="4.33", unit=_UNITS, wrong_unit=True, banner=_INCORRECT,
+         explanation=("p[text()='Check your working.']", "The 'Check your working.' message was correctly shown."),
+         red=[1, 2], behaviour="incorrect value, incorrect unit", feedback="an incorrect answer"),
+    dict(name="NUMERIC_Q_INCORRECT_SF", attempt="Attempt to enter correct value with correct units to incorrect sig figs.",
+         value="2.0", unit=_UNITS, wrong_unit=False, banner=_SIG_FIGS,
+         explanation=("p/strong[text()='Significant figures']/..", "The 'Significant figures' message was correctly shown."),
+         red=[1], behaviour="correct value, correct unit, incorrect sig fig", feedback="an incorrect sig fig answer"),
+    dict(name="NUMERIC_Q_INCORRECT_SF_U", attempt="Attempt to enter correct value with incorrect units to incorrect sig figs.",
+         value="2.0", unit=_UNITS, wrong_unit=True, banner=_SIG_FIGS,
+         explanation=("p/strong[text()='Significant figures']/..", "The 'Significant figures' message was correctly shown."),
+         red=[1, 2], behaviour="correct value, incorrect unit, incorrect sig fig", feedback="an incorrect sig fig answer"),
+    dict(name="NUMERIC_Q_KNOWN_WRONG_ANS", attempt="Attempt to enter known (content-editor specified) wrong answer.",
+         value="5.00", unit=_UNITS, wrong_unit=False, banner=_INCORRECT,
+         explanation=("p[text()='This is an incorrect choice.']", _EDITOR_MESSAGE),
+         red=[1], behaviour="known wrong answer", feedback="a known incorrect answer"),
+    dict(name="NUMERIC_Q_KNOWN_WRONG_SF", attempt="Attempt to enter known (content-editor specified) wrong answer, to wrong sig figs.",
+         value="42", unit=_UNITS, wrong_unit=False, banner=_INCORRECT,
+         explanation=("p[text()='Hello']", _EDITOR_MESSAGE),
+         red=[1], behaviour="known wrong answer, incorrect sig fig", feedback="a known incorrect answer",
+         hint="The sig fig warning should not have been shown. if it was, this is likely the error."),
+    dict(name="NUMERIC_Q_KNOWN_WRONG_SF_TAGGED", attempt="Attempt to enter known (content-editor specified) wrong answer, tagged as 'sig_figs'.",
+         value="12345", unit="None", wrong_unit=False, banner=_SIG_FIGS,
+         explanation=("p[text()='This should say \"Significant Figures\" above!']", _EDITOR_MESSAGE),
+         red=[1], behaviour="known wrong answer, tagged as sig fig", feedback="a known incorrect answer",
+         hint="The sig fig warning should not have been shown. if it was, this is likely the error."),
+    dict(name="NUMERIC_Q_UNITS_NONE", attempt="Attempt to enter known (content-editor specified) answer, which requires no units.",
+         value="999", unit="None", wrong_unit=False, banner=_INCORRECT,
+         explanation=("p[text()='This answer required no units!']", _EDITOR_MESSAGE),
+         red=[1], behaviour="units: None", feedback="a known incorrect answer"),
+]
+
+
+def _numeric_question(driver, ISAAC_WEB, WAIT_DUR):
+    """Return the numeric question WebElement, only opening it if it is not already open.
+
+       The cases run one after another on the same page, so after the first the
+       question is normally still open and there is no need to wait for it.
+    """
+    assert_tab(driver, ISAAC_WEB + "/questions/_regression_test_")
+    questions = driver.find_elements_by_xpath(_NUM_Q)
+    if questions and questions[0].is_displayed():
+        log(INFO, "Numeric question already open.")
+        return questions[0]
+    wait_for_stable(driver, WAIT_DUR)
+    open_accordion_section(driver, 3)
+    return driver.find_element_by_xpath(_NUM_Q)
+
+
+def _numeric_q_case(case):
+    """Return a test function which answers the numeric question as in 'case' and checks the feedback."""
+    def numeric_q_case(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
+        try:
+            num_question = _numeric_question(driver, ISAAC_WEB, WAIT_DUR)
+        except NoSuchElementException:
+            log(ERROR, "Can't find the numeric question; can't continue!")
+            return False
+
+        log(INFO, case["attempt"])
+        if not answer_numeric_q(num_question, case["value"], case["unit"], get_unit_wrong=case["wrong_unit"], wait_dur=WAIT_DUR):
+            log(ERROR, "Couldn't answer Numeric Question; can't continue!")
+            return False
+        wait_for_stable(driver, WAIT_DUR)
+
+        error_image = "ERROR_%s" % case["name"].lower()
+        try:
+            wait_for_xpath_element(driver, "%s//%s" % (_NUM_Q, case["banner"][0]))
+            log(INFO, case["banner"][1])
+            wait_for_xpath_element(driver, "(%s//%s)[1]" % (_NUM_Q, case["explanation"][0]))
+            log(INFO, case["explanation"][1])
+            wait_for_xpath_element(driver, "%s//h5[text()='Please try again.']" % _NUM_Q)
+            log(INFO, "The 'Please try again.' message was correctly shown.")
+            for box in case["red"]:
+                bg_colour = num_question.find_element_by_xpath("(.//div[@class='ru-answer-block-panel'])[%s]" % box).value_of_css_property('background-color')
+                assert bg_colour in _RED, _BOXES[box]
+                log(INFO, "Red highlighting shown around %s." % _BOXES[box])
+            log(PASS, "Numeric Question '%s' behavior as expected." % case["behaviour"])
+            return True
+        except TimeoutException:
+            image_div(driver, error_image)
+            if "hint" in case:
+                log(INFO, case["hint"])
+            log(ERROR, "The messages shown for %s were not all displayed; see '%s.png'!" % (case["feedback"], error_image))
+            return False
+        except AssertionError, e:
+            image_div(driver, error_image)
+            log(ERROR, "The %s was not highlighted red correctly; see '%s.png'!" % (e.message, error_image))
+            return False
+
+    numeric_q_case.__name__ = case["name"].lower()
+    numeric_q_case.__doc__ = """Test numeric question behaviour on '%s'.
+
+        - 'driver' should be a Selenium WebDriver.
+        - 'ISAAC_WEB' is the string URL of the Isaac website to be tested.
+        - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
+    """ % case["behaviour"]
+    return TestWithDependency(case["name"], ["NUMERIC_Q_ANSWER_CHANGE"], start_url="/questions/_regression_test_",
+                              rate_limits=["answers"])(numeric_q_case)
+
+
+# Register the tests in the order of the cases, under their usual names:
+__all__ = []
+for _case in NUMERIC_CASES:
+    globals()[_case["name"].lower()] = _numeric_q_case(_case)
+    __all__.append(_case["name"].lower())
@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
 from ..utils.isaac import open_accordion_section
 from ..tests import TestWithDependency
@@ -12,7 +11,7 @@ __all__ = ["numeric_q_units_select"]
 #####
 # Test : Numeric Question Units Dropdown
 #####
-@TestWithDependency("NUMERIC_Q_UNITS_SELECT", ["ACCORDION_BEHAVIOUR"])
+@TestWithDependency("NUMERIC_Q_UNITS_SELECT", ["ACCORDION_BEHAVIOUR"], start_url="/questions/_regression_test_", setup=True)
 def numeric_q_units_select(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if the units dropdown on numeric questions works as expected.
 
@@ -21,13 +20,13 @@ def numeric_q_units_select(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     driver.get(ISAAC_WEB + "/questions/_regression_test_")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/questions/_regression_test_"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         open_accordion_section(driver, 3)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         num_question = wait_for_xpath_element(driver, "//div[@ng-switch-when='isaacNumericQuestion']")
         log(INFO, "Accordion opened, numeric question displayed.")
     except NoSuchElementException:
@@ -40,7 +39,7 @@ def numeric_q_units_select(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     try:
         units_dropdown = num_question.find_element_by_xpath("//button[@ng-click='ctrl.showUnitsDropdown()']")
         units_dropdown.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Clicked to open units dropdown.")
         left = int(float(num_question.find_element_by_xpath(".//ul[contains(@class, 'f-dropdown')]").value_of_css_property('left').replace('px', '')))
         assert left > 0
@@ -56,7 +55,7 @@ def numeric_q_units_select(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         return False
     try:
         units_dropdown.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Clicked to close units dropdown.")
         left = int(num_question.find_element_by_xpath(".//ul[@class='f-dropdown']").value_of_css_property('left').replace('px', ''))
         assert left < 9000
@@ -1,38 +1,44 @@
 import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.isaac import logout_of_isaac
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
-from ..tests import TestWithDependency
+from ..tests import TestWithDependency, Deferred
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 __all__ = ["pwd_reset_throttle"]
 
+_FORGOT_PWD_REQUEST_LIMIT = 4
+
 
 #####
 # Test : Forgot My Password Button Limit
 #####
-@TestWithDependency("PWD_RESET_THROTTLE", ["LOGIN", "LOGOUT", "SIGNUP"])
+@TestWithDependency("PWD_RESET_THROTTLE", ["LOGIN", "LOGOUT", "SIGNUP"], locks=["inbox"], shared_locks=["user:Guerrilla"])
 def pwd_reset_throttle(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test that there is a limit on the number of password reset requests.
 
+       The requests must be 20 seconds apart so the emails arrive in order; the
+       test is deferred between requests so other tests can run in the meantime.
         - 'driver' should be a Selenium WebDriver.
         - 'Users' must be a TestUsers object.
         - 'ISAAC_WEB' is the string URL of the Isaac website to be tested.
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
-    assert_tab(driver, ISAAC_WEB)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    return _request_password_reset(0)(driver, Users, ISAAC_WEB, WAIT_DUR)
+
+
+def _request_password_reset(i):
+    """Return the continuation making the i-th password reset request, counting from 0."""
+    def _continuation(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
+        password_resets = i + 1
+        assert_tab(driver, ISAAC_WEB)
+        logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
 
-    driver.get(ISAAC_WEB + "/login")
-    log(INFO, "Got: %s" % (ISAAC_WEB + "/login"))
-    time.sleep(WAIT_DUR)
-    password_resets = 0
-    forgot_pwd_request_limit = 4
-    try:
-        for i in range(10):
-            driver.refresh()
+        driver.get(ISAAC_WEB + "/login")
+        log(INFO, "Got: %s" % (ISAAC_WEB + "/login"))
+        wait_for_stable(driver, WAIT_DUR)
+        try:
             user = driver.find_element_by_xpath("(//input[@name='email'])[2]")
             user.clear()
             user.send_keys(Users.Guerrilla.email)
@@ -41,8 +47,7 @@ def pwd_reset_throttle(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
             forgot_password_button.click()
             time.sleep(0.5)
             image_div(driver, "reset_password_button_message_%s" % i)
-            password_resets += 1
-            if i <= forgot_pwd_request_limit - 1:  # i starts from 0 not 1
+            if i <= _FORGOT_PWD_REQUEST_LIMIT - 1:  # i starts from 0 not 1
                 try:
                     wait_for_invisible_xpath(driver, "//div[@class='toast-message']/h4", 0.5)
                 except TimeoutException:
@@ -50,23 +55,23 @@ def pwd_reset_throttle(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
                 time.sleep(2)
                 message = driver.find_element_by_xpath("(//*[@ng-show='passwordResetFlag'])")
                 assert 'Your password reset request is being processed. Please check your inbox.' in message.get_attribute("innerHTML")
+                log(INFO, "Waiting 20 seconds.")
+                return Deferred(20, _request_password_reset(i + 1))  # Must wait long enough to ensure emails arrive in order!
             else:
                 try:
                     wait_for_xpath_element(driver, "//div[@class='toast-message']/h4")
                 except TimeoutException:
                     raise TimeoutException("Password reset error message not shown after %s requests." % password_resets)
                 log(INFO, "Password reset error message shown after %s attempts." % password_resets)
-                break
-            log(INFO, "Waiting 20 seconds.")
-            time.sleep(20)  # Must wait long enough to ensure emails arrive in order!
-        log(PASS, "Password reset error message shown after %s requests." % password_resets)
-        return True
-    except AssertionError:
-        log(ERROR, "Incorrect password reset message shown; see 'reset_password_button_message.png'!")
-        return False
-    except NoSuchElementException:
-        log(ERROR, "No password reset message shown; see 'reset_password_button_message.png'!")
-        return False
-    except TimeoutException, e:
-        log(ERROR, e.msg)
-        return False
+            log(PASS, "Password reset error message shown after %s requests." % password_resets)
+            return True
+        except AssertionError:
+            log(ERROR, "Incorrect password reset message shown; see 'reset_password_button_message.png'!")
+            return False
+        except NoSuchElementException:
+            log(ERROR, "No password reset message shown; see 'reset_password_button_message.png'!")
+            return False
+        except TimeoutException, e:
+            log(ERROR, e.msg)
+            return False
+    return _continuation
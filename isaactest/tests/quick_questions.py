@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -11,7 +10,7 @@ __all__ = ["quick_questions"]
 #####
 # Test : Quick Questions
 #####
-@TestWithDependency("QUICK_QUESTIONS", ["ACCORDION_BEHAVIOUR"])
+@TestWithDependency("QUICK_QUESTIONS", ["ACCORDION_BEHAVIOUR"], start_url="/questions/_regression_test_", setup=True)
 def quick_questions(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if quick questions behave as expected.
 
@@ -20,10 +19,10 @@ def quick_questions(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     driver.get(ISAAC_WEB + "/questions/_regression_test_")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/questions/_regression_test_"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         log(INFO, "Check that answer is not initially visible.")
         wait_for_invisible_xpath(driver, "//p[text()='This is the answer.']")
@@ -41,7 +40,7 @@ def quick_questions(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Try clicking the 'Show answer' button.")
         show = driver.find_element_by_xpath("//div[contains(@class, 'ru_answer_reveal')]/div[@ng-click='isVisible=!isVisible']")
         show.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Check answer was shown.")
         wait_for_xpath_element(driver, "//p[contains(text(), 'This is the answer.')]")
         log(INFO, "Answer was displayed correctly.")
@@ -61,11 +60,11 @@ def quick_questions(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Try clicking the 'Hide answer' button to hide answer again.")
         hide = driver.find_element_by_xpath("//div[contains(@class, 'ru_answer_reveal')]/div[@ng-click='isVisible=!isVisible']")
         hide.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Check answer was hidden again.")
         wait_for_invisible_xpath(driver, "//p[text()='This is the answer.']")
         log(INFO, "Answer was hidden again correctly.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(PASS, "Quick question behavior as expected.")
         return True
     except NoSuchElementException:
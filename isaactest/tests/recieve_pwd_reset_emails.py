@@ -1,6 +1,6 @@
 import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import image_div
 from ..tests import TestWithDependency
 
 __all__ = ["recieve_pwd_reset_emails"]
@@ -9,17 +9,17 @@ __all__ = ["recieve_pwd_reset_emails"]
 #####
 # Test : 4 password reset emails recieved
 #####
-@TestWithDependency("RECIEVE_PWD_RESET_EMAILS", ["PWD_RESET_THROTTLE"])
+@TestWithDependency("RECIEVE_PWD_RESET_EMAILS", ["PWD_RESET_THROTTLE"], locks=["inbox"])
 def recieve_pwd_reset_emails(driver, inbox, GUERRILLAMAIL, WAIT_DUR, **kwargs):
     """Test that the correct number of password reset emails are recieved after being requested.
 
         - 'driver' should be a Selenium WebDriver.
-        - 'inbox' should be a GuerrillaInbox object.
+        - 'inbox' should be a GuerrillaInbox or SMTPInbox object.
         - 'GUERRILLAMAIL' is the string URL of GuerrillaMail.
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     forgot_pwd_request_limit = 4
-    assert_tab(driver, GUERRILLAMAIL)
+    inbox.activate()
     inbox.wait_for_email(WAIT_DUR, expected=forgot_pwd_request_limit)
 
     forgot_password_emails_recieved = 0
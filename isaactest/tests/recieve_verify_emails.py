@@ -1,5 +1,5 @@
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import image_div
 from ..tests import TestWithDependency
 
 __all__ = ["recieve_verify_emails"]
@@ -8,16 +8,16 @@ __all__ = ["recieve_verify_emails"]
 #####
 # Test : Recieve Verification Emails
 #####
-@TestWithDependency("RECIEVE_VERIFY_EMAILS", ["REQ_VERIFY_EMAILS"])
+@TestWithDependency("RECIEVE_VERIFY_EMAILS", ["REQ_VERIFY_EMAILS"], locks=["inbox"])
 def recieve_verify_emails(driver, inbox, GUERRILLAMAIL, WAIT_DUR, **kwargs):
     """Test if the new verification emails are recieved.
 
         - 'driver' should be a Selenium WebDriver.
-        - 'inbox' should be a GuerrillaInbox object.
+        - 'inbox' should be a GuerrillaInbox or SMTPInbox object.
         - 'GUERRILLAMAIL' is the string URL of GuerrillaMail.
     """
     verification_email_request_limit = 4
-    assert_tab(driver, GUERRILLAMAIL)
+    inbox.activate()
     inbox.wait_for_email(WAIT_DUR, expected=verification_email_request_limit)
 
     try:
@@ -1,6 +1,6 @@
 import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -11,7 +11,7 @@ __all__ = ["req_verify_emails"]
 ######
 # Test : Request Verification Emails
 ######
-@TestWithDependency("REQ_VERIFY_EMAILS", ["SIGNUP"])
+@TestWithDependency("REQ_VERIFY_EMAILS", ["SIGNUP"], shared_locks=["user:Guerrilla"])
 def req_verify_emails(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test the behavior on requesting more email verification emails.
 
@@ -20,7 +20,7 @@ def req_verify_emails(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         request_verify_email = driver.find_element_by_xpath("//a[@ng-click='requestEmailVerification()']")
     except NoSuchElementException:
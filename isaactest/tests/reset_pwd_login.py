@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import submit_login_form, assert_logged_in
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException
 
@@ -11,7 +10,7 @@ __all__ = ["reset_pwd_login"]
 #####
 # Test : Logging In With New Password
 #####
-@TestWithDependency("RESET_PWD_LOGIN", ["LOGIN", "PWD_RESET_LINK"])
+@TestWithDependency("RESET_PWD_LOGIN", ["LOGIN", "PWD_RESET_LINK"], role="Guerrilla", shared_locks=["user:Guerrilla"])
 def reset_pwd_login(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if users can login with new credentials after resetting password.
 
@@ -23,13 +22,13 @@ def reset_pwd_login(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB)
     log(INFO, "Got: %s" % ISAAC_WEB)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     try:
         login_tab = driver.find_element_by_xpath("//a[@id='login-tab']")
         login_tab.click()
         submit_login_form(driver, user=Users.Guerrilla, wait_dur=WAIT_DUR)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Can't access login tab; can't continue!")
         return False
@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, wait_for_xpath_element
-from ..utils.isaac import submit_login_form
+from ..utils.i_selenium import assert_tab, wait_for_xpath_element, wait_for_stable
+from ..utils.isaac import submit_login_form, logout_of_isaac
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
@@ -11,7 +10,7 @@ __all__ = ['save_board_add']
 #####
 # Test : Save a Board to My Boards
 #####
-@TestWithDependency('SAVE_BOARD_ADD', ['LOGIN'])
+@TestWithDependency('SAVE_BOARD_ADD', ['LOGIN'], role="Student", shared_locks=["user:Student"])
 def save_board_add(driver, ISAAC_WEB, WAIT_DUR, Users, **kwargs):
     """Test whether users can sign out of Isaac.
 
@@ -20,19 +19,17 @@ def save_board_add(driver, ISAAC_WEB, WAIT_DUR, Users, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     try:
         driver.get(ISAAC_WEB + "/login")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         assert submit_login_form(driver, user=Users.Student, wait_dur=WAIT_DUR)
     except AssertionError:
         log(ERROR, "Can't login, can't continue test!")
         return False
     driver.get(ISAAC_WEB + '/gameboards')
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         log(INFO, "Waiting for questions to load.")
         wait_for_xpath_element(driver, "//a[@class='ru-hex-home-content']", duration=15)
@@ -40,7 +37,7 @@ def save_board_add(driver, ISAAC_WEB, WAIT_DUR, Users, **kwargs):
         refresh = driver.find_element_by_xpath("//a[@ng-click='shuffleBoard()']")
         log(INFO, "Refreshing questions.")
         refresh.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         assert previous_url != driver.current_url
         log(INFO, 'Board successfully refreshed.')
     except TimeoutException:
@@ -59,9 +56,9 @@ def save_board_add(driver, ISAAC_WEB, WAIT_DUR, Users, **kwargs):
         log(INFO, "Found board ID to be added: '%s'." % board_id)
         board.click()
         log(INFO, "Clicked add to my boards, should be redirected to 'My Boards' page.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         assert driver.current_url == ISAAC_WEB + '/boards'
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Can't find 'Save to My Boards' button; can't continue!")
         return False
@@ -78,7 +75,7 @@ def save_board_add(driver, ISAAC_WEB, WAIT_DUR, Users, **kwargs):
         log(INFO, "Most recently added board has ID: '%s'." % most_recent_board)
         assert most_recent_board == board_id
         log(INFO, "Most recently added board has the correct ID.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(PASS, 'Successfully saved new board to My Boards!')
         return True
     except NoSuchElementException:
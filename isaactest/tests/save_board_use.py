@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException
 __all__ = ['progress_page']
@@ -16,10 +15,10 @@ def save_board_use(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     try:
         menu = driver.find_element_by_xpath("//button[@id='menu-button-dekstop']")
         menu.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         myprogress_button = driver.find_element_by_xpath("//a[@ui-sref='boards']")
         myprogress_button.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         assert driver.current_url == ISAAC_WEB + '/boards'
         log(INFO, 'Navigated to boards page successfully.')
     except NoSuchElementException:
@@ -29,10 +28,10 @@ def save_board_use(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     try:
         second_block = driver.find_element_by_xpath("//li[@ng-model='boards'][2]//a[@class='board-title-link ng-binding']")
         href = driver.find_element_by_xpath("//li[@ng-model='boards'][2]//a[@class='board-share']").get_attribute('sharelink')
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         print href[6:]
         second_block.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         assert driver.current_url == ISAAC_WEB + '/gameboards#' + href[6:]
     except NoSuchElementException:
         log(INFO, 'Failed to navigate to the first block on the page.')
@@ -47,7 +46,7 @@ def save_board_use(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         return False
 
     try:
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         back = driver.find_element_by_xpath("//a[@ng-click='backToBoard()']")
         back.click()
         log(INFO, 'Successfully moved back to boards page!')
@@ -58,10 +57,10 @@ def save_board_use(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     try:
         menu = driver.find_element_by_xpath("//button[@id='menu-button-dekstop']")
         menu.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         myprogress_button = driver.find_element_by_xpath("//a[@ui-sref='boards']")
         myprogress_button.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         assert driver.current_url == ISAAC_WEB + '/boards'
         log(INFO, 'Navigated to boards page successfully.')
     except NoSuchElementException:
@@ -69,7 +68,7 @@ def save_board_use(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         return False
 
     try:
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         assert driver.find_element_by_xpath("//li[@ng-model='boards'][1]//a[@class='board-share']").get_attribute('sharelink') == href
         log(INFO, 'Board has saved successfully!')
         log(PASS, 'Board saving functionality works correctly.')
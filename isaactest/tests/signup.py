@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import sign_up_to_isaac
-from ..utils.i_selenium import assert_tab
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..tests import TestWithDependency
 from selenium.common.exceptions import NoSuchElementException
 
@@ -11,7 +10,7 @@ __all__ = ["signup"]
 #####
 # Test : Sign Up to Isaac
 #####
-@TestWithDependency("SIGNUP", ["LOGIN", "LOGOUT"], ["DELETE_USER"])
+@TestWithDependency("SIGNUP", ["LOGIN", "LOGOUT"], ["DELETE_USER"], rerun_together=["DELETE_USER"], role="Guerrilla", locks=["user:Guerrilla"])
 def signup(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test whether users can sign up to Isaac using an email address.
 
@@ -23,17 +22,17 @@ def signup(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB + "/logout")
     log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         login_tab = driver.find_element_by_id("login-tab")
         login_tab.click()
     except NoSuchElementException:
         log(ERROR, "Can't find login button; can't continue!")
         return False
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     if sign_up_to_isaac(driver, user=Users.Guerrilla, wait_dur=WAIT_DUR):
         log(PASS, "Successfully register new user '%s' on Isaac." % Users.Guerrilla.email)
         return True
@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import sign_up_to_isaac
-from ..utils.i_selenium import assert_tab
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -12,7 +11,7 @@ __all__ = ["signup_uppercase"]
 #####
 # Test : Signup Email Case Sensitivity
 #####
-@TestWithDependency("SIGNUP_UPPERCASE", ["LOGIN", "SIGNUP"])
+@TestWithDependency("SIGNUP_UPPERCASE", ["LOGIN", "SIGNUP"], shared_locks=["user:Guerrilla"])
 def signup_uppercase(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if users can sign up with the uppercase form of an already existing email.
 
@@ -24,11 +23,11 @@ def signup_uppercase(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB + "/logout")
     log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         login_tab = driver.find_element_by_id("login-tab")
         login_tab.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Can't access login tab; can't continue!")
         return False
@@ -36,11 +35,11 @@ def signup_uppercase(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(INFO, "Try to sign up with uppercase version of already used email.")
         assert not sign_up_to_isaac(driver, Users.Guerrilla.email.upper(), Users.Guerrilla.firstname, Users.Guerrilla.lastname, Users.Guerrilla.password, suppress=True, wait_dur=WAIT_DUR)
         wait_for_xpath_element(driver, "//h4[contains(text(), 'Registration Failed')]/span[contains(text(), 'An account already exists with the e-mail address')]")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Couldn't sign up, as expected.")
         driver.get(ISAAC_WEB)
         log(INFO, "Got: %s" % ISAAC_WEB)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(PASS, "Cannot sign up with uppercase form of existing email.")
         return True
     except TimeoutException:
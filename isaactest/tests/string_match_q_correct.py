@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import open_accordion_section
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -12,7 +11,7 @@ __all__ = ["string_match_q_correct"]
 #####
 # Test : String Match Questions Correct
 #####
-@TestWithDependency("STRING_MATCH_Q_CORRECT", ["ACCORDION_BEHAVIOUR"])
+@TestWithDependency("STRING_MATCH_Q_CORRECT", ["ACCORDION_BEHAVIOUR"], start_url="/questions/_regression_test_")
 def string_match_q_correct(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if text entry questions work correctly.
 
@@ -24,11 +23,11 @@ def string_match_q_correct(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
 
     driver.get(ISAAC_WEB + "/questions/_regression_test_")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/questions/_regression_test_"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     try:
         open_accordion_section(driver, 6)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         stringmatch_question = wait_for_xpath_element(driver, "//div[@ng-switch-when='isaacStringMatchQuestion']")
         log(INFO, "Accordion opened, string match question displayed.")
         text_input = stringmatch_question.find_elements_by_xpath(".//input[@ng-model='ctrl.selectedValue']")[0]
@@ -45,13 +44,13 @@ def string_match_q_correct(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     text_input.clear()
     text_input.send_keys("hello")
     log(INFO, "Typing answer into text entry box.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     try:
         check_answer_button = stringmatch_question.find_element_by_xpath(".//button[text()='Check my answer']")
         check_answer_button.click()
         log(INFO, "Clicked 'Check my answer'.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
     except NoSuchElementException:
         log(ERROR, "Couldn't click the 'Check my answer' button; can't continue!")
         return False
@@ -1,7 +1,6 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import answer_symbolic_q_text_entry, open_accordion_section, submit_login_form, assert_logged_in
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
 from ..tests import TestWithDependency
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -12,7 +11,7 @@ __all__ = ["symbolic_q_text_entry_correct"]
 #####
 # Test : Symbolic Questions Text Entry Correct Answers
 #####
-@TestWithDependency("SYMBOLIC_Q_TEXT_ENTRY_CORRECT")
+@TestWithDependency("SYMBOLIC_Q_TEXT_ENTRY_CORRECT", start_url="/questions/_regression_test_", rate_limits=["answers"])
 def symbolic_q_text_entry_correct(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if symbolic questions can be answered correctly with text entry.
 
@@ -22,9 +21,9 @@ def symbolic_q_text_entry_correct(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB + "/questions/_regression_test_")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     assert_tab(driver, ISAAC_WEB + "/questions/_regression_test_")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         open_accordion_section(driver, 4)
         sym_question = driver.find_element_by_xpath("//div[@ng-switch-when='isaacSymbolicQuestion']")
@@ -36,7 +35,7 @@ def symbolic_q_text_entry_correct(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     if not answer_symbolic_q_text_entry(sym_question, "(((x)))", wait_dur=WAIT_DUR):
         log(ERROR, "Couldn't answer symbolic Question; can't continue!")
         return False
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     try:
         wait_for_xpath_element(driver, "//div[@ng-switch-when='isaacSymbolicQuestion']//h1[text()='Correct!']")
@@ -46,7 +45,7 @@ def symbolic_q_text_entry_correct(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         wait_for_xpath_element(driver, "//div[@ng-switch-when='isaacSymbolicQuestion']//strong[text()='Well done!']")
         log(INFO, "The 'Well done!' message was correctly shown.")
         log(INFO, "Avoid rate limiting: wait 1 minute.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(PASS, "Symbolic Question 'correct value, correct unit' behavior as expected.")
         return True
     except TimeoutException:
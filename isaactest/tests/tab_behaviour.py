@@ -1,9 +1,9 @@
 import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element
-from ..utils.isaac import open_accordion_section, close_accordion_section
-from ..tests import TestWithDependency
+from ..utils.isaac import open_accordion_section, close_accordion_section, logout_of_isaac
+from ..tests import TestWithDependency, LOGGED_OUT
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 __all__ = ["tab_behavior"]
@@ -12,7 +12,7 @@ __all__ = ["tab_behavior"]
 #####
 # Test : Accordion Sections Open and Close
 #####
-@TestWithDependency("TAB_BEHAVIOUR", ["ACCORDION_BEHAVIOUR"])
+@TestWithDependency("TAB_BEHAVIOUR", ["ACCORDION_BEHAVIOUR"], role=LOGGED_OUT, start_url="/questions/_regression_test_", setup=True)
 def tab_behavior(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test if tabs can be used as expected.
 
@@ -21,13 +21,11 @@ def tab_behavior(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    time.sleep(WAIT_DUR)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     driver.get(ISAAC_WEB + "/questions/_regression_test_")
     log(INFO, "Got: %s" % (ISAAC_WEB + "/questions/_regression_test_"))
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     try:
         close_accordion_section(driver, 1)
         open_accordion_section(driver, 2)
@@ -41,7 +39,7 @@ def tab_behavior(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         log(ERROR, "Expected 2 hint tabs, found %s! Can't continue!" % len(hint_buttons))
         return False
     try:
-        time.sleep(WAIT_DUR)  # Don't need to wait ages, but race condition occasionally!
+        wait_for_stable(driver, WAIT_DUR)  # Don't need to wait ages, but race condition occasionally!
         log(INFO, "Attempt to access Hint 1.")
         hint_buttons[0].click()
         wait_for_xpath_element(driver, "//div[@ng-switch-when='isaacMultiChoiceQuestion']//p[contains(text(), 'This is Hint 1.')]")
@@ -66,9 +64,9 @@ def tab_behavior(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
         return False
     try:
         close_accordion_section(driver, 2)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         open_accordion_section(driver, 3)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         num_question = driver.find_element_by_xpath("//div[@ng-switch-when='isaacNumericQuestion']")
         hint_buttons = num_question.find_elements_by_xpath(".//a[contains(text(), 'Hint ')]/..")
         log(INFO, "Try cycling through all hints.")
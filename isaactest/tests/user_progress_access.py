@@ -1,9 +1,8 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.isaac import submit_login_form, assert_logged_in
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.isaac import login_as, logout_of_isaac
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
 from ..utils.i_selenium import wait_for_xpath_element, wait_for_invisible_xpath
-from ..tests import TestWithDependency
+from ..tests import TestWithDependency, LOGGED_OUT
 from selenium.common.exceptions import TimeoutException
 
 __all__ = ["user_progress_access"]
@@ -12,7 +11,7 @@ __all__ = ["user_progress_access"]
 #####
 # Test : Access Users Progress Page
 #####
-@TestWithDependency("USER_PROGRESS_ACCESS", ["LOGIN", "LOGOUT"])
+@TestWithDependency("USER_PROGRESS_ACCESS", ["LOGIN", "LOGOUT"], role=LOGGED_OUT, shared_locks=["user:Student"])
 def user_progress_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test access to user progress page is suitably restricted.
 
@@ -22,22 +21,18 @@ def user_progress_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
         - 'WAIT_DUR' is the time in seconds to wait for JavaScript to run/load.
     """
     assert_tab(driver, ISAAC_WEB)
-    driver.get(ISAAC_WEB + "/logout")
-    log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
 
     progress_access_fail = False
 
     try:
         log(INFO, "Test if logged out user can access '/progress/1'.")
         driver.get(ISAAC_WEB + "/progress/1")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         assert (("/login?target=%2Fprogress%2F1" in driver.current_url) or ("/login?target=~2Fprogress~2F1" in driver.current_url))
         log(INFO, "Logged out users can't access progress pages.")
-        time.sleep(WAIT_DUR)
-        driver.get(ISAAC_WEB + "/logout")
-        log(INFO, "Logging out to start from same initial page each time.")
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
+        logout_of_isaac(driver, ISAAC_WEB, wait_dur=WAIT_DUR)
     except AssertionError:
         progress_access_fail = True
         image_div(driver, "ERROR_unexpected_admin_access")
@@ -47,11 +42,8 @@ def user_progress_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     for i_type, user in access_cases:
         log(INFO, "Test if '%s' users can access another users progress page." % i_type)
         try:
-            driver.get(ISAAC_WEB + "/progress/1")
-            time.sleep(WAIT_DUR)
-            submit_login_form(driver, user=user, wait_dur=WAIT_DUR)
-            time.sleep(WAIT_DUR)
-            assert_logged_in(driver, user, wait_dur=WAIT_DUR)
+            assert login_as(driver, ISAAC_WEB, user, url=ISAAC_WEB + "/progress/1", wait_dur=WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             log(INFO, "Try loading progress page; no errors will be shown but have to wait to see if data loads.")
             wait_for_invisible_xpath(driver, "//div[@loading-overlay]", 60)
         except AssertionError:
@@ -73,24 +65,22 @@ def user_progress_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
             log(ERROR, "User of type '%s' accessed another users progress page!" % i_type)
             progress_access_fail = True
 
-        driver.get(ISAAC_WEB + "/logout")
-        log(INFO, "Logged out '%s' user." % i_type)
-        time.sleep(WAIT_DUR)
+        driver.delete_all_cookies()
+        driver.get(ISAAC_WEB)
+        log(INFO, "Cleared the session of the '%s' user." % i_type)
+        wait_for_stable(driver, WAIT_DUR)
 
     access_cases = [("Admin", Users.Admin)]
     for i_type, user in access_cases:
         log(INFO, "Test if '%s' users can access another users progress page." % i_type)
         try:
-            driver.get(ISAAC_WEB + "/progress/1")
-            time.sleep(WAIT_DUR)
-            submit_login_form(driver, user=user, wait_dur=WAIT_DUR)
-            time.sleep(WAIT_DUR)
-            assert_logged_in(driver, user, wait_dur=WAIT_DUR)
+            assert login_as(driver, ISAAC_WEB, user, url=ISAAC_WEB + "/progress/1", wait_dur=WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             title = str(wait_for_xpath_element(driver, "(//h1)[1]").text)
             title = title.strip()
             assert len(title) > len("Progress for user:"), "Title is '%s', expected 'Progress for user: [name]'!"
             wait_for_xpath_element(driver, "//div[@d3-plot]//ul[@class='d3-plot-key']")
-            time.sleep(WAIT_DUR)
+            wait_for_stable(driver, WAIT_DUR)
             log(INFO, "'%s' users can access '/progress/1' as expected." % i_type)
         except TimeoutException:
             progress_access_fail = True
@@ -100,9 +90,10 @@ def user_progress_access(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
             progress_access_fail = True
             image_div(driver, "ERROR_no_admin_access")
             log(ERROR, "Error accessing other user progress: %s See 'ERROR_no_admin_access.png'!" % e.message)
-        driver.get(ISAAC_WEB + "/logout")
-        log(INFO, "Logged out '%s' user." % i_type)
-        time.sleep(3)
+        driver.delete_all_cookies()
+        driver.get(ISAAC_WEB)
+        log(INFO, "Cleared the session of the '%s' user." % i_type)
+        wait_for_stable(driver, WAIT_DUR)
 
     if not progress_access_fail:
         log(PASS, "Access to another users progress page restricted appropriately.")
@@ -1,8 +1,8 @@
 import time
 from ..utils.log import log, INFO, ERROR, PASS
 from ..utils.isaac import submit_login_form
-from ..utils.i_selenium import assert_tab, image_div
-from ..tests import TestWithDependency
+from ..utils.i_selenium import assert_tab, image_div, wait_for_stable
+from ..tests import TestWithDependency, LOGGED_OUT
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -14,7 +14,7 @@ __all__ = ["user_type_specific_menu_links"]
 #####
 # Test : Correct Menu Links Visible As Users
 #####
-@TestWithDependency("USER_TYPE_SPECIFIC_MENU_LINKS", ["LOGIN", "LOGOUT"])
+@TestWithDependency("USER_TYPE_SPECIFIC_MENU_LINKS", ["LOGIN", "LOGOUT"], role=LOGGED_OUT, shared_locks=["user:Student"])
 def user_type_specific_menu_links(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     """Test access to admin page is suitably restricted.
 
@@ -26,7 +26,7 @@ def user_type_specific_menu_links(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     driver.get(ISAAC_WEB + "/logout")
     log(INFO, "Logging out any logged in user.")
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
 
     menu_options_for_all = ['/account', '/boards', '/progress', '/assignments', '/solving_problems', '/support/teacher', '/support/student', '/events']
     menu_options_logged_out = ['/login'] + menu_options_for_all
@@ -39,7 +39,7 @@ def user_type_specific_menu_links(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     menu_links_fail = False
     global_nav = driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
     global_nav.click()
-    time.sleep(WAIT_DUR)
+    wait_for_stable(driver, WAIT_DUR)
     menu_to_check = driver.find_element_by_class_name('dl-nav')
     log(INFO, "Found menu bar")
     for option in menu_options_logged_out:
@@ -67,12 +67,12 @@ def user_type_specific_menu_links(driver, Users, ISAAC_WEB, WAIT_DUR, **kwargs):
     for i_type, user, menu_options in access_cases:
         driver.get(ISAAC_WEB + "/login")
         log(INFO, "Got '%s'. As '%s', try to use global nav." % (ISAAC_WEB + "/login", i_type))
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         submit_login_form(driver, user=user, wait_dur=WAIT_DUR)
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         global_nav = driver.find_element_by_xpath("//button[@ng-click='menuToggle()']")
         global_nav.click()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         menu_to_check = driver.find_element_by_class_name('dl-nav')
         for option in menu_options:
             try:
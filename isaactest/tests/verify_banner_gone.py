@@ -1,6 +1,5 @@
-import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab
+from ..utils.i_selenium import assert_tab, wait_for_stable
 from ..utils.i_selenium import wait_for_invisible_xpath
 from ..tests import TestWithDependency
 
@@ -23,7 +22,7 @@ def verify_banner_gone(driver, ISAAC_WEB, WAIT_DUR, **kwargs):
     assert_tab(driver, ISAAC_WEB)
     try:
         driver.refresh()
-        time.sleep(WAIT_DUR)
+        wait_for_stable(driver, WAIT_DUR)
         log(INFO, "Checking if verification banner now gone.")
         wait_for_invisible_xpath(driver, "//a[@ng-click='requestEmailVerification()']")
         log(PASS, "Verification banner gone after verifying email.")
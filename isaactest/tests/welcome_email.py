@@ -1,6 +1,6 @@
 import time
 from ..utils.log import log, INFO, ERROR, PASS
-from ..utils.i_selenium import assert_tab, image_div
+from ..utils.i_selenium import image_div
 from ..tests import TestWithDependency
 
 __all__ = ["welcome_email"]
@@ -9,15 +9,15 @@ __all__ = ["welcome_email"]
 #####
 # Test : Welcome Email Recieved
 #####
-@TestWithDependency("WELCOME_EMAIL", ["SIGNUP"])
+@TestWithDependency("WELCOME_EMAIL", ["SIGNUP"], locks=["inbox"])
 def welcome_email(driver, inbox, GUERRILLAMAIL, WAIT_DUR, **kwargs):
     """Test if the registration confirmation/welcome email is recieved.
 
         - 'driver' should be a Selenium WebDriver.
-        - 'inbox' should be a GuerrillaInbox object.
+        - 'inbox' should be a GuerrillaInbox or SMTPInbox object.
         - 'GUERRILLAMAIL' is the string URL of GuerrillaMail.
     """
-    assert_tab(driver, GUERRILLAMAIL)
+    inbox.activate()
     inbox.wait_for_email(WAIT_DUR)
 
     log(INFO, "GuerrillaMail: Access welcome email in inbox.")
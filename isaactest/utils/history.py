@@ -0,0 +1,244 @@
+import math
+import time
+import sqlite3
+import threading
+from .log import log, INFO, SLOW
+
+__all__ = ['ResultHistory', 'HISTORY']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    site TEXT,
+    started REAL,
+    finished REAL,
+    aborted INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run INTEGER REFERENCES runs(id),
+    test TEXT,
+    status TEXT,
+    started REAL,
+    finished REAL,
+    active REAL,
+    attempts INTEGER,
+    message TEXT,
+    PRIMARY KEY (run, test)
+);
+CREATE INDEX IF NOT EXISTS results_test ON results (test);
+CREATE TABLE IF NOT EXISTS pages (
+    run INTEGER REFERENCES runs(id),
+    test TEXT,
+    page TEXT,
+    kind TEXT,
+    recorded REAL,
+    ready REAL,
+    ttfb REAL,
+    dom_ready REAL,
+    load REAL,
+    resources INTEGER,
+    resource_time REAL
+);
+CREATE INDEX IF NOT EXISTS pages_page ON pages (page, kind);
+"""
+
+# How test results are stored in the 'status' column:
+_STATUS = {True: "pass", SLOW: "slow", False: "fail", None: "not run"}
+
+
+def _percentile(values, percent):
+    """Return the 'percent' percentile of the list 'values', by the nearest rank."""
+    values = sorted(values)
+    return values[max(int(math.ceil(len(values) * percent / 100.0)) - 1, 0)]
+
+
+class ResultHistory(object):
+    """A persistent SQLite store of the results of every test run.
+
+       Each run of the test suite is a row of the 'runs' table, and each test
+       result a row of the 'results' table; with its status ('pass', 'fail' or
+       'slow' or 'not run'), the time it started and finished, the time spent actually
+       running (excluding any time deferred), how many times the test or a
+       continuation of it ran, and the last error it logged. The timings of the
+       pages each test visited are rows of the 'pages' table. Results are committed
+       as they are recorded, so an aborted run keeps the results it had. Until
+       'open(...)' is called, recording results does nothing. It is safe to
+       share between threads.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.run = None
+        self._db = None
+        self._lock = threading.Lock()
+
+    def open(self, path, site, record=True):
+        """Open (or create) the store at 'path' and start recording a new run.
+
+            - 'path' is the filename of the SQLite database.
+            - 'site' is the string URL of the Isaac website being tested.
+            - 'record' is an optional flag; if 'False', only read the history of
+              earlier runs, without starting a new one.
+        """
+        with self._lock:
+            self.path = path
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+            if not record:
+                return
+            cursor = self._db.execute("INSERT INTO runs (site, started) VALUES (?, ?)", (site, time.time()))
+            self.run = cursor.lastrowid
+            self._db.commit()
+        log(INFO, "Recording results as run %s in '%s'." % (self.run, path))
+
+    def close(self, aborted=False):
+        """Mark the current run as finished, and close the store."""
+        if self._db is None:
+            return
+        with self._lock:
+            if self.run is not None:
+                self._db.execute("UPDATE runs SET finished = ?, aborted = ? WHERE id = ?", (time.time(), int(aborted), self.run))
+                self._db.commit()
+            self._db.close()
+            self._db = None
+
+    def record(self, test, result, started, finished, active=0.0, attempts=1, message=None):
+        """Record the result of a test in the current run.
+
+            - 'test' is the uppercase name of the test.
+            - 'result' is the test result; 'True', 'SLOW', 'False' or 'None'.
+            - 'started' and 'finished' are the times, as from 'time.time()', the
+              test started and finished.
+            - 'active' is the time in seconds spent actually running the test.
+            - 'attempts' is how many times the test or its continuations ran.
+            - 'message' is an optional string explaining a failure.
+        """
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (self.run, test, _STATUS[result], started, finished, active, attempts, message))
+            self._db.commit()
+
+    def record_page(self, test, page, kind, ready, ttfb=None, dom_ready=None, load=None, resources=0, resource_time=0.0):
+        """Record the timings, in milliseconds, of a page visited in the current run.
+
+            - 'test' is the uppercase name of the test visiting the page.
+            - 'page' is the page visited, as from 'page_pattern(...)'.
+            - 'kind' is "load" for a document loaded from scratch, "route" for a
+              navigation within the AngularJS app, or "action" for another action.
+            - 'ready' is the time until the page was stable.
+            - 'ttfb', 'dom_ready' and 'load' are the times until the first byte was
+              received, the DOM was ready and the page had loaded, for loads.
+            - 'resources' is the number of resources fetched, and 'resource_time'
+              the time until the last of them was received.
+        """
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute("INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             (self.run, test, page, kind, time.time(), ready, ttfb, dom_ready, load, resources, resource_time))
+            self._db.commit()
+
+    def page_percentiles(self, previous=False, runs=10):
+        """Return a dict of {(page, kind): (visits, p50, p95)} of the milliseconds until pages were ready.
+
+            - 'previous' is an optional flag to use the last 'runs' runs before the
+              current one, rather than the current run.
+        """
+        if previous:
+            rows = self._query("SELECT page, kind, ready FROM pages WHERE run < ? AND run >= ? - ?", (self.run, self.run, runs))
+        else:
+            rows = self._query("SELECT page, kind, ready FROM pages WHERE run = ?", (self.run,))
+        readies = dict()
+        for page, kind, ready in rows:
+            readies.setdefault((page, kind), []).append(ready)
+        return dict((p, (len(r), _percentile(r, 50), _percentile(r, 95))) for p, r in readies.items())
+
+    def page_report(self):
+        """Log the median and 95th percentile time until each page was ready, against recent runs."""
+        if self._db is None:
+            return
+        previous = self.page_percentiles(previous=True)
+        current = sorted(self.page_percentiles().items(), key=lambda (p, t): t[2], reverse=True)
+        for (page, kind), (visits, p50, p95) in current:
+            message = "Pages: %s (%s) visited %s times; ready p50 %.0f ms, p95 %.0f ms" % (page, kind, visits, p50, p95)
+            if (page, kind) in previous:
+                message += " (recent p50 %.0f ms, p95 %.0f ms)" % previous[(page, kind)][1:]
+            log(INFO, message + ".")
+
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def slowest(self, limit=10):
+        """Return a list of (test, mean active seconds, runs) of the slowest tests, slowest first."""
+        return self._query("SELECT test, AVG(active), COUNT(*) FROM results WHERE status != 'not run' "
+                           "GROUP BY test ORDER BY AVG(active) DESC LIMIT ?", (limit,))
+
+    def mean_durations(self, runs=10):
+        """Return a dict of {TestName: mean active seconds} over the last 'runs' runs of each test."""
+        durations = dict()
+        for test, active in self._query("SELECT test, active FROM results WHERE status != 'not run' ORDER BY run DESC"):
+            durations.setdefault(test, [])
+            if len(durations[test]) < runs:
+                durations[test].append(active)
+        return dict((t, sum(d) / len(d)) for t, d in durations.items())
+
+    def median_durations(self, runs=10):
+        """Return a dict of {TestName: median elapsed seconds} over the last 'runs' runs of each test.
+
+           Unlike 'mean_durations(...)', this is the time from the test starting
+           to it finishing, including any time spent deferred, since that is how
+           long tests depending upon it must wait.
+        """
+        durations = dict()
+        for test, elapsed in self._query("SELECT test, finished - started FROM results WHERE status != 'not run' "
+                                         "ORDER BY run DESC"):
+            durations.setdefault(test, [])
+            if len(durations[test]) < runs:
+                durations[test].append(elapsed)
+        medians = dict()
+        for test, d in durations.items():
+            d.sort()
+            middle = len(d) // 2
+            medians[test] = d[middle] if len(d) % 2 else (d[middle - 1] + d[middle]) / 2.0
+        return medians
+
+    def run_durations(self):
+        """Return a dict of {TestName: active seconds} of the tests run so far in the current run."""
+        if self._db is None:
+            return dict()
+        return dict(self._query("SELECT test, active FROM results WHERE run = ? AND status != 'not run'", (self.run,)))
+
+    def trend(self, test, runs=10):
+        """Return a list of (run, active seconds) for the last 'runs' runs of 'test', oldest first."""
+        rows = self._query("SELECT run, active FROM results WHERE test = ? AND status != 'not run' "
+                           "ORDER BY run DESC LIMIT ?", (test, runs))
+        return list(reversed(rows))
+
+    def flaky(self, runs=10):
+        """Return a list of (test, passes, fails) for tests which both passed and failed recently.
+
+            - 'runs' is how many of the most recent runs to consider.
+        """
+        return self._query("SELECT test, SUM(status = 'pass'), SUM(status = 'fail') FROM results "
+                           "WHERE run > (SELECT MAX(id) FROM runs) - ? GROUP BY test "
+                           "HAVING SUM(status = 'pass') > 0 AND SUM(status = 'fail') > 0 "
+                           "ORDER BY SUM(status = 'fail') DESC", (runs,))
+
+    def report(self, limit=5):
+        """Log the slowest tests of this run against their history, and any flaky tests."""
+        if self._db is None:
+            return
+        history = self.mean_durations()
+        rows = self._query("SELECT test, active FROM results WHERE run = ? AND status != 'not run' "
+                           "ORDER BY active DESC LIMIT ?", (self.run, limit))
+        for test, active in rows:
+            log(INFO, "History: %s took %.1f seconds (recent mean %.1f seconds)." % (test, active, history.get(test, active)))
+        for test, passes, fails in self.flaky():
+            log(INFO, "History: %s is flaky; %s passes and %s fails in recent runs." % (test, passes, fails))
+
+
+# The shared store which TestWithDependency records results to:
+HISTORY = ResultHistory()
@@ -1,15 +1,54 @@
 import time
+import Queue
+import atexit
+import threading
+from cStringIO import StringIO
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, NoSuchWindowException, WebDriverException
 from PIL import Image
 from .log import log, INFO, ERROR
+from .tracing import traced
 
 
 __all__ = ['new_tab', 'change_tab', 'assert_tab', 'close_tab', 'image_div',
-           'wait_for_xpath_element', 'wait_for_invisible_xpath', 'save_element_html',
-           'AssertTabError', 'NoWebDriverException']
+           'wait_for_xpath_element', 'wait_for_invisible_xpath', 'wait_for_alert', 'save_element_html',
+           'wait_for_ready', 'wait_for_angular', 'wait_for_stable', 'use_angular_waits',
+           'wait_for_images', 'AssertTabError', 'NoWebDriverException', 'SCRIPT_TIMEOUT']
+
+# Whether 'wait_for_stable' should wait for AngularJS or just sleep:
+_ANGULAR_WAITS = False
+# The longest in seconds one check for AngularJS stability may take, set on each
+# WebDriver when it is opened; 'wait_for_angular' checks again until its duration:
+SCRIPT_TIMEOUT = 2
+
+# Screenshots waiting to be cropped and saved by the image writer threads:
+_IMAGES = Queue.Queue()
+_IMAGE_WRITERS = []
+_IMAGE_LOCK = threading.Lock()
+# How many threads crop and save screenshots:
+_IMAGE_WRITER_COUNT = 2
+
+# Calls back once AngularJS has no outstanding $http requests or $timeouts and
+# is not mid-digest. Pages without AngularJS are stable once they have loaded.
+_ANGULAR_STABLE_JS = """
+    var callback = arguments[arguments.length - 1];
+    try {
+        var root = document.querySelector('[ng-app]') || document.documentElement;
+        var injector = window.angular && window.angular.element(root).injector();
+        if (!injector) {
+            callback(document.readyState === 'complete');
+            return;
+        }
+        injector.get('$browser').notifyWhenNoOutstandingRequests(function () {
+            callback(document.readyState === 'complete' && !injector.get('$rootScope').$$phase);
+        });
+    } catch (e) {
+        callback(false);
+    }
+"""
 
 
 class NoWebDriverException(Exception):
@@ -22,6 +61,18 @@ class AssertTabError(Exception):
     pass
 
 
+def _tab_registry(driver):
+    """Return the dict of {WindowHandle: LastKnownUrl} of the tabs of 'driver'.
+
+       Only the focused tab can navigate, so the url recorded for a tab when the
+       focus last left it stays correct until the focus returns to it.
+    """
+    if not hasattr(driver, "_tab_urls"):
+        driver._tab_urls = dict()
+    return driver._tab_urls
+
+
+@traced
 def new_tab(driver):
     """Open a new tab in the browser and switch to it.
 
@@ -31,6 +82,7 @@ def new_tab(driver):
           are supported.
     """
     if (driver.name.lower() == 'firefox') or (driver.name.lower() == 'chrome'):
+        _tab_registry(driver)[driver.current_window_handle] = driver.current_url
         old_handles = set(driver.window_handles)
         driver.find_element_by_xpath("//body").send_keys(Keys.CONTROL + 't')  # Sometimes this stops working.
         try:
@@ -43,6 +95,7 @@ def new_tab(driver):
             new_handles = set(driver.window_handles)
             new = new_handles.difference(old_handles).pop()  # If this breaks, nothing can be done anyway!
             driver.switch_to.window(new)
+        _tab_registry(driver)[new] = "about:blank"
         time.sleep(1)
     else:
         log(ERROR, "Unknown WebDriver type (%s); can't open a new tab!" % driver.name)
@@ -50,6 +103,7 @@ def new_tab(driver):
     log(INFO, "Opened new tab.")
 
 
+@traced
 def change_tab(driver):
     """Change tabs. Not guaranteed to move to the 'expected' next tab!
 
@@ -62,6 +116,7 @@ def change_tab(driver):
         handles = driver.window_handles
         if len(handles) > 1:
             current_handle = driver.current_window_handle
+            _tab_registry(driver)[current_handle] = driver.current_url
             pos = handles.index(current_handle) + 1
             pos = pos % len(handles)
             driver.switch_to.window(handles[pos])
@@ -70,12 +125,14 @@ def change_tab(driver):
                 driver.get_screenshot_as_base64()  # Awful hack to make current focused tab the one displayed!
             time.sleep(0.5)
         url = driver.current_url
+        _tab_registry(driver)[driver.current_window_handle] = url
     else:
         log(ERROR, "Unknown WebDriver type (%s); can't change tabs!" % driver.name)
         return
     log(INFO, "Changed tab to %s." % url)
 
 
+@traced
 def close_tab(driver):
     """Close the current tab. Not guaranteed to move the focus to 'expected' tab.
 
@@ -87,6 +144,7 @@ def close_tab(driver):
           are supported.
     """
     old_url = driver.current_url
+    _tab_registry(driver).pop(driver.current_window_handle, None)
     if driver.name.lower() == 'firefox':
         driver.close()
         driver.switch_to.window(driver.window_handles[0])
@@ -106,6 +164,7 @@ def close_tab(driver):
     log(INFO, "Closed tab %s. Now on %s" % (old_url, new_url))
 
 
+@traced
 def assert_tab(driver, url_part):
     """Ensure that the browser is focused on a specific tab. Requires unique urls for each tab!
 
@@ -122,6 +181,25 @@ def assert_tab(driver, url_part):
     if url_part in urls[0]:
         return
     else:
+        # Try switching straight to a tab last known to have the right url:
+        tabs = _tab_registry(driver)
+        tabs[driver.current_window_handle] = urls[0]
+        for handle, url in tabs.items():
+            if url_part not in url:
+                continue
+            try:
+                driver.switch_to.window(handle)
+            except NoSuchWindowException:
+                del tabs[handle]
+                continue
+            if driver.name.lower() == 'chrome':
+                driver.get_screenshot_as_base64()  # Awful hack to make current focused tab the one displayed!
+            current_url = driver.current_url
+            tabs[handle] = current_url
+            if url_part in current_url:
+                log(INFO, "AssertTab: Switched directly to tab %s." % current_url)
+                return
+        # Otherwise, fall back to trying each tab in turn:
         while not any(url_part in u for u in urls):
             change_tab(driver)
             time.sleep(1)
@@ -132,6 +210,7 @@ def assert_tab(driver, url_part):
             urls.append(current_url)
 
 
+@traced
 def wait_for_xpath_element(driver, element, duration=10, visible=True):
     """Wait for an element on the page to become visible.
 
@@ -151,6 +230,7 @@ def wait_for_xpath_element(driver, element, duration=10, visible=True):
         return WebDriverWait(driver, duration).until(EC.presence_of_element_located((By.XPATH, element)))
 
 
+@traced
 def wait_for_invisible_xpath(driver, element, duration=10):
     """Wait for an element on the page to become invisible.
 
@@ -164,6 +244,89 @@ def wait_for_invisible_xpath(driver, element, duration=10):
     return WebDriverWait(driver, duration).until(EC.invisibility_of_element_located((By.XPATH, element)))
 
 
+@traced
+def wait_for_alert(driver, duration=10):
+    """Wait for a JavaScript alert or confirm dialog to open.
+
+       Use instead of 'wait_for_stable' after a click which opens a dialog, since
+       running any script whilst it is open would dismiss it. Returns without
+       error after the duration if no dialog opens; then 'driver.switch_to.alert'
+       will raise the usual 'NoAlertPresentException'.
+        - 'driver' should be a Selenium WebDriver.
+        - 'duration' is the longest time in seconds to wait for the dialog.
+    """
+    try:
+        WebDriverWait(driver, duration).until(EC.alert_is_present())
+    except TimeoutException:
+        pass
+
+
+@traced
+def wait_for_ready(driver, duration=10):
+    """Wait for the page to finish loading, i.e. for 'document.readyState' to be 'complete'.
+
+       Will raise a 'TimeoutException' if this does not happen before the end of
+       the duration.
+        - 'driver' should be a Selenium WebDriver.
+        - 'duration' is how long to wait before raising a 'TimeoutException'.
+    """
+    return WebDriverWait(driver, duration, poll_frequency=0.1).until(
+        lambda d: d.execute_script("return document.readyState;") == "complete")
+
+
+@traced
+def wait_for_angular(driver, duration=10):
+    """Wait for the AngularJS app on the page to become stable.
+
+       Block until AngularJS reports no pending $http requests, no pending $timeout
+       work and no digest in progress; will raise a 'TimeoutException' if this does
+       not happen before the end of the duration. Pages without AngularJS are
+       considered stable once 'document.readyState' is 'complete'. Each check may
+       take up to the 'SCRIPT_TIMEOUT' of the WebDriver, so the wait may overrun
+       the duration by that much.
+        - 'driver' should be a Selenium WebDriver.
+        - 'duration' is how long to wait before raising a 'TimeoutException'.
+    """
+    return WebDriverWait(driver, duration, poll_frequency=0.1, ignored_exceptions=[TimeoutException]).until(
+        lambda d: d.execute_async_script(_ANGULAR_STABLE_JS))
+
+
+def use_angular_waits(enabled=True):
+    """Choose whether 'wait_for_stable' sleeps or waits for AngularJS.
+
+        - 'enabled' is a boolean flag; if 'True', 'wait_for_stable' will return
+          as soon as the page is stable rather than always sleeping.
+    """
+    global _ANGULAR_WAITS
+    _ANGULAR_WAITS = enabled
+    log(INFO, "Using %s waits for JavaScript." % ("AngularJS stability" if enabled else "fixed duration"))
+
+
+@traced
+def wait_for_stable(driver, wait_dur):
+    """Wait for JavaScript on the page to run/load; the replacement for 'time.sleep(WAIT_DUR)'.
+
+       By default this just sleeps for 'wait_dur'. If 'use_angular_waits()' has
+       been called, it instead returns as soon as 'wait_for_angular' reports the
+       page is stable, never waiting much longer than 'wait_dur' in total. If the
+       page unloads during the check, as when a click starts a navigation, it
+       sleeps for the rest of 'wait_dur' as before.
+        - 'driver' should be a Selenium WebDriver.
+        - 'wait_dur' is the time in seconds to wait for JavaScript to run/load.
+    """
+    if not _ANGULAR_WAITS:
+        time.sleep(wait_dur)
+        return
+    started = time.time()
+    try:
+        wait_for_angular(driver, wait_dur)
+    except TimeoutException:
+        log(INFO, "Page not stable after %s seconds; continuing anyway." % wait_dur)
+    except WebDriverException:
+        time.sleep(max(0, wait_dur - (time.time() - started)))
+
+
+@traced
 def save_element_html(element, fname):
     """Save the HTML of a WebDriver element to file.
 
@@ -179,11 +342,52 @@ def save_element_html(element, fname):
     log(INFO, "Saved element HTML as '%s'." % fname)
 
 
+def _write_images():
+    """Crop and save the screenshots put on '_IMAGES', until the program exits."""
+    while True:
+        png, box, fname = _IMAGES.get()
+        try:
+            if box is None:
+                with open(fname, "wb") as f:
+                    f.write(png)
+            else:
+                Image.open(StringIO(png)).crop(box).save(fname)
+            log(INFO, "Saved image '%s'." % fname)
+        except Exception, e:
+            log(ERROR, "Couldn't save image '%s'; %s: '%s'!" % (fname, type(e).__name__, e))
+        finally:
+            _IMAGES.task_done()
+
+
+def _start_image_writers():
+    """Start the threads saving screenshots, if they are not already running."""
+    with _IMAGE_LOCK:
+        while len(_IMAGE_WRITERS) < _IMAGE_WRITER_COUNT:
+            writer = threading.Thread(target=_write_images, name="ImageWriter-%s" % (len(_IMAGE_WRITERS) + 1))
+            writer.daemon = True
+            writer.start()
+            _IMAGE_WRITERS.append(writer)
+
+
+def wait_for_images():
+    """Wait until every screenshot taken by 'image_div(...)' has been saved.
+
+       Also run when the program exits, so that no image is lost.
+    """
+    _IMAGES.join()
+
+
+atexit.register(wait_for_images)
+
+
+@traced
 def image_div(driver, fname, div_element=None):
     """Save a png of the div element specified, or the whole page.
 
        Save an image of the whole page, unless a 'div_element' is specified, in
-       which case attempt to image it.
+       which case attempt to image it. Only the screenshot is taken on the calling
+       thread; it is cropped and saved in the background, so use
+       'wait_for_images()' to be sure the file has been written.
         - 'driver' should be a Selenium WebDriver.
         - 'fname' should be the string filename to save the png to, '.png' is
           automatically appended.
@@ -192,18 +396,16 @@ def image_div(driver, fname, div_element=None):
           height or width, save the whole screen.
     """
     fname += ".png"
-    driver.save_screenshot(fname)
-    if div_element is None:
-        log(INFO, "Saved image '%s'." % fname)
-        return
-    div_loc = div_element.location
-    div_size = div_element.size
-    l, t = int(div_loc['x']), int(div_loc['y'])
-    r, b = int(l + div_size['width']), int(t + div_size['height'] - 1)
-    if (l == r) or (t == b):
-        log(INFO, "Element had no size. Saving whole screen")
-        return
-    image = Image.open(fname)
-    image = image.crop((l, t, r, b))
-    image.save(fname)
-    log(INFO, "Saved image '%s'." % fname)
+    png = driver.get_screenshot_as_png()
+    box = None
+    if div_element is not None:
+        div_loc = div_element.location
+        div_size = div_element.size
+        l, t = int(div_loc['x']), int(div_loc['y'])
+        r, b = int(l + div_size['width']), int(t + div_size['height'] - 1)
+        if (l == r) or (t == b):
+            log(INFO, "Element had no size. Saving whole screen")
+        else:
+            box = (l, t, r, b)
+    _start_image_writers()
+    _IMAGES.put((png, box, fname))
@@ -1,14 +1,25 @@
 import selenium.webdriver
 import time
-from .log import log, INFO
-from .i_selenium import new_tab, NoWebDriverException
-from .isaac import TestUsers, User, is_live_site
+from selenium.common.exceptions import TimeoutException
+from .log import log, INFO, ERROR
+from .i_selenium import new_tab, wait_for_ready, wait_for_xpath_element, NoWebDriverException, SCRIPT_TIMEOUT
+from .instrumentation import instrument
+from .page_timing import time_pages
+from .tracing import trace_driver
+from .isaac import TestUsers, User, is_live_site, prewarm_isaac
 from ..emails.guerrillamail import GuerrillaInbox, set_guerrilla_mail_address
+from ..emails.smtp_inbox import SMTPInbox
+
+# The longest to wait for a page to be ready during start-up:
+_READY_TIMEOUT = 30
 
 
 def define_users():
     """Set up the TestUser object and add the temporary email address to it."""
     Users = TestUsers.load()
+    if getattr(Users, "Spare", None) is None:
+        log(ERROR, "No 'Spare' student in 'TestUsers.pickle'; the login throttle and role change tests will fail!")
+        Users.Spare = None
     Guerrilla = User("isaactest@sharklasers.com", "Temp",
                      "Test", "testing")
     Users.Guerrilla = Guerrilla
@@ -17,7 +28,46 @@ def define_users():
     return Users
 
 
-def start_selenium(Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, PATH_TO_DRIVER, skip_guerillamail=False):
+def _open_driver(PATH_TO_DRIVER, headless=False):
+    """Open and return a new Selenium WebDriver, of the type 'PATH_TO_DRIVER' is for.
+
+        - 'headless' is an optional flag to run the browser without a display.
+    """
+    if "chrome" in PATH_TO_DRIVER:
+        options = selenium.webdriver.ChromeOptions()
+        if headless:
+            options.add_argument("--headless")
+            options.add_argument("--window-size=1920,1080")
+        driver = selenium.webdriver.Chrome(executable_path=PATH_TO_DRIVER, chrome_options=options)
+    elif "gecko" in PATH_TO_DRIVER:
+        options = selenium.webdriver.FirefoxOptions()
+        if headless:
+            options.add_argument("-headless")
+        driver = selenium.webdriver.Firefox(executable_path=PATH_TO_DRIVER, firefox_options=options)
+    else:
+        raise NoWebDriverException
+    driver.set_script_timeout(SCRIPT_TIMEOUT)
+    return trace_driver(time_pages(instrument(driver)))
+
+
+def _wait_until_ready(driver, xpath=None):
+    """Wait for the page to load and, optionally, for an element to be on it.
+
+       Replaces sleeping for a fixed time during start-up. If the page is still not
+       ready after '_READY_TIMEOUT' seconds, carry on regardless as before.
+        - 'driver' should be a Selenium WebDriver.
+        - 'xpath' is the optional XPATH of an element to wait for.
+    """
+    try:
+        wait_for_ready(driver, _READY_TIMEOUT)
+        if xpath is not None:
+            wait_for_xpath_element(driver, xpath, _READY_TIMEOUT, visible=False)
+    except TimeoutException:
+        log(INFO, "Page '%s' not ready after %s seconds; continuing anyway." % (driver.current_url, _READY_TIMEOUT))
+
+
+def start_selenium(Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, PATH_TO_DRIVER, skip_guerillamail=False, smtp_port=None,
+                   separate_inbox=False, headless=False, prewarm=True):
     """Start the Selenium WebDriver of choice.
 
        Start a Selenium WebDriver then return it and a GuerrillaInbox object. If
@@ -31,38 +81,56 @@ def start_selenium(Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, PATH_TO_DRIVER, sk
         - 'PATH_TO_CHROMEDRIVER' is an optional argument telling Python where to
           look for the ChromeDriver executable. If not specified, Firefox will
           be used.
+        - 'skip_guerillamail' is an optional flag to not create an inbox at all.
+        - 'smtp_port' is an optional integer port; if specified, email is
+          received by a local SMTP server on this port using an SMTPInbox
+          instead of by opening GuerrillaMail in a new tab.
+        - 'separate_inbox' is an optional flag to give the inbox a WebDriver of
+          its own, rather than a tab of the Isaac WebDriver, so that the Isaac
+          tab is never left to read email. Call 'inbox.close()' to quit it.
+        - 'headless' is an optional flag to run the browsers without a display,
+          so that no X server (or virtual display) is needed.
+        - 'prewarm' is an optional flag to disable the questionnaire popup for
+          the whole session up front, using 'prewarm_isaac(...)'.
     """
     assert not is_live_site(ISAAC_WEB), "Cannot perform testing on live Isaac website!"
+    start = time.time()
     # Selenium Start-up:
-    if "chrome" in PATH_TO_DRIVER:
-        driver = selenium.webdriver.Chrome(executable_path=PATH_TO_DRIVER)
-    elif "gecko" in PATH_TO_DRIVER:
-        driver = selenium.webdriver.Firefox(executable_path=PATH_TO_DRIVER)
-    else:
-        raise NoWebDriverException
+    driver = _open_driver(PATH_TO_DRIVER, headless)
     driver.set_window_size(1920, 1080)
-    driver.maximize_window()
-    log(INFO, "Opened Selenium Driver for '%s'." % driver.name.title())
-    time.sleep(WAIT_DUR)
+    if not headless:
+        driver.maximize_window()
+    log(INFO, "Opened %sSelenium Driver for '%s'." % ("headless " if headless else "", driver.name.title()))
     # Navigate to Isaac:
     driver.get(ISAAC_WEB)
     log(INFO, "Got: %s" % ISAAC_WEB)
-    time.sleep(WAIT_DUR)
-    if not skip_guerillamail:
+    _wait_until_ready(driver)
+    if prewarm:
+        prewarm_isaac(driver, ISAAC_WEB)
+    if skip_guerillamail:
+        log(INFO, "Selenium started in %.1f seconds." % (time.time() - start))
+        return driver, None
+    if separate_inbox:
+        inbox_driver = _open_driver(PATH_TO_DRIVER, headless)
+        log(INFO, "Opened separate Selenium Driver for the inbox.")
+    else:
+        inbox_driver = driver
+    if smtp_port is not None:
+        # Receive email locally:
+        inbox = SMTPInbox(inbox_driver, Users.Guerrilla.email, port=smtp_port, own_driver=separate_inbox)
+        inbox.delete_emails()
+    else:
         # Open GuerrillaMail:
-        new_tab(driver)
-        time.sleep(WAIT_DUR)
-        driver.get(GUERRILLAMAIL)
+        if not separate_inbox:
+            new_tab(driver)
+        inbox_driver.get(GUERRILLAMAIL)
         log(INFO, "Got: %s" % GUERRILLAMAIL)
         # Set Guerrilla Mail email address:
-        time.sleep(WAIT_DUR)
-        Users.Guerrilla.email = set_guerrilla_mail_address(driver, Users.Guerrilla.email)
-        time.sleep(WAIT_DUR)
-        inbox = GuerrillaInbox(driver)
-        time.sleep(WAIT_DUR)
+        _wait_until_ready(inbox_driver, "//span[@id='inbox-id']")
+        Users.Guerrilla.email = set_guerrilla_mail_address(inbox_driver, Users.Guerrilla.email)
+        _wait_until_ready(inbox_driver, "//tr[contains(@class, 'mail_row')]")
+        inbox = GuerrillaInbox(inbox_driver, own_driver=separate_inbox)
         # Delete GuerrillaMail welcome and clear inbox:
         inbox.delete_emails()
-        time.sleep(WAIT_DUR)
-    else:
-        inbox = None
+    log(INFO, "Selenium started in %.1f seconds." % (time.time() - start))
     return driver, inbox
@@ -0,0 +1,208 @@
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from selenium.webdriver.support.wait import WebDriverWait
+from .log import log, current_test, INFO
+
+__all__ = ['CommandStats', 'COMMAND_STATS', 'use_instrumentation', 'instrument']
+
+_INSTRUMENT = False
+_CONTEXT = threading.local()
+_SLEEP = time.sleep
+_UNTIL = WebDriverWait.until
+_UNTIL_NOT = WebDriverWait.until_not
+
+# The name used for commands run outside of any test, i.e. during start-up:
+_NO_TEST = "(setup)"
+# The modules replacing 'time.sleep', whose frames are skipped to find the caller:
+_SLEEP_WRAPPERS = set([__name__, __name__.rsplit(".", 1)[0] + ".tracing"])
+# The package of the tests, whose lines are the call sites of sleeps in helpers:
+_TESTS = __name__.rsplit(".", 2)[0] + ".tests"
+# Call sites are shown relative to the directory containing 'isaactest':
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class CommandStats(object):
+    """Accounts for the time spent by each test on WebDriver commands, sleeps and waits.
+
+       For each test, '.tests' records an OrderedDict of {TestName: dict} where
+       the dict holds the number of each WebDriver command run ('commands'), the
+       total time spent on commands ('command_time'), in 'time.sleep' ('sleep_time')
+       and in 'WebDriverWait' waits ('wait_time'). Sleeps made by a wait count only
+       as wait time; commands made by a wait count as both. The time slept is
+       also recorded by where 'time.sleep' was called from in '.sites', a dict of
+       {"file:line (function)": dict}, where the line of the test is included for
+       sleeps within helpers. The dict holds the number of calls ('calls'), the
+       total time slept ('sleep_time') and the tests which slept there ('tests').
+       It is safe to share between threads.
+    """
+
+    def __init__(self):
+        self.tests = OrderedDict()
+        self.sites = dict()
+        self._lock = threading.Lock()
+
+    def _stats(self):
+        """Return the stats for the current test. Must hold the lock!"""
+        test = current_test() or _NO_TEST
+        if test not in self.tests:
+            self.tests[test] = dict(commands=dict(), command_time=0.0, sleep_time=0.0, wait_time=0.0)
+        return self.tests[test]
+
+    def add_command(self, command, duration):
+        """Record a WebDriver 'command' which took 'duration' seconds."""
+        with self._lock:
+            stats = self._stats()
+            stats["commands"][command] = stats["commands"].get(command, 0) + 1
+            stats["command_time"] += duration
+
+    def add_sleep(self, duration, site=None):
+        """Record a sleep of 'duration' seconds, optionally made at call 'site'."""
+        with self._lock:
+            self._stats()["sleep_time"] += duration
+            if site is not None:
+                if site not in self.sites:
+                    self.sites[site] = dict(calls=0, sleep_time=0.0, tests=set())
+                self.sites[site]["calls"] += 1
+                self.sites[site]["sleep_time"] += duration
+                self.sites[site]["tests"].add(current_test() or _NO_TEST)
+
+    def add_wait(self, duration):
+        """Record a wait of 'duration' seconds."""
+        with self._lock:
+            self._stats()["wait_time"] += duration
+
+    def report(self):
+        """Log a table of the commands, command time, sleep time and wait time of each test."""
+        if not self.tests:
+            return
+        log(INFO, "%s %8s %9s %9s %9s  %s" % ("Commands by test:".ljust(32), "commands", "command/s", "sleep/s", "wait/s", "most frequent"))
+        totals = sorted(self.tests.items(), key=lambda (t, s): s["command_time"] + s["sleep_time"] + s["wait_time"], reverse=True)
+        for test, stats in totals:
+            count = sum(stats["commands"].values())
+            frequent = sorted(stats["commands"].items(), key=lambda (c, n): n, reverse=True)[:3]
+            frequent = ", ".join(["%s x%s" % (c, n) for c, n in frequent])
+            log(INFO, "%s %8s %9.1f %9.1f %9.1f  %s" % (test.ljust(32), count, stats["command_time"],
+                                                         stats["sleep_time"], stats["wait_time"], frequent))
+
+    def sleep_report(self, durations=None, budget=None, limit=20):
+        """Log the call sites which slept longest, and the share of each test spent sleeping.
+
+            - 'durations' is an optional dict of {TestName: seconds} each test was
+              running for, to give the percentage of it spent asleep.
+            - 'budget' is an optional number of seconds each test may sleep for;
+              tests sleeping for longer are flagged.
+            - 'limit' is how many of the call sites to list.
+        """
+        if not self.sites:
+            return
+        durations = durations or dict()
+        total = sum([s["sleep_time"] for s in self.sites.values()])
+        log(INFO, "Slept for %.1f seconds in total; idle seconds by call site:" % total)
+        sites = sorted(self.sites.items(), key=lambda (c, s): s["sleep_time"], reverse=True)
+        for site, stats in sites[:limit]:
+            log(INFO, "%9.1f %6s calls  %s  (%s)" % (stats["sleep_time"], stats["calls"], site, ", ".join(sorted(stats["tests"]))))
+        log(INFO, "%s %9s %9s %7s" % ("Sleeping by test:".ljust(32), "sleep/s", "test/s", "asleep"))
+        tests = sorted(self.tests.items(), key=lambda (t, s): s["sleep_time"], reverse=True)
+        for test, stats in tests:
+            if not stats["sleep_time"]:
+                continue
+            duration = durations.get(test)
+            share = "%6.0f%%" % (100.0 * stats["sleep_time"] / duration) if duration else "%7s" % "-"
+            over = "  OVER BUDGET of %.1f seconds!" % budget if (budget is not None) and (stats["sleep_time"] > budget) else ""
+            log(INFO, "%s %9.1f %9s %s%s" % (test.ljust(32), stats["sleep_time"], "%.1f" % duration if duration else "-", share, over))
+
+
+COMMAND_STATS = CommandStats()
+
+
+def _waiting():
+    return getattr(_CONTEXT, "waiting", 0) > 0
+
+
+def _frame_site(frame):
+    """Return the line 'frame' is at, as "file:line (function)"."""
+    return "%s:%s (%s)" % (os.path.relpath(frame.f_code.co_filename, _ROOT), frame.f_lineno, frame.f_code.co_name)
+
+
+def _sleep_site():
+    """Return where the code sleeping called 'time.sleep' from, as "file:line (function)".
+
+       Most tests sleep through helpers such as 'wait_for_stable', so when the
+       sleep is not in a test itself, the line of the test which called the helper
+       is given too, as "test line via helper line".
+    """
+    frame = sys._getframe(2)
+    while (frame.f_back is not None) and (frame.f_globals.get("__name__") in _SLEEP_WRAPPERS):
+        frame = frame.f_back
+    site = _frame_site(frame)
+    caller = frame
+    while (caller is not None) and not caller.f_globals.get("__name__", "").startswith(_TESTS + "."):
+        caller = caller.f_back
+    if (caller is None) or (caller is frame):
+        return site
+    return "%s via %s" % (_frame_site(caller), site)
+
+
+def _sleep(seconds):
+    """A replacement for 'time.sleep' which records the time slept, and where from."""
+    start = time.time()
+    try:
+        _SLEEP(seconds)
+    finally:
+        if not _waiting():
+            COMMAND_STATS.add_sleep(time.time() - start, _sleep_site())
+
+
+def _timed_wait(until):
+    """Wrap a 'WebDriverWait' method to record the time spent waiting."""
+    def _until(self, *args, **kwargs):
+        _CONTEXT.waiting = getattr(_CONTEXT, "waiting", 0) + 1
+        start = time.time()
+        try:
+            return until(self, *args, **kwargs)
+        finally:
+            _CONTEXT.waiting -= 1
+            if not _waiting():
+                COMMAND_STATS.add_wait(time.time() - start)
+    return _until
+
+
+def use_instrumentation(enabled=True):
+    """Choose whether to account for WebDriver commands, sleeps and waits.
+
+       Must be called before 'start_selenium(...)' for its WebDrivers to be
+       instrumented. Sleeps and waits are counted by replacing 'time.sleep' and
+       the 'WebDriverWait' methods, which is undone by disabling it again.
+        - 'enabled' is a boolean flag; if 'True', record into 'COMMAND_STATS'.
+    """
+    global _INSTRUMENT
+    _INSTRUMENT = enabled
+    time.sleep = _sleep if enabled else _SLEEP
+    WebDriverWait.until = _timed_wait(_UNTIL) if enabled else _UNTIL
+    WebDriverWait.until_not = _timed_wait(_UNTIL_NOT) if enabled else _UNTIL_NOT
+    log(INFO, "WebDriver command instrumentation %s." % ("enabled" if enabled else "disabled"))
+
+
+def instrument(driver):
+    """Time every command sent by 'driver', if 'use_instrumentation()' was called.
+
+       All commands, including those of the elements it returns, go through the
+       'execute' method of the WebDriver; so only this needs wrapping. Returns
+       the driver.
+        - 'driver' should be a Selenium WebDriver.
+    """
+    if not _INSTRUMENT:
+        return driver
+    execute = driver.execute
+
+    def _execute(driver_command, params=None):
+        start = time.time()
+        try:
+            return execute(driver_command, params)
+        finally:
+            COMMAND_STATS.add_command(driver_command, time.time() - start)
+    driver.execute = _execute
+    return driver
@@ -1,17 +1,24 @@
 import time
 import re
 import datetime
+import threading
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from .i_selenium import wait_for_xpath_element, wait_for_invisible_xpath, image_div
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
+from .i_selenium import wait_for_xpath_element, wait_for_invisible_xpath, wait_for_stable, image_div
 from .log import log, INFO, ERROR
+from .tracing import traced
+from .rate_limit import ANSWER_RATE_LIMIT
 import pickle
 
 __all__ = ['User', 'TestUsers', 'kill_irritating_popup', 'disable_irritating_popup',
            'submit_login_form', 'assert_logged_in', 'assert_logged_out', 'sign_up_to_isaac',
-           'answer_numeric_q', 'answer_symbolic_q_text_entry', 'is_live_site']
+           'answer_numeric_q', 'answer_symbolic_q_text_entry', 'is_live_site',
+           'SessionCache', 'SESSIONS', 'login_as', 'logout_of_isaac', 'prewarm_isaac']
+
+# The cookie fields WebDriver will accept back when restoring a session:
+_COOKIE_FIELDS = ['name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry']
 
 
 class User():
@@ -35,18 +42,23 @@ class TestUsers():
        Also contains a 'load()' method to load a pickled form from file. Useful for
        encapsulating all the users in the hierarchy."""
 
-    def __init__(self, Student, Teacher, Editor, Event, Admin):
+    def __init__(self, Student, Teacher, Editor, Event, Admin, Spare=None):
         """Create using student, teacher, content editor, event manager and admin
-           User objects."""
+           User objects.
+
+           'Spare' is a second student User, for the tests which lock it out or
+           change its role; so that these can't disturb tests using 'Student',
+           which may then run at the same time on another machine."""
         self.Student = Student
         self.Teacher = Teacher
         self.Editor = Editor
         self.Event = Event
         self.Admin = Admin
+        self.Spare = Spare
 
     def __repr__(self):
         """Set Python's representation of the object to something useful."""
-        return "<User List: 'Student', 'Teacher', 'Editor', 'Event', 'Admin'>"
+        return "<User List: 'Student', 'Teacher', 'Editor', 'Event', 'Admin', 'Spare'>"
 
     @staticmethod
     def load():
@@ -57,6 +69,79 @@ class TestUsers():
         return Users
 
 
+class SessionCache(object):
+    """A class to remember logged in Isaac sessions, to avoid using the login form.
+
+       Sessions are keyed on the User objects from the TestUsers object. Once a
+       user is logged in, 'capture()' snapshots the cookies and the questionnaire
+       popup flag from local storage; 'restore()' later injects them into the
+       browser, which takes a single page load instead of a full login."""
+
+    def __init__(self):
+        """Create an empty cache; it is safe to share between threads."""
+        self._sessions = dict()
+        self._lock = threading.Lock()
+
+    def capture(self, driver, user):
+        """Save the session of the user currently logged in to the browser.
+
+            - 'driver' should be a Selenium WebDriver, on an Isaac page.
+            - 'user' is the User object that is logged in.
+        """
+        cookies = driver.get_cookies()
+        last_notification_time = driver.execute_script("return window.localStorage.getItem('lastNotificationTime');")
+        with self._lock:
+            self._sessions[user] = dict(email=user.email, cookies=cookies, last_notification_time=last_notification_time)
+        log(INFO, "Saved session for '%s'." % user.email)
+
+    def forget(self, user):
+        """Discard any saved session for the User object 'user'."""
+        with self._lock:
+            self._sessions.pop(user, None)
+
+    @traced
+    def restore(self, driver, ISAAC_WEB, user, url=None, wait_dur=2):
+        """Log in by injecting a saved session, returning 'True' if it worked.
+
+           Returns 'False' if there is no saved session for the user, or if the
+           saved session has expired; in which case it is discarded and the
+           browser is left logged out.
+            - 'driver' should be a Selenium WebDriver.
+            - 'ISAAC_WEB' is the string URL of the Isaac website to be tested.
+            - 'user' is the User object to log in as.
+            - 'url' is an optional URL to load once logged in; if not set, the
+              Isaac homepage is used.
+            - 'wait_dur' ensures JavaScript elements have time to react given different
+              browser speeds.
+        """
+        with self._lock:
+            session = self._sessions.get(user)
+        if (session is None) or (session['email'] != user.email):
+            return False
+        if not driver.current_url.startswith(ISAAC_WEB):
+            driver.get(ISAAC_WEB)
+        driver.delete_all_cookies()
+        for cookie in session['cookies']:
+            driver.add_cookie(dict([(k, v) for k, v in cookie.items() if k in _COOKIE_FIELDS]))
+        if session['last_notification_time'] is not None:
+            driver.execute_script("window.localStorage.setItem('lastNotificationTime', arguments[0]);",
+                                  session['last_notification_time'])
+        driver.get(url or ISAAC_WEB)
+        try:
+            assert_logged_in(driver, user, wait_dur=wait_dur)
+            log(INFO, "Restored saved session for '%s'." % user.email)
+            return True
+        except AssertionError:
+            log(INFO, "Saved session for '%s' has expired!" % user.email)
+            self.forget(user)
+            driver.delete_all_cookies()
+            return False
+
+
+# The session cache shared by all tests:
+SESSIONS = SessionCache()
+
+
 class MobileIsaac(object):
     """A context manager to help test Isaac in mobile mode.
 
@@ -120,13 +205,17 @@ def _date_parse(date):
         return datetime.datetime(*date)
 
 
+@traced
 def kill_irritating_popup(driver, wait_dur=60):
     """Wait for the annoying popup to popup and then close it.
 
-       If it hasn't appeared after one minute, continue with code.
+       If it hasn't appeared after one minute, continue with code. If the popup
+       is known to be disabled, return 'False' immediately.
          - 'driver' should be a Selenium WebDriver.
          - 'wait_dur' is the interger time to wait in seconds.
     """
+    if getattr(driver, "_popup_disabled", False):
+        return False  # It can't appear; don't wait for it.
     try:
         popup = WebDriverWait(driver, wait_dur).until(EC.visibility_of_element_located((By.XPATH, "//a[@class='close-reveal-modal']")))
         popup.click()
@@ -137,25 +226,99 @@ def kill_irritating_popup(driver, wait_dur=60):
         return False
 
 
+@traced
 def disable_irritating_popup(driver, undo=False):
     """Disable the questionnaire popup for the duration of the session.
 
        To prevent the popup from getting in the way of tests, set the local storage
-       flag requred to disable it.
+       flag requred to disable it. Does nothing if it is already disabled for
+       every new page by 'prewarm_isaac(...)'.
         - 'driver' should be a Selenium WebDriver.
         - 'undo' is a boolean flag to reset the disabling by pretending the last
           time the popup was seen was in 1970.
     """
+    if getattr(driver, "_popup_disabled", False) and not undo:
+        return
     if undo:
         epoch_time = 0  # Pretend last time shown was 1/1/1970 !
     else:
-        epoch_time = int((datetime.datetime.now() - datetime.datetime(1970, 1, 1)).total_seconds() * 1000)
-        one_month = 2592000000
-        epoch_time += one_month  # Pretend last time shown was one month in future!
+        epoch_time = _popup_snooze_time()
     driver.execute_script("window.localStorage.setItem('%s', %s);" % ("lastNotificationTime", epoch_time))
+    if undo:
+        driver._popup_disabled = False
     time.sleep(2)
 
 
+def _popup_snooze_time():
+    """Return a 'lastNotificationTime' one month in the future, in milliseconds."""
+    epoch_time = int((datetime.datetime.now() - datetime.datetime(1970, 1, 1)).total_seconds() * 1000)
+    one_month = 2592000000
+    return epoch_time + one_month  # Pretend last time shown was one month in future!
+
+
+# The first ChromeDriver with the endpoint for running DevTools commands:
+_CDP_CHROMEDRIVER = (75, 0)
+
+# Run before the scripts of every new page; disables the questionnaire popup on
+# Isaac unless a test has already set when it was last shown:
+_PREWARM_JS = """
+    if ((window.location.href.indexOf('%s') == 0) && (window.localStorage.getItem('lastNotificationTime') === null)) {
+        window.localStorage.setItem('lastNotificationTime', %s);
+    }
+"""
+
+
+def _run_on_new_documents(driver, source):
+    """Register the JavaScript 'source' to run on every new document, before any other script.
+
+       Uses a DevTools command, so only works on Chrome. Returns whether the script
+       was registered; older Selenium and ChromeDriver versions can't.
+        - 'driver' should be a Selenium WebDriver.
+    """
+    if driver.name.lower() != 'chrome':
+        return False
+    params = {"source": source}
+    try:
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", params)
+            return True
+        # Older Selenium has no method for it, but newer ChromeDriver has the endpoint:
+        version = driver.capabilities.get("chrome", {}).get("chromedriverVersion", "0").split(" ")[0]
+        version = tuple([int(v) for v in version.split(".")[:2] if v.isdigit()])
+        commands = getattr(driver.command_executor, "_commands", None)
+        if (version < _CDP_CHROMEDRIVER) or not isinstance(commands, dict):
+            return False
+        commands["executeCdpCommand"] = ("POST", "/session/$sessionId/goog/cdp/execute")
+        driver.execute("executeCdpCommand", {"cmd": "Page.addScriptToEvaluateOnNewDocument", "params": params})
+        return True
+    except WebDriverException:
+        return False
+
+
+@traced
+def prewarm_isaac(driver, ISAAC_WEB):
+    """Disable the questionnaire popup before Isaac pages load, for the whole session.
+
+       On Chrome a script is registered to run on every new document, before any
+       Isaac code; on all browsers the flag is also set now, so this should be
+       called whilst on an Isaac page. If the script was registered, afterwards
+       'disable_irritating_popup' and 'kill_irritating_popup' return immediately,
+       unless the popup is re-enabled with 'disable_irritating_popup(driver, undo=True)'.
+       Otherwise the flag is lost when logging out clears local storage, so they
+       still work as before.
+        - 'driver' should be a Selenium WebDriver.
+        - 'ISAAC_WEB' is the string URL of the Isaac website to be tested.
+    """
+    epoch_time = _popup_snooze_time()
+    driver.execute_script("window.localStorage.setItem('lastNotificationTime', %s);" % epoch_time)
+    if _run_on_new_documents(driver, _PREWARM_JS % (ISAAC_WEB, epoch_time)):
+        driver._popup_disabled = True
+        log(INFO, "Disabled the questionnaire popup for the session, on every new page.")
+    else:
+        log(INFO, "Browser can't run scripts on new pages; disabled the questionnaire popup until local storage is cleared.")
+
+
+@traced
 def snooze_email_verification(driver):
     """Snooze the email verification warning.
 
@@ -180,6 +343,7 @@ def snooze_email_verification(driver):
         return True
 
 
+@traced
 def submit_login_form(driver, username="", password="", user=None, disable_popup=True,
                       wait_dur=2, mobile=False):
     """Given that the browser is on the Isaac login page; fill in and submin the login form.
@@ -213,7 +377,7 @@ def submit_login_form(driver, username="", password="", user=None, disable_popup
         login = driver.find_element_by_xpath("(//input[@value='Log in'])[%s]" % i)
         login.click()
         log(INFO, "Submitted login form for '%s'." % username)
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
         if disable_popup:
             disable_irritating_popup(driver)
         try:
@@ -226,6 +390,80 @@ def submit_login_form(driver, username="", password="", user=None, disable_popup
         return False
 
 
+# Returns the email of the user logged in to the page, or "" if none is:
+_LOGGED_IN_JS = "var user = angular.element('head').scope().user; return (user && user._id) ? user.email : '';"
+
+
+def _logged_in_email(driver, ISAAC_WEB):
+    """Return the email of the user logged in to the Isaac page the browser is on.
+
+       Returns "" if no user is logged in, or 'None' if this can't be told without
+       loading a page (the browser is not on a settled Isaac page). Loads nothing.
+    """
+    if not driver.current_url.startswith(ISAAC_WEB):
+        return None
+    try:
+        return driver.execute_script(_LOGGED_IN_JS)
+    except WebDriverException:
+        return None
+
+
+@traced
+def logout_of_isaac(driver, ISAAC_WEB, wait_dur=2):
+    """Log out any logged in user, unless the browser is already logged out.
+
+       Only use this where the page the browser is left on does not matter, since
+       logging out goes to the homepage but skipping it stays on the current page.
+        - 'driver' should be a Selenium WebDriver.
+        - 'ISAAC_WEB' is the string URL of the Isaac website to be tested.
+        - 'wait_dur' ensures JavaScript elements have time to react given different
+          browser speeds.
+    """
+    if _logged_in_email(driver, ISAAC_WEB) == "":
+        log(INFO, "No user logged in; no need to log out.")
+        return
+    driver.get(ISAAC_WEB + "/logout")
+    log(INFO, "Logging out any logged in user.")
+    wait_for_stable(driver, wait_dur)
+
+
+@traced
+def login_as(driver, ISAAC_WEB, user, url=None, wait_dur=2, sessions=SESSIONS):
+    """Log a user in to Isaac, reusing their saved session if there is one.
+
+       Only use this where logging in is not itself being tested! If there is no
+       valid saved session, the browser's cookies are cleared and the login form
+       is used instead; the resulting session is saved for next time. If the user
+       is already logged in, only 'url' is loaded. Will return 'False' if the user
+       could not be logged in.
+        - 'driver' should be a Selenium WebDriver.
+        - 'ISAAC_WEB' is the string URL of the Isaac website to be tested.
+        - 'user' is the User object to log in as.
+        - 'url' is an optional URL to end up on once logged in. It must show the
+          login form when logged out. If not set, '/login' is used.
+        - 'wait_dur' ensures JavaScript elements have time to react given different
+          browser speeds.
+        - 'sessions' is the SessionCache to use, by default the shared 'SESSIONS'.
+    """
+    if _logged_in_email(driver, ISAAC_WEB) == user.email:
+        log(INFO, "Already logged in as '%s'." % user.email)
+        if url is not None:
+            driver.get(url)
+            wait_for_stable(driver, wait_dur)
+        return True
+    if sessions.restore(driver, ISAAC_WEB, user, url=url, wait_dur=wait_dur):
+        return True
+    if driver.current_url.startswith(ISAAC_WEB):
+        driver.delete_all_cookies()
+    driver.get(url or (ISAAC_WEB + "/login"))
+    wait_for_stable(driver, wait_dur)
+    if submit_login_form(driver, user=user, wait_dur=wait_dur):
+        sessions.capture(driver, user)
+        return True
+    return False
+
+
+@traced
 def assert_logged_in(driver, user=None, wait_dur=2):
     """Assert that a user is currently logged in to Isaac.
 
@@ -237,7 +475,7 @@ def assert_logged_in(driver, user=None, wait_dur=2):
         - 'wait_dur' ensures JavaScript elements have time to react given different
           browser speeds.
     """
-    time.sleep(wait_dur)
+    wait_for_stable(driver, wait_dur)
     u_email = str(driver.execute_script("return angular.element('head').scope().user.email;"))
     u_firstname = str(driver.execute_script("return angular.element('head').scope().user.givenName;"))
     u_id = str(driver.execute_script("return angular.element('head').scope().user._id;"))
@@ -257,6 +495,7 @@ def assert_logged_in(driver, user=None, wait_dur=2):
             raise AssertionError("AssertLoggedIn: Not logged in!")
 
 
+@traced
 def assert_logged_out(driver, wait_dur=2):
     """Assert that no user is logged in to Isaac.
 
@@ -265,7 +504,7 @@ def assert_logged_out(driver, wait_dur=2):
         - 'wait_dur' ensures JavaScript elements have time to react given different
           browser speeds.
     """
-    time.sleep(wait_dur)
+    wait_for_stable(driver, wait_dur)
     user_id = str(driver.execute_script("return angular.element('head').scope().user._id;"))
     if user_id == 'None':
         log(INFO, "AssertLoggedOut: All users are logged out.")
@@ -274,6 +513,7 @@ def assert_logged_out(driver, wait_dur=2):
         raise AssertionError("AssertLoggedOut: Not logged out!")
 
 
+@traced
 def sign_up_to_isaac(driver, username="", firstname="", lastname="", password="", date_of_birth=None,
                      user=None, suppress=False, wait_dur=2):
     """Sign a user up to Isaac.
@@ -313,7 +553,7 @@ def sign_up_to_isaac(driver, username="", firstname="", lastname="", password=""
         pwd.send_keys(password)
         sign_up = driver.find_element_by_xpath("(//a[@ui-sref='register'])[2]")
         sign_up.click()
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
         log(INFO, "Filled out login form to click Register.")
     except NoSuchElementException:
         log(ERROR, "No login/signup form to fill out!")
@@ -342,11 +582,11 @@ def sign_up_to_isaac(driver, username="", firstname="", lastname="", password=""
         # Always attempt to confirm age, although ought to do nothing if date_of_birth is set!
         confirm_age = driver.find_element_by_xpath("//div[contains(@class,'confirm-age')]/label")
         confirm_age.click()
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
         # Then submit form:
         submit_button = driver.find_element_by_xpath("//input[@value='Register Now']")
         submit_button.click()
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
         new_url = driver.current_url
         assert new_url != start_url, "Was on '%s', now still '%s'." % (start_url, new_url)
         log(INFO, "Registration form successfully submitted for '%s'." % username)
@@ -364,6 +604,7 @@ def sign_up_to_isaac(driver, username="", firstname="", lastname="", password=""
         return False
 
 
+@traced
 def open_accordion_section(driver, n):
     """Open the n-th accordion section on a page.
 
@@ -383,6 +624,7 @@ def open_accordion_section(driver, n):
     return accordion_title.find_element_by_xpath("./..")
 
 
+@traced
 def close_accordion_section(driver, n):
     """Close the n-th accordion section on a page.
 
@@ -401,6 +643,7 @@ def close_accordion_section(driver, n):
         log(INFO, "Accordion section %s already closed." % n)
 
 
+@traced
 def wait_accordion_open(driver, n, duration=5):
     """Wait for the n-th accordion section on a page to be open.
 
@@ -411,6 +654,7 @@ def wait_accordion_open(driver, n, duration=5):
     return wait_for_xpath_element(driver, "(//dd/a[@class='ru_accordion_titlebar']/../div)[%s]" % n, duration)
 
 
+@traced
 def wait_accordion_closed(driver, n, duration=5):
     """Wait for the n-th accordion section on a page to be closed.
 
@@ -421,11 +665,13 @@ def wait_accordion_closed(driver, n, duration=5):
     return wait_for_invisible_xpath(driver, "(//dd/a[@class='ru_accordion_titlebar']/../div)[%s]" % n, duration)
 
 
+@traced
 def answer_numeric_q(num_question, value, correct_unit, get_unit_wrong=False, wait_dur=2):
     """Submit an answer to a numeric question, given a value and units.
 
        Given a numeric question WebElement, enter an answer; optionally choosing an
-       incorrect unit for testing purposes if necessary.
+       incorrect unit for testing purposes if necessary. Waits for the answer rate
+       limit budget before submitting, if necessary.
         - 'num_question' should be the WebElement of the question, probably selected
           using '//div[@ng-switch-when='isaacNumericQuestion']' as the XPATH.
         - 'value' should be the numeric answer in string form.
@@ -434,16 +680,17 @@ def answer_numeric_q(num_question, value, correct_unit, get_unit_wrong=False, wa
         - 'wait_dur' ensures JavaScript elements have time to react given different
           browser speeds.
     """
+    driver = num_question.parent
     try:
         answer_box = num_question.find_element_by_xpath(".//input[@ng-model='ctrl.selectedValue']")
         answer_box.clear()
         answer_box.send_keys(value)
         log(INFO, "Entered value '%s'." % value)
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
         units_dropdown = num_question.find_element_by_xpath(".//button[@ng-click='ctrl.showUnitsDropdown()']")
         units_dropdown.click()
         log(INFO, "Clicked to open units dropdown.")
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
         if correct_unit == "None" and not get_unit_wrong:
             correct_u = num_question.find_element_by_xpath(".//a[contains(@ng-click,'ctrl.selectedUnits') and text()='None']")
             correct_u.click()
@@ -463,11 +710,11 @@ def answer_numeric_q(num_question, value, correct_unit, get_unit_wrong=False, wa
                 u_text = str(choices[n].find_element_by_xpath("./script").get_attribute('innerHTML'))
             choices[n].click()
             log(INFO, "Selected incorrect unit '%s'." % str(u_text.encode('ascii', 'replace')))
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
         left = int(num_question.find_element_by_xpath(".//ul[@class='f-dropdown']").value_of_css_property('left').replace('px', ''))
         assert left < 9000
         log(INFO, "Selected answer, both value and unit.")
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
     except NoSuchElementException:
         log(ERROR, "Can't find part of the answer fields; can't continue!")
         return False
@@ -479,19 +726,22 @@ def answer_numeric_q(num_question, value, correct_unit, get_unit_wrong=False, wa
         return False
     try:
         check_answer_button = num_question.find_element_by_xpath(".//button[text()='Check my answer']")
+        ANSWER_RATE_LIMIT.acquire()
         check_answer_button.click()
         log(INFO, "Clicked 'Check my answer'.")
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
         return True
     except NoSuchElementException:
         log(ERROR, "Couldn't click the 'Check my answer' button; can't continue!")
         return False
 
 
+@traced
 def answer_symbolic_q_text_entry(sym_question, value, wait_dur=2):
     """Submit an answer to a symbolic question, given a value.
 
-       Given a symbolic question WebElement, enter an answer;
+       Given a symbolic question WebElement, enter an answer; waiting for the answer
+       rate limit budget before submitting, if necessary.
         - 'sym_question' should be the WebElement of the question, probably selected
           using '//div[@ng-switch-when='isaacSymbolicQuestion']' as the XPATH.
         - 'value' should be the numeric answer in string form.
@@ -500,29 +750,32 @@ def answer_symbolic_q_text_entry(sym_question, value, wait_dur=2):
         - 'wait_dur' ensures JavaScript elements have time to react given different
           browser speeds.
     """
+    driver = sym_question.parent
     try:
         answer_box = sym_question.find_element_by_xpath(".//input[@ng-paste='textEdit()']")
         answer_box.clear()
         answer_box.send_keys("clear any old attempts")
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
         answer_box.clear()
         answer_box.send_keys(value)
         log(INFO, "Entered value '%s'." % value)
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
     except NoSuchElementException:
         log(ERROR, "Can't find the answer field; can't continue!")
         return False
     try:
         check_answer_button = sym_question.find_element_by_xpath(".//button[text()='Check my answer']")
+        ANSWER_RATE_LIMIT.acquire()
         check_answer_button.click()
         log(INFO, "Clicked 'Check my answer'.")
-        time.sleep(wait_dur)
+        wait_for_stable(driver, wait_dur)
         return True
     except NoSuchElementException:
         log(ERROR, "Couldn't click the 'Check my answer' button; can't continue!")
         return False
 
 
+@traced
 def clear_question_filter(driver, wait_dur=2):
     """Clear the filter to a blank state, with nothing selected.
 
@@ -538,7 +791,7 @@ def clear_question_filter(driver, wait_dur=2):
         items = driver.find_elements_by_xpath("(//*[local-name() = 'svg']//*[name()='path' and contains(@class,'enabled')])[1]")
         if len(items) > 0:
             items[0].click()
-            time.sleep(wait_dur)
+            wait_for_stable(driver, wait_dur)
         else:
             filter_blank = True
     log(INFO, "Set tag filter to blank state!")
@@ -547,9 +800,10 @@ def clear_question_filter(driver, wait_dur=2):
         selected_levels[0].click()
         selected_levels = driver.find_elements_by_xpath("(//div[@id='difficulty-hexagons'])[1]/a[@class='ru-diff-hex']/div[@class='diff-hex-selected']/..")
     log(INFO, "Set the level filter to blank state!")
-    time.sleep(wait_dur)
+    wait_for_stable(driver, wait_dur)
 
 
+@traced
 def set_filter_state(driver, tag_list, level_list, wait_dur=2):
     """Set the filter to the state specified in 'tag_list'.
 
@@ -568,7 +822,7 @@ def set_filter_state(driver, tag_list, level_list, wait_dur=2):
             data_item = driver.find_element_by_xpath("(//div[@id='hexfilter-text'])[1]//p[text()='%s']/../.." % button_name).get_attribute("data-item")
             filter_button = driver.find_element_by_xpath("(//*[local-name() = 'svg']//*[name()='path' and @data-item='%s'])[1]" % data_item)
             filter_button.click()
-            time.sleep(wait_dur)
+            wait_for_stable(driver, wait_dur)
         level_buttons = driver.find_elements_by_xpath("(//div[@id='difficulty-hexagons'])[1]/a[@class='ru-diff-hex']")
         assert len(level_buttons) == 6
         for l in level_list:
@@ -586,29 +840,93 @@ def set_filter_state(driver, tag_list, level_list, wait_dur=2):
         return False
 
 
+# Read the raw properties of many hexagon 'a' elements in one script call; a
+# hexagon missing any expected part is returned as null:
+_HEXAGON_PROPERTIES_JS = """
+    var hexagons = arguments[0] || document.querySelectorAll('a.ru-hex-home-content');
+    function child(hex, match) {
+        for (var i = 0; i < hex.children.length; i++) {
+            var c = hex.children[i];
+            if (c.tagName.toLowerCase() == 'div' && match(c.getAttribute('class') || '')) {
+                return c;
+            }
+        }
+        return null;
+    }
+    function svgPath(hex, cls) {
+        var paths = hex.querySelectorAll('svg path');
+        for (var i = 0; i < paths.length; i++) {
+            if ((paths[i].getAttribute('class') || '').indexOf(cls) != -1) {
+                return true;
+            }
+        }
+        return false;
+    }
+    var results = [];
+    for (var i = 0; i < hexagons.length; i++) {
+        var hex = hexagons[i];
+        if (child(hex, function(c) { return c == 'ru-hex-home-content-wild'; })) {
+            results.push({type: 'Wildcard'});
+            continue;
+        }
+        var level = child(hex, function(c) { return c.indexOf('ru-hex-level-') != -1; });
+        var topic = child(hex, function(c) { return c == 'ru-hex-home-title'; });
+        var field = child(hex, function(c) { return c.indexOf('ru-hex-home-field') != -1; });
+        var title = child(hex, function(c) { return c == 'ru-hex-home-desc'; });
+        if (!(level && topic && field && title)) {
+            results.push(null);
+            continue;
+        }
+        results.push({type: 'Question', level: level.getAttribute('class'), topic: topic.innerText,
+                      field: field.getAttribute('class'), title: title.innerText,
+                      physics: svgPath(hex, 'physics'), maths: svgPath(hex, 'maths')});
+    }
+    return results;
+"""
+
+
+@traced
+def get_all_hexagon_properties(driver, hexagon_elements=None):
+    """Return a list of dicts of properties for many hexagons, in one round trip.
+
+       The properties are as for 'get_hexagon_properties(...)', but are all read
+       by a single JavaScript call rather than several WebDriver calls per hexagon.
+       Any hexagon whose properties cannot be found is returned as None.
+        - 'driver' should be a Selenium WebDriver.
+        - 'hexagon_elements' is an optional list of WebElements for the 'a'
+          elements of the hexagons; if not specified, all hexagons on the page
+          are used, in page order.
+    """
+    properties = []
+    for h in driver.execute_script(_HEXAGON_PROPERTIES_JS, hexagon_elements):
+        if h is None:
+            log(ERROR, "Failed to find hexagon properties!")
+            properties.append(None)
+        elif h["type"] == "Wildcard":
+            properties.append(dict(type='Wildcard'))
+        else:
+            level = int(h["level"].replace('ru-hex-level-', ''))
+            topic = str(h["topic"].strip())
+            field = str(h["field"].replace('ru-hex-home-field', '').replace('-', '')).strip().title()
+            title = str(h["title"].strip())
+            if h["physics"]:
+                subject = "Physics"
+            elif h["maths"]:
+                subject = "Maths"
+            else:
+                subject = ""
+            properties.append(dict(type='Question', level=level, topic=topic, field=field, title=title, subject=subject))
+    return properties
+
+
+@traced
 def get_hexagon_properties(hexagon_element):
     """Given the WedDriver element for the hexagon, return a dict of properties.
 
        The element must be the 'a' element for the hexagon, otherwise the properties
        cannot be found. Any unknown or unset properties will be returned as the
-       empty string.
+       empty string. To get the properties of many hexagons, it is much faster
+       to use 'get_all_hexagon_properties(...)' once.
         - 'hexagon_element' should be a WebElement for the hexagon in question.
     """
-    if len(hexagon_element.find_elements_by_xpath("./div[@class='ru-hex-home-content-wild']")) > 0:
-        return dict(type='Wildcard')
-    try:
-        level = int(hexagon_element.find_element_by_xpath("./div[contains(@class, 'ru-hex-level-')]").get_attribute("class").replace('ru-hex-level-', ''))
-        topic = str(hexagon_element.find_element_by_xpath("./div[@class='ru-hex-home-title']").text)
-        field = str(hexagon_element.find_element_by_xpath("./div[contains(@class, 'ru-hex-home-field')]")
-                    .get_attribute("class").replace('ru-hex-home-field', '').replace('-', '')).strip().title()
-        title = str(hexagon_element.find_element_by_xpath("./div[@class='ru-hex-home-desc']").text)
-        if len(hexagon_element.find_elements_by_xpath(".//*[local-name() = 'svg']//*[name()='path' and contains(@class, 'physics')]")) > 0:
-            subject = "Physics"
-        elif len(hexagon_element.find_elements_by_xpath(".//*[local-name() = 'svg']//*[name()='path' and contains(@class, 'maths')]")) > 0:
-            subject = "Maths"
-        else:
-            subject = ""
-        return dict(type='Question', level=level, topic=topic, field=field, title=title, subject=subject)
-    except NoSuchElementException:
-        log(ERROR, "Failed to find hexagon properties!")
-        return None
+    return get_all_hexagon_properties(hexagon_element.parent, [hexagon_element])[0]
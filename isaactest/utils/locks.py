@@ -0,0 +1,64 @@
+import threading
+
+__all__ = ['ResourceLocks']
+
+
+class ResourceLocks(object):
+    """Tracks which tests hold which shared resources, as readers/writer locks.
+
+       A resource is named by a string, such as "user:Student" or "inbox". Any
+       number of tests may hold a resource shared, for instance to log in as a
+       user, but a test holding it exclusively, for instance to lock out or change
+       a user, may not run alongside any other test using it. Locks are never
+       waited for; 'try_acquire(...)' fails instead, so that the scheduler can run
+       something else. It is safe to share between threads.
+    """
+
+    def __init__(self):
+        self._exclusive = dict()
+        self._shared = dict()
+        self._held = dict()
+        self._lock = threading.Lock()
+
+    def _conflicts(self, exclusive, shared):
+        """Return the set of resources which can't be taken now. Must hold the lock!"""
+        blocked = set([r for r in exclusive if (r in self._exclusive) or self._shared.get(r)])
+        blocked |= set([r for r in shared if r in self._exclusive])
+        return blocked
+
+    def try_acquire(self, holder, exclusive=[], shared=[]):
+        """Take all the resources for 'holder' if they are free, and return whether they were.
+
+           Takes all or nothing. If 'holder' already holds its resources, succeeds.
+            - 'holder' is the name of the test taking the resources.
+            - 'exclusive' is a list of resources no other test may use meanwhile.
+            - 'shared' is a list of resources other tests may also hold shared.
+        """
+        shared = [r for r in shared if r not in exclusive]
+        with self._lock:
+            if holder in self._held:
+                return True
+            if self._conflicts(exclusive, shared):
+                return False
+            for r in exclusive:
+                self._exclusive[r] = holder
+            for r in shared:
+                self._shared.setdefault(r, set()).add(holder)
+            self._held[holder] = (list(exclusive), shared)
+            return True
+
+    def release(self, holder):
+        """Release all the resources held by 'holder'; does nothing if it holds none."""
+        with self._lock:
+            exclusive, shared = self._held.pop(holder, ([], []))
+            for r in exclusive:
+                del self._exclusive[r]
+            for r in shared:
+                self._shared[r].discard(holder)
+
+    def holders(self, resource):
+        """Return a list of the tests currently holding 'resource'."""
+        with self._lock:
+            if resource in self._exclusive:
+                return [self._exclusive[resource]]
+            return sorted(self._shared.get(resource, []))
@@ -1,56 +1,220 @@
+import os
+import sys
+import json
+import time
+import Queue
+import atexit
 import datetime
+import threading
 from ..emails.result_email import send_results
 
 
-__all__ = ['INFO', 'PASS', 'ERROR', 'log', 'start_testing', 'end_testing']
+__all__ = ['INFO', 'PASS', 'ERROR', 'SLOW', 'log', 'start_testing', 'end_testing', 'current_test',
+           'last_error', 'error_count']
 
 _LOGFILE = None
+_JSONFILE = None
 INFO = "INFO"
 PASS = "PASS"
 ERROR = "ERROR"
 TEST = "TEST"
+# The result of a test which passed, but took longer than its budget:
+SLOW = "SLOW"
 
 
 _errors = 0
+_LOCK = threading.Lock()
+_CONTEXT = threading.local()
+_LAST_ERRORS = dict()
+_QUEUE = Queue.Queue()
+_WRITER = None
+# Held to queue a record, so that none can be queued after the writer is stopped:
+_QUEUE_LOCK = threading.Lock()
+
+# The most log records to write to disk at once:
+_BATCH_SIZE = 500
 
 # Customise which log events are printed:
 _OUTPUT_LOGGING_LEVELS = [INFO, PASS, ERROR]
 
 
 def log(level, message):
-    """Log a message to stdout and to file. Not thread safe!
+    """Log a message to stdout and to file.
 
        Use to log messages; manages formatting and printing of only requested levels
-       of logging.
+       of logging. Messages logged from a worker thread are prefixed with the name
+       of the thread, so that the output of parallel tests can be told apart. The
+       message is only queued, with the test, step and worker logging it, for the
+       background writer started by 'start_testing()' to print and write to both
+       '_TEST_LOG.txt' and, as one JSON object per line, '_TEST_LOG.jsonl'. It is
+       safe to call from any thread.
         - 'level' should be one of the level constants from isaactest.utils.log
           either INFO or ERROR for user-written code.
         - 'message' is the string of the message to log.
     """
-    global _OUTPUT_LOGGING_LEVELS, ERROR, _tests_passed, _errors
-    if (level == ERROR):
-        _errors += 1
-    if level != TEST:
+    global _errors
+    now = time.time()
+    test = current_test()
+    if (level == ERROR) and (test is not None):
+        _LAST_ERRORS[test] = message
+    if level == ERROR:
+        with _LOCK:
+            _errors += 1
+    started = getattr(_CONTEXT, "started", None)
+    record = dict(time=now, level=level, message=message, test=test, step=getattr(_CONTEXT, "step", None),
+                  elapsed_ms=int((now - started) * 1000) if started is not None else None,
+                  worker=threading.current_thread().name, pid=os.getpid())
+    with _QUEUE_LOCK:
+        if _WRITER is not None:
+            _QUEUE.put(record)
+            return
+    _write_safely([record])
+
+
+def _render(record):
+    """Return the line of a log 'record' in the human readable format of '_TEST_LOG.txt'."""
+    message = record["message"]
+    if record["worker"] != "MainThread":
+        message = "(%s) %s" % (record["worker"], message)
+    if record["level"] != TEST:
         message = " - " + message
-    if (level in _OUTPUT_LOGGING_LEVELS) or (level == TEST):
-        log_time = "[%s]" % datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        level = "[%s]" % level.ljust(5)
-        log_item = "%s %s\t%s" % (log_time, level, message)
-        print log_item
-        _LOGFILE.write(log_item + "\n")
-        _LOGFILE.flush()
+    log_time = "[%s]" % datetime.datetime.fromtimestamp(record["time"]).strftime("%Y-%m-%d %H:%M:%S")
+    return "%s %s\t%s" % (log_time, "[%s]" % record["level"].ljust(5), message)
+
+
+def _write_records(records):
+    """Print and write a batch of log 'records', flushing the logfiles once.
+
+       Every record is formatted before anything is written, so that a record
+       which can't be formatted raises before any of the batch is written.
+    """
+    lines = [_render(r) for r in records if (r["level"] in _OUTPUT_LOGGING_LEVELS) or (r["level"] == TEST)]
+    text = "".join([line + "\n" for line in lines])
+    if isinstance(text, unicode):
+        text = text.encode("utf-8")
+    json_text = "".join([json.dumps(r) + "\n" for r in records])
+    with _LOCK:
+        if text:
+            sys.stdout.write(text)
+        # Each batch is one append, so processes sharing the files don't interleave lines:
+        if (_LOGFILE is not None) and text:
+            _LOGFILE.write(text)
+            _LOGFILE.flush()
+        if _JSONFILE is not None:
+            _JSONFILE.write(json_text)
+            _JSONFILE.flush()
+
+
+def _ascii_record(record):
+    """Return a copy of log 'record' with every string made ASCII, escaping anything else."""
+    safe = dict()
+    for key, value in record.items():
+        if isinstance(value, str):
+            value = value.decode("utf-8", "replace")
+        if isinstance(value, unicode):
+            value = value.encode("ascii", "backslashreplace")
+        safe[key] = value
+    return safe
+
+
+def _write_safely(records):
+    """Write log 'records' as '_write_records(...)' does, but never raise.
+
+       If the batch can't be written, each record is written on its own, and any
+       which still can't be are made ASCII first; so one bad record loses no others.
+    """
+    try:
+        _write_records(records)
+        return
+    except Exception:
+        pass
+    for record in records:
+        try:
+            try:
+                _write_records([record])
+            except (UnicodeError, TypeError, ValueError):
+                _write_records([_ascii_record(record)])
+        except Exception, e:
+            sys.stderr.write("Couldn't write log record; %s: '%s'!\n" % (type(e).__name__, e))
+
+
+def _write_queue():
+    """Write queued log records in batches until the 'None' marking the end is taken."""
+    while True:
+        records = [_QUEUE.get()]
+        while (len(records) < _BATCH_SIZE) and (records[-1] is not None):
+            try:
+                records.append(_QUEUE.get_nowait())
+            except Queue.Empty:
+                break
+        _write_safely([r for r in records if r is not None])
+        if records[-1] is None:
+            return
+
+
+def _start_writer():
+    """Start the background thread writing the log."""
+    global _WRITER
+    _WRITER = threading.Thread(target=_write_queue, name="LogWriter")
+    _WRITER.daemon = True
+    _WRITER.start()
+
+
+def _stop_writer():
+    """Write everything still queued and stop the background thread; later records are written directly."""
+    global _WRITER
+    writer = _WRITER
+    if writer is None:
+        return
+    with _QUEUE_LOCK:
+        _WRITER = None
+        _QUEUE.put(None)
+    writer.join()
+
+
+atexit.register(_stop_writer)
+
+
+def set_current_test(name, step=None):
+    """Record the name of the test now running in this thread; 'None' once it ends.
+
+        - 'step' is an optional number of the part of the test now running; 1 for
+          the test itself and 2 onwards for any continuations of it.
+    """
+    _CONTEXT.test = name
+    _CONTEXT.step = step
+    _CONTEXT.started = time.time() if name is not None else None
+
+
+def current_test():
+    """Return the name of the test running in this thread, or 'None' between tests."""
+    return getattr(_CONTEXT, "test", None)
+
+
+def last_error(name):
+    """Return the last error message logged whilst test 'name' was running, or 'None'."""
+    return _LAST_ERRORS.get(name)
+
+
+def error_count():
+    """Return the number of errors logged so far."""
+    return _errors
 
 
-def _generate_summary(Results, aborted):
+def _generate_summary(Results, aborted, errors=None):
     """When testing has finished, return a string of the results in a nice format."""
-    passes = len([v for v in Results.values() if v])
+    if errors is None:
+        errors = _errors
+    passes = len([v for v in Results.values() if v is True])
+    slow = len([v for v in Results.values() if v == SLOW])
     fails = len([v for v in Results.values() if v is False])
     total = len(Results)
     if not aborted:
-        summary = "Testing Finished. %s of %s passed. %s failed, %s errors!\n" % (passes, total, fails, _errors)
+        summary = "Testing Finished. %s of %s passed. %s slow, %s failed, %s errors!\n" % (passes, total, slow, fails, errors)
     else:
-        summary = "Testing Failed. %s of %s passed. %s failed, %s errors, 1 fatal!\n" % (passes, total, fails, _errors)
+        summary = "Testing Failed. %s of %s passed. %s slow, %s failed, %s errors, 1 fatal!\n" % (passes, total, slow, fails, errors)
     for k in Results:
-        status = {True: "Pass", False: "Failed", None: "Not Run"}[Results[k]]
+        status = {True: "Pass", SLOW: "Slow", False: "Failed", None: "Not Run"}[Results[k]]
         summary += " - %s: %s\n" % (k.ljust(32), status)
     return summary
 
@@ -58,28 +222,37 @@ def _generate_summary(Results, aborted):
 def start_testing():
     """Run before tests start!
 
-       Opens the logfile and records the time at which the test started.
+       Opens the logfiles, starts the background writer and records the time at
+       which the test started.
     """
-    global _LOGFILE
+    global _LOGFILE, _JSONFILE
     log_time = "[%s]" % datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     print "%s \t Starting Regression Testing." % log_time
     _LOGFILE = open("_TEST_LOG.txt", "a")
     _LOGFILE.write("%s \t Starting Regression Testing.\n" % log_time)
+    _JSONFILE = open("_TEST_LOG.jsonl", "a")
+    _start_writer()
 
 
-def end_testing(Results, email=True, aborted=False):
+def end_testing(Results, email=True, aborted=False, errors=None):
     """Run when testing finishes.
 
        Closes the logfile, records the time testing finishes, manages the displaying
        of the results of the tests and sends the emails out.
         - 'Results' should be an OrderedDict of {TestName: bool} pairs.
+        - 'errors' is an optional number of errors to report instead of the number
+          logged, for instance when combining the results of several shards.
     """
-    global _LOGFILE, _tests_passed, _errors
+    global _LOGFILE, _JSONFILE
+    _stop_writer()
     now = datetime.datetime.now()
     log_time = "[%s]" % now.strftime("%Y-%m-%d %H:%M:%S")
-    summary = _generate_summary(Results, aborted)
+    summary = _generate_summary(Results, aborted, errors)
     print ("%s \t " % log_time) + summary
     _LOGFILE.write(("%s \t " % log_time) + summary + "\n")
     _LOGFILE.close()
+    _LOGFILE = None
+    _JSONFILE.close()
+    _JSONFILE = None
     if email:
         send_results(now.strftime("%d/%m/%Y at %H:%M"), summary)
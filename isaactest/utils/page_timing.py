@@ -0,0 +1,206 @@
+import re
+import time
+import urlparse
+import threading
+from contextlib import contextmanager
+from selenium.webdriver.remote.command import Command
+from selenium.common.exceptions import TimeoutException, WebDriverException, NoAlertPresentException
+from .log import log, current_test, INFO
+from .history import HISTORY
+from .i_selenium import wait_for_angular
+
+__all__ = ['use_page_timing', 'time_pages', 'page_pattern', 'time_action', 'over_budget', 'PAGE_BUDGETS']
+
+_TIME_PAGES = False
+_LOCK = threading.Lock()
+# The (page, kind, seconds until ready) of the pages visited by each running test:
+_VISITS = dict()
+
+# The most seconds each page may take to become ready, by 'page_pattern(...)' or
+# the name given to 'time_action(...)'. A test may override these with budgets of
+# its own; see 'TestWithDependency'.
+PAGE_BUDGETS = {
+    "/admin/stats": 4.0,
+    "/admin/usermanager": 4.0,
+    "/gameboards": 3.0,
+    "/concepts": 3.0,
+    "/questions/_regression_test_": 3.0,
+}
+
+# The longest to wait for a page to become stable before recording it anyway:
+_READY_TIMEOUT = 10
+# The commands which may leave the browser on a different page:
+_NAVIGATIONS = set([Command.GET, Command.CLICK_ELEMENT, Command.SUBMIT_ELEMENT])
+# Path segments which are IDs (numbers, hex strings or UUIDs) rather than pages:
+_ID = re.compile(r"^([0-9]+|[0-9a-fA-F-]{12,})$")
+
+# Returns which document and URL the browser is on:
+_LOCATION_JS = "return [window.location.href, window.performance.timing.navigationStart];"
+
+# Returns the timings of the page, in milliseconds. For a page loaded from scratch
+# these are from the Navigation Timing API, and 'ready' is when AngularJS became
+# stable. For a route change within the app, only the resources fetched in the
+# 'arguments[0]' milliseconds since the navigation are counted.
+_TIMINGS_JS = """
+    var performance = window.performance;
+    var timing = performance.timing;
+    var now = performance.now();
+    var since = arguments[0] === null ? 0 : now - arguments[0];
+    var resources = performance.getEntriesByType('resource').filter(function (r) { return r.startTime >= since; });
+    return {ready: now, ttfb: timing.responseStart - timing.navigationStart,
+            dom_ready: timing.domContentLoadedEventEnd - timing.navigationStart,
+            load: timing.loadEventEnd - timing.navigationStart, resources: resources.length,
+            resource_time: resources.reduce(function (t, r) { return Math.max(t, r.responseEnd - since); }, 0)};
+"""
+
+
+def page_pattern(url):
+    """Return the page 'url' is of, as its path with any query string and IDs removed.
+
+       So that the timings of one page are grouped together, path segments which
+       are IDs are replaced by '*', and any query string or fragment is removed;
+       but for the hash routes of Isaac the fragment is the path.
+        - 'url' is the string URL of the page.
+    """
+    parts = urlparse.urlsplit(url)
+    path = parts.path
+    if parts.fragment.startswith("/") or parts.fragment.startswith("!/"):
+        path = parts.fragment.lstrip("!").split("?")[0]
+    segments = ["*" if _ID.match(s) else s for s in path.rstrip("/").split("/")]
+    return "/".join(segments) or "/"
+
+
+def use_page_timing(enabled=True):
+    """Choose whether to record how long each page the tests visit takes.
+
+       Must be called before 'start_selenium(...)' for its WebDrivers to be timed.
+       Each navigation then waits for the page to become stable before the test
+       continues, which the tests mostly do anyway.
+        - 'enabled' is a boolean flag; if 'True', record timings into 'HISTORY'.
+    """
+    global _TIME_PAGES
+    _TIME_PAGES = enabled
+    log(INFO, "Page performance timing %s." % ("enabled" if enabled else "disabled"))
+
+
+def _record_page(driver, kind, started):
+    """Wait for the page 'driver' is on to become stable, then record its timings.
+
+        - 'kind' is "load" for a document loaded from scratch, or "route" for a
+          navigation within the AngularJS app.
+        - 'started' is the time, as from 'time.time()', the navigation started.
+    """
+    try:
+        wait_for_angular(driver, _READY_TIMEOUT)
+    except TimeoutException:
+        log(INFO, "Page '%s' not stable after %s seconds; timing it anyway." % (driver.current_url, _READY_TIMEOUT))
+    elapsed = None if kind == "load" else (time.time() - started) * 1000.0
+    timings = driver.execute_script(_TIMINGS_JS, elapsed)
+    if kind == "route":
+        timings.update(ready=elapsed, ttfb=None, dom_ready=None, load=None)
+    _record_visit(page_pattern(driver.current_url), kind, timings)
+
+
+def _record_visit(page, kind, timings):
+    """Record the 'timings' of a visit to 'page' by the current test, for reporting and budgets.
+
+       Visits made outside any test, such as during start-up, are only reported;
+       there is no test to check them against a budget.
+    """
+    test = current_test()
+    if test is not None:
+        with _LOCK:
+            _VISITS.setdefault(test, []).append((page, kind, timings["ready"] / 1000.0))
+    HISTORY.record_page(test, page, kind, timings["ready"], timings["ttfb"], timings["dom_ready"],
+                        timings["load"], timings["resources"], timings["resource_time"])
+
+
+@contextmanager
+def time_action(driver, name):
+    """Record how long the page takes to become ready after the actions in a 'with' block.
+
+       For interactions which are not navigations, such as typing a search, so
+       that they can be given a budget like a page. Does nothing unless
+       'use_page_timing()' was called.
+        - 'driver' should be a Selenium WebDriver.
+        - 'name' is the string name to record the timing under, for instance
+          "/game_builder search".
+    """
+    if not _TIME_PAGES:
+        yield
+        return
+    started = time.time()
+    yield
+    try:
+        wait_for_angular(driver, _READY_TIMEOUT)
+    except TimeoutException:
+        log(INFO, "Page not stable %s seconds after '%s'; timing it anyway." % (_READY_TIMEOUT, name))
+    elapsed = (time.time() - started) * 1000.0
+    _record_visit(name, "action", dict(ready=elapsed, ttfb=None, dom_ready=None, load=None, resources=0, resource_time=0.0))
+
+
+def over_budget(test, budgets=None):
+    """Return a list of (page, seconds, budget) of the visits of 'test' which were slower than budgeted.
+
+       Forgets the visits of the test, so should be called once it has finished.
+        - 'test' is the uppercase name of the test.
+        - 'budgets' is an optional dict of {page: seconds} which override those
+          of 'PAGE_BUDGETS' for this test.
+    """
+    limits = dict(PAGE_BUDGETS)
+    limits.update(budgets or dict())
+    with _LOCK:
+        visits = _VISITS.pop(test, [])
+    return [(page, ready, limits[page]) for page, kind, ready in visits if (page in limits) and (ready > limits[page])]
+
+
+def _alert_open(driver):
+    """Return whether a JavaScript alert or confirm dialog is open on 'driver'.
+
+       Running a script whilst a dialog is open dismisses it, so nothing may be
+       timed until the test has dealt with it.
+    """
+    try:
+        driver.switch_to.alert.text
+        return True
+    except NoAlertPresentException:
+        return False
+
+
+def time_pages(driver):
+    """Record the timings of every page 'driver' navigates to, if 'use_page_timing()' was called.
+
+       After each 'get', click or form submission which changes the URL or loads
+       a new document, the Navigation and Resource Timing of the page and how long
+       AngularJS took to become stable are recorded by 'HISTORY.record_page(...)'.
+       Clicks which open a dialog are not timed, since no script can run until
+       the test has accepted or dismissed it. As for 'instrument(...)', only the
+       'execute' method of the WebDriver needs wrapping. Returns the driver.
+        - 'driver' should be a Selenium WebDriver.
+    """
+    if not _TIME_PAGES:
+        return driver
+    execute = driver.execute
+    # The last URL of each document seen, by its navigation start time; keeping
+    # each document means that switching between tabs is not a navigation:
+    documents = dict()
+
+    def _execute(driver_command, params=None):
+        if driver_command not in _NAVIGATIONS:
+            return execute(driver_command, params)
+        started = time.time()
+        response = execute(driver_command, params)
+        try:
+            if _alert_open(driver):
+                return response
+            url, document = driver.execute_script(_LOCATION_JS)
+            if document not in documents:
+                _record_page(driver, "load", started)
+            elif (driver_command == Command.GET) or (url != documents[document]):
+                _record_page(driver, "route", started)
+            documents[document] = url
+        except WebDriverException:
+            pass  # The page was unloading or is not HTML; there is nothing to time.
+        return response
+    driver.execute = _execute
+    return driver
@@ -0,0 +1,95 @@
+import time
+import threading
+from collections import OrderedDict
+from .log import log, current_test, INFO
+
+__all__ = ['TokenBucket', 'RATE_LIMITS', 'ANSWER_RATE_LIMIT', 'configure_answer_rate_limit']
+
+# Every TokenBucket by its name, for tests to declare which they use:
+RATE_LIMITS = dict()
+
+
+class TokenBucket(object):
+    """A token bucket model of a server side rate limit.
+
+       The bucket holds up to 'capacity' tokens and gains one token every
+       'refill_period' seconds. Taking a token when the bucket is empty blocks
+       until one is available, so requests are only delayed when the budget is
+       actually exhausted. The time each test spends blocked is recorded in
+       '.blocked', an OrderedDict of {TestName: seconds}. It is safe to share a
+       bucket between threads. Buckets are kept in 'RATE_LIMITS' by name, so that
+       tests can declare the rate limits they use and be run only once a token is
+       available; see 'TestWithDependency'.
+    """
+
+    def __init__(self, name, capacity, refill_period):
+        """Create a full bucket.
+
+            - 'name' is a string describing the rate limit, used for logging.
+            - 'capacity' is the integer maximum number of requests in a burst.
+            - 'refill_period' is the time in seconds to regain one request.
+        """
+        self.name = name
+        self.blocked = OrderedDict()
+        self._lock = threading.Lock()
+        self.configure(capacity, refill_period)
+        RATE_LIMITS[name] = self
+
+    def configure(self, capacity, refill_period):
+        """Change the size and refill rate of the bucket, and refill it."""
+        with self._lock:
+            self.capacity = capacity
+            self.refill_period = float(refill_period)
+            self._tokens = float(capacity)
+            self._updated = time.time()
+
+    def _refill(self):
+        """Add any tokens gained since last updated. Must hold the lock!"""
+        now = time.time()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) / self.refill_period)
+        self._updated = now
+
+    def wait_time(self):
+        """Return the time in seconds until a token will be available."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (1 - self._tokens) * self.refill_period)
+
+    def acquire(self):
+        """Take a token from the bucket, first waiting for one if necessary.
+
+           Returns the time in seconds spent waiting.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1  # Reserve a token now, so other threads queue behind this one.
+            wait = max(0.0, -self._tokens * self.refill_period)
+        if wait > 0:
+            test = current_test()
+            log(INFO, "Rate limit '%s' exhausted: waiting %.1f seconds." % (self.name, wait))
+            time.sleep(wait)
+            with self._lock:
+                self.blocked[test] = self.blocked.get(test, 0) + wait
+        return wait
+
+    def report(self):
+        """Log the time each test spent blocked by this rate limit."""
+        total = sum(self.blocked.values())
+        log(INFO, "Rate limit '%s': blocked for %.1f seconds in total." % (self.name, total))
+        for test, wait in self.blocked.items():
+            log(INFO, "Rate limit '%s': %s blocked for %.1f seconds." % (self.name, test, wait))
+
+
+# Isaac limits how often answers can be submitted. By default allow one answer a
+# minute, as the tests always waited for before; raise the burst with care:
+ANSWER_RATE_LIMIT = TokenBucket("answers", capacity=1, refill_period=60)
+
+
+def configure_answer_rate_limit(capacity, refill_period):
+    """Set the parameters of the shared answer submission rate limit.
+
+        - 'capacity' is the integer maximum number of answers in a burst.
+        - 'refill_period' is the time in seconds to regain one answer.
+    """
+    ANSWER_RATE_LIMIT.configure(capacity, refill_period)
+    log(INFO, "Answer rate limit: bursts of %s, then one every %s seconds." % (capacity, refill_period))
@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from .log import log, INFO
+
+__all__ = ['Tracer', 'TRACER', 'use_tracing', 'traced', 'trace_driver']
+
+
+def _monotonic_clock():
+    """Return a function giving the seconds from a monotonic clock, or 'time.time' if there is none.
+
+       Python 2 has no 'time.monotonic', so use 'clock_gettime' from the C library
+       where it can be found (i.e. on Linux).
+    """
+    try:
+        import ctypes
+        import ctypes.util
+
+        class _Timespec(ctypes.Structure):
+            _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+        library = ctypes.CDLL(ctypes.util.find_library("rt") or "libc.so.6")
+        clock_gettime = library.clock_gettime
+        clock_monotonic = 1
+
+        def _monotonic():
+            timespec = _Timespec()
+            if clock_gettime(clock_monotonic, ctypes.byref(timespec)) != 0:
+                raise OSError("clock_gettime failed")
+            return timespec.tv_sec + timespec.tv_nsec * 1e-9
+        _monotonic()
+        return _monotonic
+    except Exception:
+        return time.time
+
+
+_CLOCK = _monotonic_clock()
+_SLEEP = time.sleep
+
+
+class Tracer(object):
+    """Records nested timing spans, to save as a Chrome Trace Event file.
+
+       Each span is a 'complete' event with the time it started and its duration
+       in microseconds, on the thread which ran it; so spans started within others
+       on the same thread are shown nested inside them. Open the saved file in
+       chrome://tracing or https://ui.perfetto.dev to see them. Until 'enabled',
+       spans are not recorded. It is safe to share between threads.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._threads = dict()
+        self._lock = threading.Lock()
+
+    def _add(self, name, category, start, end, args=None):
+        thread = threading.current_thread()
+        event = dict(name=name, cat=category, ph="X", ts=int(start * 1e6), dur=int((end - start) * 1e6),
+                     pid=os.getpid(), tid=thread.ident)
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._threads[thread.ident] = thread.name
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category, args=None):
+        """Record the time spent in a 'with' block as a span.
+
+            - 'name' is the string name of the span, e.g. the test or function name.
+            - 'category' is a string type of span, e.g. "test" or "command".
+            - 'args' is an optional dict of details to show with the span.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = _CLOCK()
+        try:
+            yield
+        finally:
+            self._add(name, category, start, _CLOCK(), args)
+
+    def save(self, path):
+        """Write the spans recorded so far to the Chrome Trace Event file 'path'."""
+        with self._lock:
+            names = [dict(name="thread_name", ph="M", pid=os.getpid(), tid=tid, args=dict(name=name))
+                     for tid, name in self._threads.items()]
+            trace = dict(traceEvents=names + list(self.events), displayTimeUnit="ms")
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        log(INFO, "Saved %s trace spans as '%s'." % (len(trace["traceEvents"]) - len(names), path))
+
+
+TRACER = Tracer()
+
+
+def _traced_sleep(seconds):
+    """A replacement for 'time.sleep' which records the sleep as a span."""
+    with TRACER.span("sleep", "sleep", dict(seconds=seconds)):
+        _SLEEP(seconds)
+
+
+def use_tracing(enabled=True):
+    """Choose whether to record spans of tests, helpers, WebDriver commands and sleeps.
+
+       Must be called before 'start_selenium(...)' for its WebDrivers to be traced,
+       and after any 'use_instrumentation()', since both replace 'time.sleep'.
+        - 'enabled' is a boolean flag; if 'True', record into 'TRACER'.
+    """
+    global _SLEEP
+    if enabled and not TRACER.enabled:
+        _SLEEP = time.sleep
+        time.sleep = _traced_sleep
+    elif TRACER.enabled and not enabled:
+        time.sleep = _SLEEP
+    TRACER.enabled = enabled
+    log(INFO, "Span tracing %s." % ("enabled" if enabled else "disabled"))
+
+
+def traced(func):
+    """Decorate a helper function so that each call of it is recorded as a span.
+
+       The span is named after the function and categorised by its module; when
+       tracing is not enabled, the only cost is checking that.
+    """
+    category = func.__module__.split(".")[-1]
+
+    @wraps(func)
+    def _traced(*args, **kwargs):
+        if not TRACER.enabled:
+            return func(*args, **kwargs)
+        with TRACER.span(func.__name__, category):
+            return func(*args, **kwargs)
+    return _traced
+
+
+def trace_driver(driver):
+    """Record every command sent by 'driver' as a span, if 'use_tracing()' was called.
+
+       As for 'instrument(...)', only the 'execute' method of the WebDriver needs
+       wrapping. Returns the driver.
+        - 'driver' should be a Selenium WebDriver.
+    """
+    if not TRACER.enabled:
+        return driver
+    execute = driver.execute
+
+    def _execute(driver_command, params=None):
+        with TRACER.span(driver_command, "command"):
+            return execute(driver_command, params)
+    driver.execute = _execute
+    return driver
@@ -5,14 +5,72 @@
 #
 # Python Imports:
 import os
+import sys
 import time
 import datetime
+import argparse
+from collections import OrderedDict
 # Custom Package Imports:
-from isaactest.utils.log import log, INFO, ERROR, start_testing, end_testing
+from isaactest.utils.log import log, INFO, ERROR, start_testing, end_testing, error_count
 from isaactest.utils.initialisation import define_users, start_selenium
+from isaactest.utils.i_selenium import use_angular_waits, wait_for_images
+from isaactest.utils.rate_limit import ANSWER_RATE_LIMIT, configure_answer_rate_limit
+from isaactest.utils.history import HISTORY
+from isaactest.utils.instrumentation import COMMAND_STATS, use_instrumentation
+from isaactest.utils.tracing import TRACER, use_tracing
+from isaactest.utils.page_timing import use_page_timing
 from isaactest.tests import TestWithDependency
 from isaactest.utils.isaac import User, TestUsers  # Need this for the pickle loading
 
+
+def shard_arg(value):
+    """Parse a shard given as 'I/N' into the pair of integers (I, N)."""
+    try:
+        shard, shards = [int(n) for n in value.split("/")]
+        assert 1 <= shard <= shards
+    except (ValueError, AssertionError):
+        raise argparse.ArgumentTypeError("'%s' is not a shard of the form I/N, with 1 <= I <= N" % value)
+    return shard, shards
+
+
+parser = argparse.ArgumentParser(description="Selenium regression testing of the Isaac website.")
+parser.add_argument("--workers", type=int, default=1,
+                    help="number of WebDrivers to run independent tests on concurrently (default: 1)")
+parser.add_argument("--angular-waits", action="store_true",
+                    help="wait for AngularJS to become stable instead of sleeping WAIT_DUR")
+parser.add_argument("--answer-burst", type=int, default=ANSWER_RATE_LIMIT.capacity,
+                    help="answers Isaac accepts in a burst before rate limiting (default: %(default)s)")
+parser.add_argument("--answer-refill", type=float, default=ANSWER_RATE_LIMIT.refill_period,
+                    help="seconds for Isaac to allow one more answer (default: %(default)s)")
+parser.add_argument("--instrument", action="store_true",
+                    help="count and time the WebDriver commands, sleeps and waits of each test")
+parser.add_argument("--sleep-budget", type=float, default=None, metavar="SECONDS",
+                    help="report where tests sleep, flagging tests which sleep longer than SECONDS (implies --instrument)")
+parser.add_argument("--page-timing", action="store_true",
+                    help="record how long each page takes to become ready, marking tests slow if over budget, and report p50/p95")
+parser.add_argument("--trace", action="store_true",
+                    help="record spans of tests, helpers and WebDriver commands to view in chrome://tracing")
+parser.add_argument("--resume", action="store_true",
+                    help="resume an aborted run from its checkpoint, re-running only tests which did not pass")
+parser.add_argument("--headless", action="store_true",
+                    help="run the browsers in their own headless mode, without a virtual display")
+parser.add_argument("--separate-inbox", action="store_true",
+                    help="read email with a WebDriver of its own, rather than a tab of the Isaac WebDriver")
+parser.add_argument("--smtp-inbox", type=int, default=None, metavar="PORT",
+                    help="receive email on a local SMTP server on PORT instead of using GuerrillaMail")
+ordering = parser.add_mutually_exclusive_group()
+ordering.add_argument("--plan-navigation", action="store_true",
+                      help="order tests to keep those of the same page and user together, so fewer logouts and logins are needed")
+ordering.add_argument("--critical-path", action="store_true",
+                      help="start the tests on the longest chains first, using the durations of recent runs")
+parser.add_argument("--plan-shards", type=int, default=None, metavar="N",
+                    help="split the tests into N shards balanced by the durations of recent runs, saving the plan for --shard")
+parser.add_argument("--shard", type=shard_arg, default=None, metavar="I/N",
+                    help="run only shard I of N, as saved by --plan-shards N beforehand")
+parser.add_argument("--merge-shards", type=int, default=None, metavar="N",
+                    help="combine the results saved by each of N shards into one summary, instead of testing")
+ARGS = parser.parse_args()
+
 with open("test_dependencies.dot", "w") as f:
     f.write(TestWithDependency.dependency_graph())
 
@@ -25,9 +83,10 @@ try:
     from pyvirtualdisplay import Display
     PATH_TO_CHROMEDRIVER = "/usr/local/bin/chromedriver"
     PATH_TO_GECKODRIVER = "/usr/local/bin/geckodriver"
-    virtual_display = Display(visible=False, size=(1920, 1080))
-    virtual_display.start()
-    time.sleep(5)
+    if not ARGS.headless:
+        virtual_display = Display(visible=False, size=(1920, 1080))
+        virtual_display.start()
+        time.sleep(5)
     os.chdir("/isaac-selenium-testing/testing")
     # No absolutely reliable way to ensure Javascript has loaded, just wait longer
     # on a headless machine to hope for the best...
@@ -59,14 +118,77 @@ os.chdir("test_" + RUNDATE)
 # Start Testing:
 #####
 start_testing()
+# The shards of a run share one plan, and save their results alongside each other:
+SHARD_PLAN = "../test_shard_plan_%s.pickle"
+SHARD_RESULTS = "../test_shard_%s_of_%s.pickle"
+if ARGS.plan_shards:
+    HISTORY.open("../test_history.sqlite", ISAAC_WEB, record=False)
+    plan = TestWithDependency.shard_plan(ARGS.plan_shards, HISTORY.median_durations())
+    HISTORY.close()
+    TestWithDependency.save_shard_plan(SHARD_PLAN % ARGS.plan_shards, plan)
+    end_testing(TestWithDependency.Results, email=False)
+    sys.exit(0)
+if ARGS.merge_shards:
+    shard_files = [SHARD_RESULTS % (i, ARGS.merge_shards) for i in range(1, ARGS.merge_shards + 1)]
+    errors, aborted = TestWithDependency.merge_shards(shard_files)
+    end_testing(TestWithDependency.Results, email=False, aborted=aborted, errors=errors)
+    sys.exit(1 if aborted else 0)
+if ARGS.angular_waits:
+    use_angular_waits()
+if ARGS.instrument or (ARGS.sleep_budget is not None):
+    use_instrumentation()
+if ARGS.page_timing:
+    use_page_timing()
+if ARGS.trace:
+    use_tracing()  # After instrumenting, since both replace 'time.sleep'
+configure_answer_rate_limit(ARGS.answer_burst, ARGS.answer_refill)
+# Keep the results of every run together, in the directory of all test runs:
+HISTORY.open("../test_history.sqlite", ISAAC_WEB)
+CHECKPOINT = "../test_checkpoint.pickle" if not ARGS.shard else "../test_checkpoint_%s_of_%s.pickle" % ARGS.shard
+if ARGS.resume:
+    try:
+        Users = TestWithDependency.resume_from_checkpoint(CHECKPOINT)
+    except IOError:
+        log(INFO, "No checkpoint '%s' to resume from, starting a fresh run." % CHECKPOINT)
+TestWithDependency.checkpoint_to(CHECKPOINT, Users)
+if ARGS.critical_path:
+    durations = HISTORY.median_durations()
+    order = TestWithDependency.critical_path_order(durations)
+    with open("test_dependencies.dot", "w") as f:
+        f.write(TestWithDependency.dependency_graph(durations))
+elif ARGS.plan_navigation:
+    order = TestWithDependency.navigation_order()
+else:
+    order = None
+if ARGS.shard:
+    # Only run this shard's tests, and the tests they depend upon:
+    try:
+        owned = TestWithDependency.load_shard_plan(SHARD_PLAN % ARGS.shard[1], ARGS.shard[1])[ARGS.shard[0] - 1]
+    except (IOError, ValueError), e:
+        log(ERROR, "Cannot run shard %s of %s: %s Run with '--plan-shards %s' first." % (ARGS.shard + (e, ARGS.shard[1])))
+        HISTORY.close(aborted=True)
+        raise
+    order = TestWithDependency.shard_order(owned, order)
 start_time = datetime.datetime.now()
-#driver, inbox = start_selenium(Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, PATH_TO_GECKODRIVER)
-driver, inbox = start_selenium(Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, PATH_TO_CHROMEDRIVER)
+if ARGS.workers > 1:
+    # Each worker opens its own WebDriver and inbox:
+    driver, inbox = None, None
+else:
+    #driver, inbox = start_selenium(Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, PATH_TO_GECKODRIVER)
+    driver, inbox = start_selenium(Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, PATH_TO_CHROMEDRIVER, smtp_port=ARGS.smtp_inbox,
+                                   separate_inbox=ARGS.separate_inbox, headless=ARGS.headless)
 
 fatal_error = False
 try:
-    # Use the class method to run all tests in order they're designed to run in:
-    TestWithDependency.run_all_tests(driver, inbox, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR)
+    with TRACER.span("run", "run"):
+        if ARGS.workers > 1:
+            # Run independent tests concurrently, trading browser memory for time:
+            TestWithDependency.run_all_tests_parallel(ARGS.workers, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, PATH_TO_CHROMEDRIVER,
+                                                      smtp_port=ARGS.smtp_inbox, separate_inbox=ARGS.separate_inbox,
+                                                      headless=ARGS.headless, order=order)
+        else:
+            # Use the class method to run all tests in order they're designed to run in:
+            TestWithDependency.run_all_tests(driver, inbox, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR, order=order)
 
     # Comment out the above line and replace with below line to run a specific test:
     # TestWithDependency.run_test_with_deps("LOGIN", driver, inbox, Users, ISAAC_WEB, GUERRILLAMAIL, WAIT_DUR)
@@ -75,13 +197,30 @@ except Exception, e:
     log(ERROR, "FATAL ERROR! %s: '%s'!" % (type(e).__name__, e.message))
     raise  # This allows us to add the error to the email, but leave the traceback on stderr
 finally:
-    driver.quit()
-    log(INFO, "Closed Selenium and Browser.")
+    if driver is not None:
+        driver.quit()
+        log(INFO, "Closed Selenium and Browser.")
+    if inbox is not None:
+        inbox.close()
     try:
         virtual_display.stop()
         log(INFO, "Closed the virtual display.")
     except NameError:
         pass
+    wait_for_images()
     duration = int((datetime.datetime.now() - start_time).total_seconds()/60.0 + 0.5)  # int(...) rounds down
     log(INFO, "Testing Finished, took %s minutes." % duration)
-    end_testing(TestWithDependency.Results, email=False, aborted=fatal_error)
+    ANSWER_RATE_LIMIT.report()
+    COMMAND_STATS.report()
+    COMMAND_STATS.sleep_report(HISTORY.run_durations(), ARGS.sleep_budget)
+    if ARGS.trace:
+        TRACER.save("_TEST_TRACE.json")
+    HISTORY.report()
+    HISTORY.page_report()
+    HISTORY.close(aborted=fatal_error)
+    if ARGS.shard:
+        TestWithDependency.save_shard(SHARD_RESULTS % ARGS.shard, owned, error_count(), aborted=fatal_error)
+        shard_results = OrderedDict([(t, r) for t, r in TestWithDependency.Results.items() if t in order])
+        end_testing(shard_results, email=False, aborted=fatal_error)
+    else:
+        end_testing(TestWithDependency.Results, email=False, aborted=fatal_error)
@@ -0,0 +1,38 @@
+"""Check that 'TestWithDependency.shard_plan(...)' spreads the suite evenly across machines.
+
+   Run using 'python -m unittest test_shard_plan'. Only the planning is checked,
+   so no WebDriver or Isaac website is needed.
+"""
+import unittest
+from isaactest.tests import TestWithDependency
+
+# How far over an even share of the tests any one shard may be planned to run:
+BALANCE = 1.0 / 3
+
+
+class ShardPlanTest(unittest.TestCase):
+
+    def assertBalanced(self, count, durations):
+        plan = TestWithDependency.shard_plan(count, durations)
+        shards, total = TestWithDependency.shard_durations(plan, durations)
+        for i, seconds in enumerate(shards):
+            self.assertLessEqual(seconds, (1 + BALANCE) * total / count,
+                                 "Shard %s of %s takes %.0f of %.0f seconds!" % (i + 1, count, seconds, total))
+
+    def test_every_test_owned_once(self):
+        plan = TestWithDependency.shard_plan(3, {})
+        owned = [t for shard in plan for t in shard]
+        self.assertEqual(sorted(owned), sorted(TestWithDependency._Tests))
+
+    def test_balanced_without_history(self):
+        for count in (2, 3, 4):
+            self.assertBalanced(count, {})
+
+    def test_login_repeated_on_every_shard(self):
+        plan = TestWithDependency.shard_plan(3, {})
+        needing = [shard for shard in plan if "LOGIN" in TestWithDependency._with_ancestors(shard)]
+        self.assertTrue(len(needing) > 1)
+
+
+if __name__ == "__main__":
+    unittest.main()